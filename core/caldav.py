@@ -0,0 +1,473 @@
+from __future__ import annotations
+
+import base64
+import http.client
+import queue
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+from urllib.parse import quote, unquote, urlsplit
+from uuid import uuid4
+from xml.etree import ElementTree
+
+from core.calendar import CalendarStore, Event, IcsRecord, parse_ics_data, serialize_ics
+
+DAV_NS = "DAV:"
+CALDAV_NS = "urn:ietf:params:xml:ns:caldav"
+CS_NS = "http://calendarserver.org/ns/"
+
+# Liczba zasobów pobieranych jednym zapytaniem calendar-multiget.
+MULTIGET_CHUNK = 100
+
+_CTAG_BODY = (
+    '<?xml version="1.0" encoding="utf-8"?>'
+    f'<D:propfind xmlns:D="{DAV_NS}" xmlns:CS="{CS_NS}"><D:prop><CS:getctag/></D:prop></D:propfind>'
+).encode()
+_ETAG_BODY = (
+    '<?xml version="1.0" encoding="utf-8"?>'
+    f'<D:propfind xmlns:D="{DAV_NS}"><D:prop><D:getetag/></D:prop></D:propfind>'
+).encode()
+
+
+class CalDavError(RuntimeError):
+    """Nieoczekiwana odpowiedź serwera CalDAV."""
+
+
+class PreconditionFailed(CalDavError):
+    """Zasób zmienił się na serwerze od ostatniej synchronizacji (HTTP 412)."""
+
+
+@dataclass
+class HttpResponse:
+    status: int
+    headers: Dict[str, str]
+    body: bytes
+
+
+class ConnectionPool:
+    """Pula połączeń HTTP/1.1 keep-alive do jednego hosta, bezpieczna wątkowo.
+
+    Kolejne zapytania synchronizacji używają tych samych gniazd zamiast
+    nawiązywać połączenie (i ewentualnie sesję TLS) od nowa.
+    """
+
+    def __init__(self, scheme: str, host: str, port: Optional[int], size: int = 4, timeout: float = 15.0) -> None:
+        if scheme not in {"http", "https"}:
+            raise ValueError(f"Nieobsługiwany protokół: {scheme}")
+        self._scheme = scheme
+        self._host = host
+        self._port = port
+        self._timeout = timeout
+        self._idle: "queue.LifoQueue[http.client.HTTPConnection]" = queue.LifoQueue(maxsize=size)
+        self.opened = 0
+
+    def request(
+        self, method: str, path: str, body: Optional[bytes] = None, headers: Optional[Dict[str, str]] = None
+    ) -> HttpResponse:
+        connection, reused = self._acquire()
+        try:
+            response = self._send(connection, method, path, body, headers)
+        except (http.client.RemoteDisconnected, ConnectionError):
+            connection.close()
+            if not reused:
+                raise
+            # Serwer mógł zamknąć bezczynne połączenie – ponawiamy na świeżym.
+            connection, _ = self._new_connection(), False
+            response = self._send(connection, method, path, body, headers)
+        except Exception:
+            connection.close()
+            raise
+
+        if response.headers.get("connection", "").lower() == "close":
+            connection.close()
+        else:
+            self._release(connection)
+        return response
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+    def _send(
+        self,
+        connection: http.client.HTTPConnection,
+        method: str,
+        path: str,
+        body: Optional[bytes],
+        headers: Optional[Dict[str, str]],
+    ) -> HttpResponse:
+        connection.request(method, path, body=body, headers=headers or {})
+        raw = connection.getresponse()
+        data = raw.read()
+        return HttpResponse(raw.status, {name.lower(): value for name, value in raw.getheaders()}, data)
+
+    def _acquire(self) -> Tuple[http.client.HTTPConnection, bool]:
+        try:
+            return self._idle.get_nowait(), True
+        except queue.Empty:
+            return self._new_connection(), False
+
+    def _release(self, connection: http.client.HTTPConnection) -> None:
+        try:
+            self._idle.put_nowait(connection)
+        except queue.Full:
+            connection.close()
+
+    def _new_connection(self) -> http.client.HTTPConnection:
+        self.opened += 1
+        factory = http.client.HTTPSConnection if self._scheme == "https" else http.client.HTTPConnection
+        return factory(self._host, self._port, timeout=self._timeout)
+
+
+class CalDavClient:
+    """Minimalny klient kolekcji CalDAV: ctag, lista ETagów, multiget, PUT i DELETE."""
+
+    def __init__(
+        self,
+        url: str,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        pool_size: int = 4,
+    ) -> None:
+        parts = urlsplit(url)
+        if not parts.hostname:
+            raise ValueError(f"Niepoprawny adres serwera: {url}")
+        self.collection = parts.path if parts.path.endswith("/") else parts.path + "/"
+        self._pool = ConnectionPool(parts.scheme, parts.hostname, parts.port, pool_size)
+        self._headers: Dict[str, str] = {}
+        username = username if username is not None else unquote(parts.username or "")
+        password = password if password is not None else unquote(parts.password or "")
+        if username:
+            token = base64.b64encode(f"{username}:{password}".encode()).decode()
+            self._headers["Authorization"] = f"Basic {token}"
+
+    @property
+    def pool(self) -> ConnectionPool:
+        return self._pool
+
+    def close(self) -> None:
+        self._pool.close()
+
+    def href_for(self, uid: str) -> str:
+        return self.collection + uid.replace("/", "_") + ".ics"
+
+    def get_ctag(self) -> str:
+        response = self._request("PROPFIND", self.collection, _CTAG_BODY, {"Depth": "0"}, expect={207})
+        for _, props in _multistatus(response.body):
+            ctag = props.findtext(f"{{{CS_NS}}}getctag")
+            if ctag:
+                return ctag
+        return ""
+
+    def list_etags(self) -> Dict[str, str]:
+        response = self._request("PROPFIND", self.collection, _ETAG_BODY, {"Depth": "1"}, expect={207})
+        etags: Dict[str, str] = {}
+        for href, props in _multistatus(response.body):
+            etag = props.findtext(f"{{{DAV_NS}}}getetag")
+            if etag and href.rstrip("/") != self.collection.rstrip("/"):
+                etags[href] = etag
+        return etags
+
+    def multiget(self, hrefs: List[str]) -> Dict[str, Tuple[str, bytes]]:
+        resources: Dict[str, Tuple[str, bytes]] = {}
+        for offset in range(0, len(hrefs), MULTIGET_CHUNK):
+            body = _multiget_body(hrefs[offset:offset + MULTIGET_CHUNK])
+            response = self._request("REPORT", self.collection, body, {"Depth": "1"}, expect={207})
+            for href, props in _multistatus(response.body):
+                data = props.findtext(f"{{{CALDAV_NS}}}calendar-data")
+                if data is not None:
+                    resources[href] = (props.findtext(f"{{{DAV_NS}}}getetag") or "", data.encode("utf-8"))
+        return resources
+
+    def put(self, href: str, data: bytes, etag: Optional[str] = None) -> str:
+        headers = {"Content-Type": "text/calendar; charset=utf-8"}
+        if etag:
+            headers["If-Match"] = etag
+        else:
+            headers["If-None-Match"] = "*"
+        response = self._request("PUT", href, data, headers, expect={200, 201, 204})
+        return response.headers.get("etag", "")
+
+    def delete(self, href: str, etag: Optional[str] = None) -> None:
+        headers = {"If-Match": etag} if etag else {}
+        self._request("DELETE", href, None, headers, expect={200, 204, 404})
+
+    def _request(
+        self, method: str, path: str, body: Optional[bytes], headers: Dict[str, str], *, expect: Set[int]
+    ) -> HttpResponse:
+        merged = dict(self._headers)
+        merged.update(headers)
+        if body is not None and "Content-Type" not in merged:
+            merged["Content-Type"] = "application/xml; charset=utf-8"
+        response = self._pool.request(method, quote(path), body, merged)
+        if response.status == 412:
+            raise PreconditionFailed(f"Zasób {path} zmienił się na serwerze.")
+        if response.status not in expect:
+            raise CalDavError(f"{method} {path}: serwer zwrócił kod {response.status}.")
+        return response
+
+
+@dataclass
+class RemoteChanges:
+    """Zmiany pobrane z serwera, gotowe do nałożenia na magazyn w wątku GUI."""
+
+    ctag: str
+    etags: Dict[str, str]
+    updated: Dict[str, List[IcsRecord]] = field(default_factory=dict)
+    deleted: List[str] = field(default_factory=list)
+
+
+class CalDavSync:
+    """Dwukierunkowa synchronizacja jednego kalendarza magazynu z kolekcją CalDAV.
+
+    Pobieranie porównuje najpierw ctag kolekcji; dopiero gdy się zmienił, pobiera
+    listę ETagów i ściąga wyłącznie zasoby o innym ETagu. Lokalne zmiany trafiają
+    do kolejki wysyłki w chwili edycji (przez odbiorcę zmian magazynu), a
+    ``push_pending`` wysyła je z warunkiem If-Match.
+
+    ``fetch_changes`` i ``push_pending`` tylko komunikują się z serwerem i mogą
+    działać w wątku roboczym; ``apply_changes`` modyfikuje magazyn, więc należy
+    je wywoływać w wątku, który jest właścicielem magazynu.
+
+    Stan synchronizacji (ctag, ETagi, powiązania zasobów z wydarzeniami) żyje
+    tylko w pamięci. Wydarzenia kalendarza wczytane z zapisu nie są jednak
+    dodawane ponownie: pierwsze pobranie przypisuje je do zasobów serwera po
+    ``uid``, a te, których na serwerze już nie ma, usuwa (wygrywa serwer).
+    """
+
+    def __init__(self, store: CalendarStore, client: CalDavClient, calendar_id: str) -> None:
+        if store.get_calendar(calendar_id) is None:
+            raise KeyError(f"Brak kalendarza o ID {calendar_id}")
+        self._store = store
+        self._client = client
+        self.calendar_id = calendar_id
+        self._lock = threading.Lock()
+        self._ctag = ""
+        self._etags: Dict[str, str] = {}
+        self._href_events: Dict[str, Set[str]] = {}
+        self._event_href: Dict[str, str] = {}
+        # href -> treść do wysłania albo ``None`` dla usunięcia.
+        self._pending: Dict[str, Optional[bytes]] = {}
+        # UID -> ID wydarzeń kalendarza, które nie mają jeszcze przypisanego zasobu
+        # (np. wczytane z zapisu po ponownym uruchomieniu).
+        self._unclaimed: Dict[str, Set[str]] = {}
+        for event in store.events_in_calendar(calendar_id):
+            if event.uid:
+                self._unclaimed.setdefault(event.uid, set()).add(event.id)
+        self._applying = False
+        store.add_change_listener(self._on_store_change)
+
+    def close(self) -> None:
+        self._store.remove_change_listener(self._on_store_change)
+        self._client.close()
+
+    @property
+    def has_pending(self) -> bool:
+        with self._lock:
+            return bool(self._pending)
+
+    def sync(self) -> Tuple[int, int]:
+        """Wysyła lokalne zmiany i pobiera zdalne w bieżącym wątku."""
+        pushed = self.push_pending()
+        changes = self.fetch_changes()
+        return pushed, self.apply_changes(changes) if changes is not None else 0
+
+    # --- pobieranie -----------------------------------------------------
+    def fetch_changes(self) -> Optional[RemoteChanges]:
+        ctag = self._client.get_ctag()
+        with self._lock:
+            if ctag and ctag == self._ctag:
+                return None
+            known = dict(self._etags)
+
+        etags = self._client.list_etags()
+        changed = [href for href, etag in etags.items() if known.get(href) != etag]
+        changes = RemoteChanges(ctag, etags, deleted=[href for href in known if href not in etags])
+        for href, (etag, data) in self._client.multiget(changed).items():
+            changes.updated[href] = parse_ics_data(data)
+            if etag:
+                changes.etags[href] = etag
+        return changes
+
+    def apply_changes(self, changes: RemoteChanges) -> int:
+        store = self._store
+        applied = 0
+        self._applying = True
+        try:
+            # Zmiany z serwera nie trafiają do historii – cofnięcie nie może ich wysłać z powrotem.
+            with store.untracked():
+                for href in changes.deleted:
+                    applied += self._replace_resource(href, [])
+                for href, records in changes.updated.items():
+                    applied += self._replace_resource(href, records)
+                # Pełna lista zasobów została już przejrzana – wydarzeń bez zasobu
+                # na serwerze nie ma, więc znikają także lokalnie.
+                unclaimed, self._unclaimed = self._unclaimed, {}
+                for event_ids in unclaimed.values():
+                    for event_id in event_ids:
+                        if store.get_event(event_id) is not None:
+                            store.remove_event(event_id)
+                            applied += 1
+        finally:
+            self._applying = False
+
+        with self._lock:
+            self._ctag = changes.ctag
+            self._etags = dict(changes.etags)
+            # Wersja z serwera wygrywa z niewysłaną lokalną zmianą tego samego zasobu.
+            for href in list(changes.updated) + changes.deleted:
+                self._pending.pop(href, None)
+        return applied
+
+    def _replace_resource(self, href: str, records: List[IcsRecord]) -> int:
+        store = self._store
+        if href not in self._href_events:
+            for uid in {record.uid for record in records}:
+                for event_id in self._unclaimed.pop(uid, ()):
+                    self._map(event_id, href)
+        current = [
+            event for event_id in sorted(self._href_events.get(href, ()))
+            if (event := store.get_event(event_id)) is not None
+        ]
+        current.sort(key=lambda event: (event.uid, event.start_ts))
+        records = sorted(records, key=lambda record: (record.uid, store.to_utc(record.start)))
+        changed = 0
+        for event, record in zip(current, records):
+            before = (event.title, event.start, event.end, event.description, event.alarms)
+            store.update_event(
+                event.id,
+                title=record.title,
+                start_dt=record.start,
+                end_dt=record.end,
+                description=record.description,
+                alarms=record.alarms,
+            )
+            event.uid = record.uid
+            changed += before != (event.title, event.start, event.end, event.description, event.alarms)
+        for event in current[len(records):]:
+            store.remove_event(event.id)
+            self._unmap(event.id)
+            changed += 1
+        color = store.get_calendar(self.calendar_id).color_key
+        for record in records[len(current):]:
+            event_id = store.add_event(
+                record.title, record.start, record.end, color, record.description, self.calendar_id,
+                uid=record.uid, alarms=record.alarms,
+            )
+            self._map(event_id, href)
+            changed += 1
+        return changed
+
+    # --- wysyłanie ------------------------------------------------------
+    def push_pending(self) -> int:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        pushed = 0
+        try:
+            for href, data in list(pending.items()):
+                with self._lock:
+                    etag = self._etags.get(href)
+                try:
+                    if data is None:
+                        self._client.delete(href, etag)
+                        new_etag = None
+                    else:
+                        new_etag = self._client.put(href, data, etag)
+                except PreconditionFailed:
+                    # Ktoś zmienił zasób równolegle – przy pobraniu dostaniemy wersję serwera.
+                    with self._lock:
+                        self._ctag = ""
+                    new_etag = None
+                    data = None
+                del pending[href]
+                pushed += 1
+                with self._lock:
+                    if data is None:
+                        self._etags.pop(href, None)
+                    elif new_etag:
+                        self._etags[href] = new_etag
+                    else:
+                        # Serwer nie podał ETagu – zasób zostanie odświeżony przy pobraniu.
+                        self._etags.pop(href, None)
+                        self._ctag = ""
+        finally:
+            if pending:
+                # Błąd sieci: niewysłane zmiany wracają do kolejki (nowsze mają pierwszeństwo).
+                with self._lock:
+                    for href, data in pending.items():
+                        self._pending.setdefault(href, data)
+        return pushed
+
+    def _on_store_change(self, kind: str, events: List[Event], before: Dict[str, object]) -> None:
+        if self._applying:
+            return
+        touched: Set[str] = set()
+        for event in events:
+            ours = event.calendar_id == self.calendar_id
+            was_ours = before.get("calendar_id", event.calendar_id) == self.calendar_id
+            if not ours and not was_ours:
+                continue
+            href = self._event_href.get(event.id)
+            if href is None:
+                if not event.uid:
+                    event.uid = str(uuid4())
+                href = self._client.href_for(event.uid)
+                self._event_href[event.id] = href
+                self._unclaimed.get(event.uid, set()).discard(event.id)
+            if kind == "remove" or not ours:
+                self._href_events.get(href, set()).discard(event.id)
+            else:
+                self._href_events.setdefault(href, set()).add(event.id)
+            touched.add(href)
+
+        if not touched:
+            return
+        serialized = {href: self._serialize(href) for href in touched}
+        with self._lock:
+            self._pending.update(serialized)
+
+    def _serialize(self, href: str) -> Optional[bytes]:
+        events = [
+            event for event_id in self._href_events.get(href, ())
+            if (event := self._store.get_event(event_id)) is not None
+        ]
+        return serialize_ics(events) if events else None
+
+    def _map(self, event_id: str, href: str) -> None:
+        self._event_href[event_id] = href
+        self._href_events.setdefault(href, set()).add(event_id)
+
+    def _unmap(self, event_id: str) -> None:
+        href = self._event_href.get(event_id)
+        if href is not None:
+            self._href_events.get(href, set()).discard(event_id)
+
+
+def _multistatus(body: bytes) -> List[Tuple[str, ElementTree.Element]]:
+    """Para (href, prop) dla każdej odpowiedzi 200 w dokumencie multistatus."""
+    try:
+        root = ElementTree.fromstring(body)
+    except ElementTree.ParseError as exc:
+        raise CalDavError(f"Niepoprawna odpowiedź XML: {exc}") from None
+    results: List[Tuple[str, ElementTree.Element]] = []
+    for response in root.iter(f"{{{DAV_NS}}}response"):
+        href = unquote(response.findtext(f"{{{DAV_NS}}}href") or "")
+        for propstat in response.iter(f"{{{DAV_NS}}}propstat"):
+            status = propstat.findtext(f"{{{DAV_NS}}}status") or ""
+            prop = propstat.find(f"{{{DAV_NS}}}prop")
+            if prop is not None and " 200 " in f"{status} ":
+                results.append((urlsplit(href).path or href, prop))
+    return results
+
+
+def _multiget_body(hrefs: List[str]) -> bytes:
+    root = ElementTree.Element(f"{{{CALDAV_NS}}}calendar-multiget")
+    prop = ElementTree.SubElement(root, f"{{{DAV_NS}}}prop")
+    ElementTree.SubElement(prop, f"{{{DAV_NS}}}getetag")
+    ElementTree.SubElement(prop, f"{{{CALDAV_NS}}}calendar-data")
+    for href in hrefs:
+        ElementTree.SubElement(root, f"{{{DAV_NS}}}href").text = quote(href)
+    return ElementTree.tostring(root, encoding="utf-8", xml_declaration=True)
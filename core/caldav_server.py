@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+from urllib.parse import unquote
+from xml.etree import ElementTree
+from xml.sax.saxutils import escape
+
+from core.caldav import CALDAV_NS, CS_NS, DAV_NS
+
+
+class LocalCalDavServer:
+    """Zastępczy serwer CalDAV działający w tym samym procesie (do testów i prób).
+
+    Obsługuje jedną kolekcję: PROPFIND (ctag i ETagi), REPORT calendar-multiget,
+    GET, PUT i DELETE z warunkami If-Match/If-None-Match. Liczniki ``connections``
+    i ``requests`` pozwalają sprawdzić, że klient używa puli połączeń i pobiera
+    tylko zmienione zasoby.
+    """
+
+    def __init__(self, collection: str = "/calendars/studyhub/") -> None:
+        self.collection = collection if collection.endswith("/") else collection + "/"
+        self._resources: Dict[str, Tuple[str, bytes]] = {}
+        self._ctag = 0
+        self._lock = threading.Lock()
+        self.connections = 0
+        self.requests: Dict[str, int] = {}
+        self.bytes_sent = 0
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        if self._server is None:
+            raise RuntimeError("Serwer nie został uruchomiony.")
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}{self.collection}"
+
+    def start(self) -> str:
+        owner = self
+
+        class Handler(_CalDavHandler):
+            server_owner = owner
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self.url
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    # --- zmiany „po stronie serwera” -----------------------------------
+    def put_resource(self, name: str, data: bytes) -> str:
+        with self._lock:
+            return self._store(self.collection + name, data)
+
+    def delete_resource(self, name: str) -> None:
+        with self._lock:
+            if self._resources.pop(self.collection + name, None) is not None:
+                self._ctag += 1
+
+    def resources(self) -> Dict[str, bytes]:
+        with self._lock:
+            return {href: data for href, (_, data) in self._resources.items()}
+
+    def _store(self, href: str, data: bytes) -> str:
+        etag = '"' + hashlib.sha1(data).hexdigest() + '"'
+        self._resources[href] = (etag, data)
+        self._ctag += 1
+        return etag
+
+
+class _CalDavHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_owner: LocalCalDavServer
+
+    def setup(self) -> None:
+        super().setup()
+        with self.server_owner._lock:
+            self.server_owner.connections += 1
+
+    def log_message(self, format: str, *args) -> None:  # noqa: A002
+        return
+
+    def do_PROPFIND(self) -> None:
+        self._read_body()
+        owner = self.server_owner
+        with owner._lock:
+            responses = [_propstat(owner.collection, f"<CS:getctag>{owner._ctag}</CS:getctag>")]
+            if self.headers.get("Depth", "0") != "0":
+                responses.extend(
+                    _propstat(href, f"<D:getetag>{escape(etag)}</D:getetag>")
+                    for href, (etag, _) in owner._resources.items()
+                )
+        self._multistatus(responses)
+
+    def do_REPORT(self) -> None:
+        root = ElementTree.fromstring(self._read_body())
+        owner = self.server_owner
+        responses = []
+        with owner._lock:
+            for node in root.iter(f"{{{DAV_NS}}}href"):
+                href = unquote(node.text or "")
+                resource = owner._resources.get(href)
+                if resource is None:
+                    continue
+                etag, data = resource
+                responses.append(
+                    _propstat(
+                        href,
+                        f"<D:getetag>{escape(etag)}</D:getetag>"
+                        f"<C:calendar-data>{escape(data.decode('utf-8'))}</C:calendar-data>",
+                    )
+                )
+        self._multistatus(responses)
+
+    def do_GET(self) -> None:
+        self._read_body()
+        with self.server_owner._lock:
+            resource = self.server_owner._resources.get(unquote(self.path))
+        if resource is None:
+            self._reply(404)
+            return
+        self._reply(200, resource[1], {"ETag": resource[0], "Content-Type": "text/calendar"})
+
+    def do_PUT(self) -> None:
+        data = self._read_body()
+        href = unquote(self.path)
+        owner = self.server_owner
+        with owner._lock:
+            current = owner._resources.get(href)
+            allowed = self._precondition_ok(current)
+            if allowed:
+                etag = owner._store(href, data)
+        if not allowed:
+            self._reply(412)
+            return
+        self._reply(201 if current is None else 204, headers={"ETag": etag})
+
+    def do_DELETE(self) -> None:
+        self._read_body()
+        href = unquote(self.path)
+        owner = self.server_owner
+        with owner._lock:
+            current = owner._resources.get(href)
+            if current is None:
+                status = 404
+            elif not self._precondition_ok(current):
+                status = 412
+            else:
+                del owner._resources[href]
+                owner._ctag += 1
+                status = 204
+        self._reply(status)
+
+    def _precondition_ok(self, current: Optional[Tuple[str, bytes]]) -> bool:
+        if_match = self.headers.get("If-Match")
+        if if_match is not None and (current is None or current[0] != if_match):
+            return False
+        if self.headers.get("If-None-Match") == "*" and current is not None:
+            return False
+        return True
+
+    def _read_body(self) -> bytes:
+        owner = self.server_owner
+        with owner._lock:
+            owner.requests[self.command] = owner.requests.get(self.command, 0) + 1
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def _multistatus(self, responses) -> None:
+        body = (
+            '<?xml version="1.0" encoding="utf-8"?>'
+            f'<D:multistatus xmlns:D="{DAV_NS}" xmlns:C="{CALDAV_NS}" xmlns:CS="{CS_NS}">'
+            + "".join(responses)
+            + "</D:multistatus>"
+        ).encode("utf-8")
+        self._reply(207, body, {"Content-Type": "application/xml; charset=utf-8"})
+
+    def _reply(self, status: int, body: bytes = b"", headers: Optional[Dict[str, str]] = None) -> None:
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+        with self.server_owner._lock:
+            self.server_owner.bytes_sent += len(body)
+
+
+def _propstat(href: str, props: str) -> str:
+    return (
+        f"<D:response><D:href>{escape(href)}</D:href><D:propstat><D:prop>{props}</D:prop>"
+        "<D:status>HTTP/1.1 200 OK</D:status></D:propstat></D:response>"
+    )
+
+
+if __name__ == "__main__":
+    server = LocalCalDavServer()
+    print(f"Serwer CalDAV: {server.start()}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.stop()
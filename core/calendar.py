@@ -1,12 +1,14 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import heapq
+from bisect import bisect_left, bisect_right, insort
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from datetime import date, datetime, timedelta, timezone, tzinfo
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 from uuid import uuid4
 
-from icalendar import Calendar
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 
@@ -26,6 +28,7 @@ def _load_warsaw_timezone() -> tzinfo:
 
 
 WARSAW_TZ = _load_warsaw_timezone()
+UTC = timezone.utc
 
 # Stała paleta kolorów inspirowana Apple Calendar
 COLOR_PRESETS: List[Tuple[str, str]] = [
@@ -38,10 +41,40 @@ COLOR_PRESETS: List[Tuple[str, str]] = [
 COLOR_KEYS = {name: hex_code for name, hex_code in COLOR_PRESETS}
 DEFAULT_COLOR_KEY = COLOR_PRESETS[0][0]
 
+# Liczba zapamiętanych kroków cofania.
+UNDO_LIMIT = 100
+
+DEFAULT_CALENDAR_ID = "default"
+DEFAULT_CALENDAR_NAME = "Mój kalendarz"
+
+
+def resolve_timezone(value: tzinfo | str) -> tzinfo:
+    """Zamienia nazwę strefy IANA (np. "Europe/Warsaw") na obiekt tzinfo."""
+    if isinstance(value, tzinfo):
+        return value
+    if value == "Europe/Warsaw":
+        return WARSAW_TZ
+    try:
+        return ZoneInfo(value)
+    except (ZoneInfoNotFoundError, ValueError):
+        try:
+            from dateutil import tz  # type: ignore
+        except ImportError:
+            raise ValueError(f"Nieznana strefa czasowa: {value}") from None
+        resolved = tz.gettz(value)
+        if resolved is None:
+            raise ValueError(f"Nieznana strefa czasowa: {value}")
+        return resolved
+
 
 @dataclass
 class Event:
-    """Prosta struktura opisująca wydarzenie w kalendarzu."""
+    """Prosta struktura opisująca wydarzenie w kalendarzu.
+
+    ``start`` i ``end`` są zawsze przechowywane w UTC. Pola lokalne (czasy
+    w strefie wyświetlania oraz klucze dnia i tygodnia) wylicza ``CalendarStore``
+    przy zapisie, dzięki czemu widoki nie muszą konwertować stref podczas rysowania.
+    """
 
     id: str
     title: str
@@ -49,6 +82,21 @@ class Event:
     end: datetime
     color_key: str
     description: str = ""
+    calendar_id: str = DEFAULT_CALENDAR_ID
+    uid: str = ""
+    # Własne przypomnienia wydarzenia (minuty przed początkiem); puste = domyślne.
+    alarms: Tuple[int, ...] = ()
+    calendar_bit: int = field(default=1, init=False, repr=False, compare=False)
+    start_ts: float = field(default=0.0, init=False, repr=False, compare=False)
+    end_ts: float = field(default=0.0, init=False, repr=False, compare=False)
+    local_start: Optional[datetime] = field(default=None, init=False, repr=False, compare=False)
+    local_end: Optional[datetime] = field(default=None, init=False, repr=False, compare=False)
+    day_key: int = field(default=0, init=False, repr=False, compare=False)
+    week_key: int = field(default=0, init=False, repr=False, compare=False)
+
+    @property
+    def local_day(self) -> date:
+        return date.fromordinal(self.day_key)
 
     def as_dict(self) -> Dict[str, object]:
         return {
@@ -58,14 +106,198 @@ class Event:
             "end": self.end,
             "color_key": self.color_key,
             "description": self.description,
+            "calendar_id": self.calendar_id,
+            "uid": self.uid,
+            "alarms": list(self.alarms),
         }
 
 
+@dataclass
+class IcsRecord:
+    """Surowe wydarzenie odczytane z pliku .ics, jeszcze niezwiązane z magazynem.
+
+    Parsowanie nie dotyka ``CalendarStore``, więc można je wykonać w wątku roboczym,
+    a do magazynu w wątku GUI trafia już gotowa lista rekordów.
+    """
+
+    uid: str
+    title: str
+    start: datetime
+    end: datetime
+    description: str = ""
+    # Przypomnienia z VALARM: minuty przed początkiem, rosnąco.
+    alarms: Tuple[int, ...] = ()
+
+
+@dataclass
+class CalendarInfo:
+    """Nazwany kalendarz (warstwa), np. jeden na każdy importowany plik lub przedmiot.
+
+    ``bit`` to pozycja kalendarza w masce widoczności; zapytania odfiltrowują
+    ukryte warstwy jednym ``&`` na wydarzeniu, bez przeglądania całego magazynu.
+    """
+
+    id: str
+    name: str
+    color_key: str
+    visible: bool = True
+    source: str = ""
+    bit: int = field(default=0, repr=False, compare=False)
+
+
+# Odbiorca pojedynczych zmian: (rodzaj, wydarzenia, poprzednie wartości pól).
+ChangeListener = Callable[[str, List[Event], Dict[str, object]], None]
+
+
+@dataclass
+class _Change:
+    """Pojedyncza zmiana w historii; trzyma referencje do wydarzeń, nie kopie magazynu."""
+
+    kind: str  # "add", "remove" albo "update"
+    events: List[Event]
+    before: Dict[str, object] = field(default_factory=dict)
+    after: Dict[str, object] = field(default_factory=dict)
+
+
+@dataclass
+class _UndoGroup:
+    label: str
+    changes: List[_Change] = field(default_factory=list)
+
+
 class CalendarStore:
-    """Wszystkie dane kalendarza przechowujemy w pamięci."""
+    """Wszystkie dane kalendarza przechowujemy w pamięci.
+
+    Wydarzenia trzymamy w UTC w osi czasu posortowanej po początku, a obok niej
+    indeks dni budowany według lokalnej daty w strefie wyświetlania. Zmiana strefy
+    przelicza wyłącznie pola pochodne i indeks dni.
+    """
 
-    def __init__(self) -> None:
+    def __init__(self, display_tz: tzinfo | str | None = None) -> None:
         self._events: Dict[str, Event] = {}
+        self._display_tz = WARSAW_TZ if display_tz is None else resolve_timezone(display_tz)
+        # Oś czasu posortowana po (start_ts, id) – zapytania zakresowe przez bisect.
+        self._timeline: List[Event] = []
+        # Klucz dnia (ordinal lokalnej daty) -> wydarzenia posortowane po początku.
+        self._day_index: Dict[int, List[Event]] = {}
+        # Najdłuższe wydarzenie w magazynie; pozwala znaleźć wydarzenia, które
+        # zaczęły się przed początkiem zakresu, ale wciąż w nim trwają.
+        self._max_duration = 0.0
+        # ID wydarzenia -> ID wydarzeń, z którymi się nakłada (tylko niepuste zbiory).
+        self._conflicts: Dict[str, Set[str]] = {}
+        self._undo: List[_UndoGroup] = []
+        self._redo: List[_UndoGroup] = []
+        self._open_group: Optional[_UndoGroup] = None
+        self._group_depth = 0
+        # Zmiany spoza aplikacji (``untracked``): ID dotkniętych wydarzeń albo ``None``.
+        self._untracked_ids: Optional[Set[str]] = None
+        self._revision = 0
+        self._listeners: List[Callable[[], None]] = []
+        self._change_listeners: List[ChangeListener] = []
+        self._calendars: Dict[str, CalendarInfo] = {}
+        # ID kalendarza -> jego wydarzenia; podmiana jednego pliku nie przegląda reszty.
+        self._by_calendar: Dict[str, Dict[str, Event]] = {}
+        self._next_bit = 1
+        self._visible_mask = 0
+        self._all_mask = 0
+        self.create_calendar(DEFAULT_CALENDAR_NAME, DEFAULT_COLOR_KEY, calendar_id=DEFAULT_CALENDAR_ID)
+
+    # --- powiadomienia -------------------------------------------------
+    @property
+    def revision(self) -> int:
+        """Licznik zmian – rośnie przy każdej modyfikacji danych."""
+        return self._revision
+
+    def add_listener(self, callback: Callable[[], None]) -> None:
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[], None]) -> None:
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def add_change_listener(self, callback: ChangeListener) -> None:
+        """Rejestruje odbiorcę pojedynczych zmian: ``callback(kind, events, before)``.
+
+        ``kind`` to "add", "remove" albo "update"; przy "update" ``before`` zawiera
+        poprzednie wartości zmienionych pól. Wywoływane także przy cofaniu i ponawianiu,
+        dzięki czemu struktury pochodne mogą aktualizować się przyrostowo.
+        """
+        self._change_listeners.append(callback)
+
+    def remove_change_listener(self, callback: ChangeListener) -> None:
+        if callback in self._change_listeners:
+            self._change_listeners.remove(callback)
+
+    # --- kalendarze -----------------------------------------------------
+    def calendars(self) -> List[CalendarInfo]:
+        return list(self._calendars.values())
+
+    def get_calendar(self, calendar_id: str) -> Optional[CalendarInfo]:
+        return self._calendars.get(calendar_id)
+
+    def calendar_for_source(self, source: str) -> Optional[CalendarInfo]:
+        return next((info for info in self._calendars.values() if source and info.source == source), None)
+
+    def create_calendar(
+        self,
+        name: str,
+        color_key: Optional[str] = None,
+        *,
+        source: str = "",
+        calendar_id: Optional[str] = None,
+    ) -> CalendarInfo:
+        if color_key is None:
+            color_key = COLOR_PRESETS[len(self._calendars) % len(COLOR_PRESETS)][0]
+        info = CalendarInfo(
+            id=calendar_id or str(uuid4()),
+            name=name.strip() or DEFAULT_CALENDAR_NAME,
+            color_key=self._validate_color(color_key),
+            source=source,
+            bit=self._next_bit,
+        )
+        self._next_bit <<= 1
+        self._calendars[info.id] = info
+        self._all_mask |= info.bit
+        self._visible_mask |= info.bit
+        self._notify()
+        return info
+
+    def set_calendar_visible(self, calendar_id: str, visible: bool) -> None:
+        info = self._require_calendar(calendar_id)
+        if info.visible == visible:
+            return
+        info.visible = visible
+        if visible:
+            self._visible_mask |= info.bit
+        else:
+            self._visible_mask &= ~info.bit
+        self._notify()
+
+    def is_visible(self, event: Event) -> bool:
+        return bool(event.calendar_bit & self._visible_mask)
+
+    # --- strefa wyświetlania ----------------------------------------------
+    @property
+    def display_tz(self) -> tzinfo:
+        return self._display_tz
+
+    def set_display_timezone(self, value: tzinfo | str) -> None:
+        """Zmienia strefę wyświetlania; to nowe granice dni, więc odbiorcy dostają powiadomienie.
+
+        Zmiana nie trafia do historii cofania – czasy wydarzeń (UTC) się nie zmieniają.
+        """
+        display_tz = resolve_timezone(value)
+        if display_tz is self._display_tz:
+            return
+        self._display_tz = display_tz
+        self._day_index = {}
+        for event in self._timeline:
+            self._derive_local_keys(event)
+            self._day_index.setdefault(event.day_key, []).append(event)
+        self._notify()
+
+    def now(self) -> datetime:
+        return datetime.now(self._display_tz)
 
     # --- operacje CRUD -------------------------------------------------
     def add_event(
@@ -75,20 +307,17 @@ class CalendarStore:
         end_dt: datetime,
         color_key: str,
         description: str = "",
+        calendar_id: str = DEFAULT_CALENDAR_ID,
+        uid: str = "",
+        alarms: Iterable[int] = (),
     ) -> str:
-        event_id = str(uuid4())
-        event = Event(
-            id=event_id,
-            title=title.strip() or "Bez tytułu",
-            start=_ensure_timezone(start_dt),
-            end=_ensure_timezone(end_dt),
-            color_key=self._validate_color(color_key),
-            description=description.strip(),
-        )
-        if event.end < event.start:
-            raise ValueError("Data zakończenia nie może być wcześniejsza niż data rozpoczęcia.")
-        self._events[event_id] = event
-        return event_id
+        self._require_calendar(calendar_id)
+        event = self._build_event(title, start_dt, end_dt, color_key, description, calendar_id)
+        event.uid = uid
+        event.alarms = normalize_alarms(alarms)
+        self._index(event)
+        self._record(_Change("add", [event]), "Dodanie wydarzenia")
+        return event.id
 
     def update_event(
         self,
@@ -99,124 +328,650 @@ class CalendarStore:
         end_dt: Optional[datetime] = None,
         color_key: Optional[str] = None,
         description: Optional[str] = None,
+        calendar_id: Optional[str] = None,
+        alarms: Optional[Iterable[int]] = None,
     ) -> None:
         event = self._events.get(event_id)
         if event is None:
             raise KeyError(f"Brak wydarzenia o ID {event_id}")
 
+        new_start = self.to_utc(start_dt) if start_dt is not None else event.start
+        new_end = self.to_utc(end_dt) if end_dt is not None else event.end
+        if new_end < new_start:
+            raise ValueError("Data zakończenia nie może być wcześniejsza niż data rozpoczęcia.")
+
+        after: Dict[str, object] = {"start": new_start, "end": new_end}
         if title is not None:
-            event.title = title.strip() or "Bez tytułu"
-        if start_dt is not None:
-            event.start = _ensure_timezone(start_dt)
-        if end_dt is not None:
-            event.end = _ensure_timezone(end_dt)
+            after["title"] = title.strip() or "Bez tytułu"
         if color_key is not None:
-            event.color_key = self._validate_color(color_key)
+            after["color_key"] = self._validate_color(color_key)
         if description is not None:
-            event.description = description.strip()
-        if event.end < event.start:
-            raise ValueError("Data zakończenia nie może być wcześniejsza niż data rozpoczęcia.")
+            after["description"] = description.strip()
+        if calendar_id is not None:
+            after["calendar_id"] = self._require_calendar(calendar_id).id
+        if alarms is not None:
+            after["alarms"] = normalize_alarms(alarms)
+        after = {name: value for name, value in after.items() if getattr(event, name) != value}
+        if not after:
+            return
+
+        before = {name: getattr(event, name) for name in after}
+        self._apply_fields(event, after)
+        self._record(_Change("update", [event], before, after), "Edycja wydarzenia")
+
+    def move_event(self, event_id: str, start_dt: datetime) -> None:
+        """Przesuwa wydarzenie na nowy początek, zachowując czas trwania.
+
+        Zmieniają się tylko czasy, więc wydarzenie jest wyjmowane z osi czasu
+        i kubełka dnia, a potem wstawiane z powrotem – miejsca w obu listach
+        znajduje bisekcja, reszta indeksów i kolizje z innymi dniami zostają nietknięte.
+        """
+        event = self._events.get(event_id)
+        if event is None:
+            raise KeyError(f"Brak wydarzenia o ID {event_id}")
+
+        new_start = self.to_utc(start_dt)
+        after: Dict[str, object] = {"start": new_start, "end": new_start + (event.end - event.start)}
+        if after["start"] == event.start:
+            return
+
+        before = {name: getattr(event, name) for name in after}
+        self._apply_fields(event, after)
+        self._record(_Change("update", [event], before, after), "Przesunięcie wydarzenia")
 
     def remove_event(self, event_id: str) -> None:
-        self._events.pop(event_id, None)
+        event = self._events.get(event_id)
+        if event is not None:
+            self._unindex(event)
+            self._record(_Change("remove", [event]), "Usunięcie wydarzenia")
+
+    # --- historia zmian -------------------------------------------------
+    @contextmanager
+    def batch(self, label: str) -> Iterator[None]:
+        """Grupuje zmiany w jeden krok cofania (np. import całego pliku)."""
+        if self._group_depth == 0:
+            self._open_group = _UndoGroup(label)
+        self._group_depth += 1
+        try:
+            yield
+        finally:
+            self._group_depth -= 1
+            if self._group_depth == 0:
+                group, self._open_group = self._open_group, None
+                if group is not None and group.changes:
+                    self._push_undo(group)
+                    self._notify()
+
+    @contextmanager
+    def untracked(self) -> Iterator[None]:
+        """Zmiany przyniesione z zewnątrz (np. z serwera CalDAV) – poza historią cofania.
+
+        Odbiorcy zmian dostają je jak zwykle. Kroki historii dotyczące tych samych
+        wydarzeń są usuwane, bo ich cofnięcie nadpisałoby stan z zewnątrz.
+        """
+        if self._untracked_ids is not None:
+            yield
+            return
+        self._untracked_ids = set()
+        try:
+            yield
+        finally:
+            touched, self._untracked_ids = self._untracked_ids, None
+            if touched:
+                self._forget_history(touched)
+                self._notify()
+
+    @property
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+
+    @property
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    def undo_label(self) -> Optional[str]:
+        return self._undo[-1].label if self._undo else None
+
+    def redo_label(self) -> Optional[str]:
+        return self._redo[-1].label if self._redo else None
+
+    def undo(self) -> Optional[str]:
+        if not self._undo:
+            return None
+        group = self._undo.pop()
+        for change in reversed(group.changes):
+            self._revert(change)
+        self._redo.append(group)
+        self._notify()
+        return group.label
+
+    def redo(self) -> Optional[str]:
+        if not self._redo:
+            return None
+        group = self._redo.pop()
+        for change in group.changes:
+            self._replay(change)
+        self._undo.append(group)
+        self._notify()
+        return group.label
 
     # --- zapytania ------------------------------------------------------
     def get_event(self, event_id: str) -> Optional[Event]:
         return self._events.get(event_id)
 
-    def all_events(self) -> List[Event]:
-        return sorted(self._events.values(), key=lambda ev: ev.start)
-
-    def events_for_day(self, day: date) -> List[Event]:
-        target = _normalize_to_date(day)
-        return sorted(
-            (
-                event
-                for event in self._events.values()
-                if _normalize_to_date(event.start) == target
-            ),
-            key=lambda ev: ev.start,
-        )
-
-    def events_for_week(self, day: date) -> List[Event]:
-        week_start = _week_start(_normalize_to_date(day))
-        week_end = week_start + timedelta(days=6)
-        return sorted(
-            (
-                event
-                for event in self._events.values()
-                if week_start <= _normalize_to_date(event.start) <= week_end
-            ),
-            key=lambda ev: (ev.start, ev.end),
-        )
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def all_events(self, *, include_hidden: bool = False) -> List[Event]:
+        return self._visible(self._timeline, include_hidden)
+
+    def events_in_calendar(self, calendar_id: str) -> List[Event]:
+        """Wydarzenia jednego kalendarza (także ukrytego), bez kolejności."""
+        return list(self._by_calendar.get(calendar_id, {}).values())
+
+    def events_for_day(self, day: date, *, include_hidden: bool = False) -> List[Event]:
+        bucket = self._day_index.get(_normalize_to_date(day).toordinal())
+        return self._visible(bucket, include_hidden) if bucket else []
+
+    def events_for_week(self, day: date, *, include_hidden: bool = False) -> List[Event]:
+        first = _week_start(_normalize_to_date(day)).toordinal()
+        events: List[Event] = []
+        for key in range(first, first + 7):
+            bucket = self._day_index.get(key)
+            if bucket:
+                events.extend(self._visible(bucket, include_hidden))
+        return events
+
+    def events_between(self, start: datetime, end: datetime, *, include_hidden: bool = False) -> List[Event]:
+        """Wydarzenia, które choć częściowo przypadają na zakres [start, end]."""
+        start_ts = self.to_utc(start).timestamp()
+        end_ts = self.to_utc(end).timestamp()
+        lo = bisect_left(self._timeline, start_ts - self._max_duration, key=_start_ts)
+        hi = bisect_right(self._timeline, end_ts, key=_start_ts)
+        mask = self._all_mask if include_hidden else self._visible_mask
+        return [
+            event for event in self._timeline[lo:hi]
+            if event.end_ts >= start_ts and event.calendar_bit & mask
+        ]
+
+    # --- kolizje --------------------------------------------------------
+    def has_conflict(self, event: Event, *, include_hidden: bool = False) -> bool:
+        others = self._conflicts.get(event.id)
+        if not others:
+            return False
+        mask = self._all_mask if include_hidden else self._visible_mask
+        return any(self._events[other].calendar_bit & mask for other in others)
+
+    def conflicts_for(self, event_id: str, *, include_hidden: bool = False) -> List[Event]:
+        others = [self._events[other] for other in self._conflicts.get(event_id, ())]
+        others.sort(key=_timeline_key)
+        return self._visible(others, include_hidden)
+
+    def conflicts(self, *, include_hidden: bool = False) -> List[Tuple[Event, Event]]:
+        """Wszystkie pary nakładających się wydarzeń, w kolejności początków.
+
+        Zamiatanie osi czasu z kopcem końców aktywnych wydarzeń: O(n log n + k),
+        gdzie k to liczba par.
+        """
+        pairs: List[Tuple[Event, Event]] = []
+        active: List[Tuple[float, str, Event]] = []
+        for event in self._visible(self._timeline, include_hidden):
+            while active and active[0][0] <= event.start_ts:
+                heapq.heappop(active)
+            if event.end_ts > event.start_ts:
+                pairs.extend((other, event) for _, _, other in active)
+                heapq.heappush(active, (event.end_ts, event.id, event))
+        return pairs
 
     # --- import ---------------------------------------------------------
-    def import_ics(self, path: str | Path) -> int:
+    def import_ics(self, path: str | Path, calendar_id: Optional[str] = None) -> int:
+        """Importuje wydarzenia z pliku; domyślnie do kalendarza przypisanego temu plikowi."""
         file_path = Path(path)
         if not file_path.exists():
             raise FileNotFoundError(f"Nie znaleziono pliku: {file_path}")
+        target = self._require_calendar(calendar_id) if calendar_id else self.calendar_for_file(file_path)
+        return self.import_records(parse_ics(file_path), target.id, f"Import {file_path.name}")
 
-        with file_path.open("rb") as handle:
-            calendar = Calendar.from_ical(handle.read())
-
-        imported = 0
-        for component in calendar.walk():
-            if component.name != "VEVENT":
+    def calendar_for_file(self, path: str | Path) -> CalendarInfo:
+        """Kalendarz przypisany plikowi .ics; tworzony przy pierwszym imporcie."""
+        file_path = Path(path)
+        source = str(file_path.resolve())
+        return self.calendar_for_source(source) or self.create_calendar(file_path.stem, source=source)
+
+    def import_records(self, records: Iterable[IcsRecord], calendar_id: str, label: str) -> int:
+        """Dodaje rekordy przeczytane przez ``parse_ics`` jako jeden krok cofania."""
+        target = self._require_calendar(calendar_id)
+        events = [self._event_from_record(record, target) for record in records]
+        if events:
+            self._index_many(events)
+            self._record(_Change("add", events), label)
+        return len(events)
+
+    def replace_calendar_records(
+        self, calendar_id: str, records: Iterable[IcsRecord], label: str
+    ) -> Tuple[int, int, int]:
+        """Zastępuje wydarzenia kalendarza nową zawartością jego pliku.
+
+        Rekordy są dopasowywane po UID (albo po tytule i czasie, gdy pliku nie ma UID),
+        więc niezmienione wydarzenia zostają na miejscu, a zmienione są aktualizowane.
+        Pozostałe kalendarze nie są przeglądane. Zwraca (dodane, zmienione, usunięte).
+        """
+        target = self._require_calendar(calendar_id)
+        # Kilka wystąpień może mieć ten sam UID (RECURRENCE-ID), stąd listy.
+        previous: Dict[object, List[Event]] = {}
+        for event in sorted(self._by_calendar.get(calendar_id, {}).values(), key=_timeline_key):
+            previous.setdefault(_record_key(event.uid, event.title, event.start, event.end), []).append(event)
+
+        added: List[Event] = []
+        updates: List[Tuple[Event, Dict[str, object]]] = []
+        for record in records:
+            fresh = self._event_from_record(record, target)
+            candidates = previous.get(_record_key(fresh.uid, fresh.title, fresh.start, fresh.end))
+            current = candidates.pop(0) if candidates else None
+            if current is None:
+                added.append(fresh)
                 continue
-
-            summary = str(component.get("SUMMARY", "Wydarzenie"))
-            description = str(component.get("DESCRIPTION", ""))
-            start_raw = component.get("DTSTART")
-            end_raw = component.get("DTEND")
-
-            if start_raw is None:
+            after = {
+                name: getattr(fresh, name)
+                for name in ("title", "start", "end", "description", "alarms")
+                if getattr(current, name) != getattr(fresh, name)
+            }
+            if after:
+                updates.append((current, after))
+        removed = [event for leftovers in previous.values() for event in leftovers]
+
+        with self.batch(label):
+            if removed:
+                self._unindex_many(removed)
+                self._record(_Change("remove", removed), label)
+            for event, after in updates:
+                before = {name: getattr(event, name) for name in after}
+                self._apply_fields(event, after)
+                self._record(_Change("update", [event], before, after), label)
+            if added:
+                self._index_many(added)
+                self._record(_Change("add", added), label)
+        return len(added), len(updates), len(removed)
+
+    def restore_events(self, events: Iterable[Event]) -> int:
+        """Wczytuje zapisane wydarzenia (z ich ID) bez wpisu do historii cofania.
+
+        Wydarzenia z nieznanego kalendarza trafiają do kalendarza domyślnego.
+        """
+        restored = []
+        for event in events:
+            if event.calendar_id not in self._calendars:
+                event.calendar_id = DEFAULT_CALENDAR_ID
+            if event.id in self._events:
                 continue
+            restored.append(event)
+        if restored:
+            self._index_many(restored)
+            self._emit_change("add", restored, {})
+            self._notify()
+        return len(restored)
 
-            start_dt = _as_datetime(component.decoded("DTSTART"))
-            if end_raw is None:
-                end_dt = start_dt + timedelta(hours=1)
-            else:
-                end_dt = _as_datetime(component.decoded("DTEND"))
-
-            self.add_event(
-                title=summary,
-                start_dt=start_dt,
-                end_dt=end_dt,
-                color_key=DEFAULT_COLOR_KEY,
-                description=description,
-            )
-            imported += 1
+    # --- pomocnicze -----------------------------------------------------
+    def to_utc(self, dt: datetime) -> datetime:
+        """Czas bez strefy traktujemy jako lokalny czas strefy wyświetlania."""
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=self._display_tz)
+        return dt.astimezone(UTC)
 
-        return imported
+    def _build_event(
+        self,
+        title: str,
+        start_dt: datetime,
+        end_dt: datetime,
+        color_key: str,
+        description: str,
+        calendar_id: str = DEFAULT_CALENDAR_ID,
+    ) -> Event:
+        event = Event(
+            id=str(uuid4()),
+            title=title.strip() or "Bez tytułu",
+            start=self.to_utc(start_dt),
+            end=self.to_utc(end_dt),
+            color_key=self._validate_color(color_key),
+            description=description.strip(),
+            calendar_id=calendar_id,
+        )
+        if event.end < event.start:
+            raise ValueError("Data zakończenia nie może być wcześniejsza niż data rozpoczęcia.")
+        return event
+
+    def _event_from_record(self, record: IcsRecord, target: CalendarInfo) -> Event:
+        event = self._build_event(
+            record.title, record.start, record.end, target.color_key, record.description, target.id
+        )
+        event.uid = record.uid
+        event.alarms = normalize_alarms(record.alarms)
+        return event
 
-    # --- pomocnicze -----------------------------------------------------
     def _validate_color(self, color_key: str) -> str:
         if color_key in COLOR_KEYS:
             return color_key
         return DEFAULT_COLOR_KEY
 
+    def _require_calendar(self, calendar_id: str) -> CalendarInfo:
+        info = self._calendars.get(calendar_id)
+        if info is None:
+            raise KeyError(f"Brak kalendarza o ID {calendar_id}")
+        return info
+
+    def _visible(self, events: List[Event], include_hidden: bool) -> List[Event]:
+        mask = self._visible_mask
+        if include_hidden or mask == self._all_mask:
+            return list(events)
+        return [event for event in events if event.calendar_bit & mask]
+
+    def _record(self, change: _Change, label: str) -> None:
+        if self._untracked_ids is not None:
+            self._emit_change(change.kind, change.events, change.before)
+            self._untracked_ids.update(event.id for event in change.events)
+            return
+        self._redo.clear()
+        self._emit_change(change.kind, change.events, change.before)
+        if self._open_group is not None:
+            self._open_group.changes.append(change)
+            return
+        self._push_undo(_UndoGroup(label, [change]))
+        self._notify()
+
+    def _forget_history(self, event_ids: Set[str]) -> None:
+        def touches(group: _UndoGroup) -> bool:
+            return any(event.id in event_ids for change in group.changes for event in change.events)
+
+        self._undo = [group for group in self._undo if not touches(group)]
+        self._redo = [group for group in self._redo if not touches(group)]
+
+    def _push_undo(self, group: _UndoGroup) -> None:
+        self._undo.append(group)
+        if len(self._undo) > UNDO_LIMIT:
+            del self._undo[0]
+
+    def _notify(self) -> None:
+        self._revision += 1
+        for callback in list(self._listeners):
+            callback()
+
+    def _emit_change(self, kind: str, events: List[Event], before: Dict[str, object]) -> None:
+        for callback in list(self._change_listeners):
+            callback(kind, events, before)
+
+    def _revert(self, change: _Change) -> None:
+        if change.kind == "add":
+            self._unindex_many(change.events)
+            self._emit_change("remove", change.events, {})
+        elif change.kind == "remove":
+            self._index_many(change.events)
+            self._emit_change("add", change.events, {})
+        else:
+            self._apply_fields(change.events[0], change.before)
+            self._emit_change("update", change.events, change.after)
+
+    def _replay(self, change: _Change) -> None:
+        if change.kind == "add":
+            self._index_many(change.events)
+        elif change.kind == "remove":
+            self._unindex_many(change.events)
+        else:
+            self._apply_fields(change.events[0], change.after)
+        self._emit_change(change.kind, change.events, change.before)
+
+    def _apply_fields(self, event: Event, fields: Dict[str, object]) -> None:
+        reindex = "start" in fields or "end" in fields or "calendar_id" in fields
+        if reindex:
+            self._unindex(event)
+        for name, value in fields.items():
+            setattr(event, name, value)
+        event.calendar_bit = self._calendars[event.calendar_id].bit
+        if reindex:
+            self._index(event)
+
+    def _derive_local_keys(self, event: Event) -> None:
+        # Konwersja przez zoneinfo uwzględnia zmianę czasu, więc dzień lokalny
+        # jest poprawny także w noce przejścia na czas letni/zimowy.
+        event.local_start = event.start.astimezone(self._display_tz)
+        event.local_end = event.end.astimezone(self._display_tz)
+        local_day = event.local_start.date()
+        event.day_key = local_day.toordinal()
+        event.week_key = event.day_key - local_day.weekday()
+
+    def _index(self, event: Event) -> None:
+        event.calendar_bit = self._calendars[event.calendar_id].bit
+        event.start_ts = event.start.timestamp()
+        event.end_ts = event.end.timestamp()
+        self._derive_local_keys(event)
+        self._events[event.id] = event
+        self._by_calendar.setdefault(event.calendar_id, {})[event.id] = event
+        insort(self._timeline, event, key=_timeline_key)
+        insort(self._day_index.setdefault(event.day_key, []), event, key=_timeline_key)
+        self._max_duration = max(self._max_duration, event.end_ts - event.start_ts)
+        self._link_conflicts(event)
+
+    def _index_many(self, events: Iterable[Event]) -> None:
+        batch = list(events)
+        if len(batch) < 64:
+            for event in batch:
+                self._index(event)
+            return
+
+        touched_days = set()
+        for event in batch:
+            event.calendar_bit = self._calendars[event.calendar_id].bit
+            event.start_ts = event.start.timestamp()
+            event.end_ts = event.end.timestamp()
+            self._derive_local_keys(event)
+            self._events[event.id] = event
+            self._by_calendar.setdefault(event.calendar_id, {})[event.id] = event
+            self._timeline.append(event)
+            self._day_index.setdefault(event.day_key, []).append(event)
+            touched_days.add(event.day_key)
+            self._max_duration = max(self._max_duration, event.end_ts - event.start_ts)
+        self._timeline.sort(key=_timeline_key)
+        for key in touched_days:
+            self._day_index[key].sort(key=_timeline_key)
+
+        if len(batch) * 8 >= len(self._timeline):
+            # Duży import: jedno zamiatanie całej osi jest tańsze niż zapytanie na wydarzenie.
+            self._rebuild_conflicts()
+        else:
+            for event in batch:
+                self._link_conflicts(event)
+
+    def _unindex(self, event: Event) -> None:
+        self._unlink_conflicts(event)
+        self._events.pop(event.id, None)
+        self._by_calendar.get(event.calendar_id, {}).pop(event.id, None)
+        _remove_sorted(self._timeline, event)
+        bucket = self._day_index.get(event.day_key)
+        if bucket is not None:
+            _remove_sorted(bucket, event)
+            if not bucket:
+                del self._day_index[event.day_key]
+
+    def _unindex_many(self, events: Iterable[Event]) -> None:
+        batch = list(events)
+        if len(batch) < 64:
+            for event in batch:
+                self._unindex(event)
+            return
+
+        # Każde ``del`` z osi czasu przesuwa resztę listy; przy tysiącach wydarzeń
+        # taniej jest przefiltrować oś raz niż usuwać po jednym.
+        removed_ids = set()
+        touched_days = set()
+        for event in batch:
+            self._unlink_conflicts(event)
+            self._events.pop(event.id, None)
+            self._by_calendar.get(event.calendar_id, {}).pop(event.id, None)
+            removed_ids.add(event.id)
+            touched_days.add(event.day_key)
+        self._timeline = [event for event in self._timeline if event.id not in removed_ids]
+        for key in touched_days:
+            bucket = [event for event in self._day_index.get(key, []) if event.id not in removed_ids]
+            if bucket:
+                self._day_index[key] = bucket
+            else:
+                self._day_index.pop(key, None)
+
+    def _link_conflicts(self, event: Event) -> None:
+        # Kandydaci to tylko sąsiedzi na osi czasu: wydarzenia zaczynające się
+        # najwyżej ``_max_duration`` przed początkiem i przed końcem tego wydarzenia.
+        if event.end_ts <= event.start_ts:
+            return
+        lo = bisect_left(self._timeline, event.start_ts - self._max_duration, key=_start_ts)
+        hi = bisect_left(self._timeline, event.end_ts, key=_start_ts)
+        for other in self._timeline[lo:hi]:
+            if other is not event and other.end_ts > event.start_ts and other.end_ts > other.start_ts:
+                self._conflicts.setdefault(event.id, set()).add(other.id)
+                self._conflicts.setdefault(other.id, set()).add(event.id)
+
+    def _unlink_conflicts(self, event: Event) -> None:
+        for other in self._conflicts.pop(event.id, ()):
+            linked = self._conflicts.get(other)
+            if linked is not None:
+                linked.discard(event.id)
+                if not linked:
+                    del self._conflicts[other]
+
+    def _rebuild_conflicts(self) -> None:
+        self._conflicts = {}
+        for first, second in self.conflicts(include_hidden=True):
+            self._conflicts.setdefault(first.id, set()).add(second.id)
+            self._conflicts.setdefault(second.id, set()).add(first.id)
+
 
 # --- funkcje pomocnicze -------------------------------------------------
 
+def _start_ts(event: Event) -> float:
+    return event.start_ts
+
+
+def _timeline_key(event: Event) -> Tuple[float, str]:
+    return (event.start_ts, event.id)
+
+
+def _remove_sorted(items: List[Event], event: Event) -> None:
+    index = bisect_left(items, _timeline_key(event), key=_timeline_key)
+    if index < len(items) and items[index] is event:
+        del items[index]
+
+
 def _normalize_to_date(value: date | datetime) -> date:
     if isinstance(value, datetime):
         return value.date()
     return value
 
 
-def _ensure_timezone(dt: datetime) -> datetime:
-    if dt.tzinfo is None:
-        return dt.replace(tzinfo=WARSAW_TZ)
-    return dt.astimezone(WARSAW_TZ)
-
-
 def _week_start(day: date) -> date:
     return day - timedelta(days=day.weekday())
 
 
+def parse_ics(path: str | Path) -> List[IcsRecord]:
+    """Czyta wydarzenia z pliku .ics bez dostępu do magazynu (bezpieczne w wątku roboczym)."""
+    with Path(path).open("rb") as handle:
+        return parse_ics_data(handle.read())
+
+
+def parse_ics_data(data: bytes) -> List[IcsRecord]:
+    # icalendar ładujemy dopiero tutaj, żeby tryb wiersza poleceń startował szybko.
+    from icalendar import Calendar
+
+    calendar = Calendar.from_ical(data)
+    records: List[IcsRecord] = []
+    for component in calendar.walk():
+        if component.name != "VEVENT":
+            continue
+        if component.get("DTSTART") is None:
+            continue
+
+        start_dt = _as_datetime(component.decoded("DTSTART"))
+        if component.get("DTEND") is None:
+            end_dt = start_dt + timedelta(hours=1)
+        else:
+            end_dt = _as_datetime(component.decoded("DTEND"))
+
+        records.append(
+            IcsRecord(
+                uid=str(component.get("UID", "")),
+                title=str(component.get("SUMMARY", "Wydarzenie")),
+                start=start_dt,
+                end=end_dt,
+                description=str(component.get("DESCRIPTION", "")),
+                alarms=_alarm_offsets(component, start_dt, end_dt),
+            )
+        )
+    return records
+
+
+def _alarm_offsets(component, start_dt: datetime, end_dt: datetime) -> Tuple[int, ...]:
+    """Minuty przed początkiem dla VALARM wydarzenia (względne do początku lub końca albo bezwzględne)."""
+    offsets = []
+    for alarm in component.subcomponents:
+        if alarm.name != "VALARM" or alarm.get("TRIGGER") is None:
+            continue
+        try:
+            trigger = alarm.decoded("TRIGGER")
+        except (ValueError, TypeError):
+            continue
+        if isinstance(trigger, timedelta):
+            if str(alarm["TRIGGER"].params.get("RELATED", "START")).upper() == "END":
+                trigger += end_dt - start_dt
+            before = -trigger
+        elif isinstance(trigger, datetime):
+            try:
+                before = start_dt - trigger
+            except TypeError:
+                # Czas z alarmu ze strefą, a wydarzenie bez strefy – nie da się ich porównać.
+                continue
+        else:
+            continue
+        offsets.append(round(before.total_seconds() / 60))
+    return normalize_alarms(offsets)
+
+
+def normalize_alarms(values: Iterable[int]) -> Tuple[int, ...]:
+    """Przypomnienia jako rosnąca krotka bez powtórzeń; te po początku wydarzenia są pomijane."""
+    return tuple(sorted({int(value) for value in values if int(value) >= 0}))
+
+
+def serialize_ics(events: Iterable[Event]) -> bytes:
+    """Zapisuje wydarzenia jako VCALENDAR (UID z pliku źródłowego albo ID wydarzenia)."""
+    from icalendar import Alarm, Calendar
+    from icalendar import Event as IcsEvent
+
+    calendar = Calendar()
+    calendar.add("prodid", "-//StudyHub//PL")
+    calendar.add("version", "2.0")
+    stamp = datetime.now(UTC)
+    for event in events:
+        component = IcsEvent()
+        component.add("uid", event.uid or event.id)
+        component.add("dtstamp", stamp)
+        component.add("summary", event.title)
+        component.add("dtstart", event.start)
+        component.add("dtend", event.end)
+        if event.description:
+            component.add("description", event.description)
+        for minutes in event.alarms:
+            alarm = Alarm()
+            alarm.add("action", "DISPLAY")
+            alarm.add("description", event.title)
+            alarm.add("trigger", timedelta(minutes=-minutes))
+            component.add_component(alarm)
+        calendar.add_component(component)
+    return calendar.to_ical()
+
+
+def _record_key(uid: str, title: str, start: datetime, end: datetime) -> object:
+    return uid or (title, start, end)
+
+
 def _as_datetime(value) -> datetime:
     if isinstance(value, datetime):
-        return _ensure_timezone(value)
+        return value
     if isinstance(value, date):
-        return _ensure_timezone(datetime.combine(value, datetime.min.time()))
+        return datetime.combine(value, datetime.min.time())
     raise TypeError(f"Nieobsługiwany typ daty: {type(value)}")
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from core.calendar import DEFAULT_CALENDAR_ID, UTC, CalendarStore, Event
+from core.paths import calendar_path, legacy_calendar_path
+from core.snapshot import SnapshotData, read_snapshot, write_snapshot
+
+# Wersja dawnego zapisu JSON (przed binarnym zrzutem).
+LEGACY_JSON_VERSION = 1
+
+
+def snapshot_payload(store: CalendarStore) -> Dict[str, object]:
+    """Zrzut magazynu: kalendarze i wiersze wydarzeń jako zwykłe krotki.
+
+    Budowanie zrzutu tylko czyta magazyn, a kodowanie i zapis (``write_payload``)
+    można wykonać w wątku roboczym.
+    """
+    return {
+        "calendars": [
+            {
+                "id": info.id,
+                "name": info.name,
+                "color_key": info.color_key,
+                "visible": info.visible,
+                "source": info.source,
+            }
+            for info in store.calendars()
+        ],
+        "events": [
+            (
+                event.id,
+                event.title,
+                event.start_ts,
+                event.end_ts,
+                event.color_key,
+                event.description,
+                event.calendar_id,
+                event.uid,
+                event.alarms,
+            )
+            for event in store.all_events(include_hidden=True)
+        ],
+    }
+
+
+def write_payload(payload: Dict[str, object], path: Optional[Path] = None) -> None:
+    write_snapshot(path or calendar_path(), payload["calendars"], payload["events"])
+
+
+def save_calendar(store: CalendarStore, path: Optional[Path] = None) -> None:
+    write_payload(snapshot_payload(store), path)
+
+
+def load_calendar(path: Optional[Path] = None, store: Optional[CalendarStore] = None) -> CalendarStore:
+    """Wczytuje zapisany kalendarz; brak pliku daje pusty magazyn.
+
+    Bez jawnej ścieżki dawny plik JSON jest migrowany: wczytany, zapisany jako
+    zrzut binarny i odłożony z rozszerzeniem ``.bak``.
+    """
+    if store is None:
+        store = CalendarStore()
+    target = path or calendar_path()
+    if target.exists():
+        _restore(store, read_snapshot(target))
+        return store
+
+    legacy = legacy_calendar_path()
+    if path is None and legacy.exists():
+        _restore(store, _read_legacy_json(legacy))
+        save_calendar(store, target)
+        os.replace(legacy, legacy.with_suffix(".json.bak"))
+    return store
+
+
+def set_aside_unreadable(path: Optional[Path] = None) -> Optional[Path]:
+    """Odkłada plik, którego ``load_calendar`` nie umiał wczytać, jako ``<plik>.corrupt-<czas>``.
+
+    Trzeba to zrobić przed pierwszym zapisem – inaczej nowy zrzut nadpisze jedyną
+    kopię danych. Zwraca ścieżkę odłożonego pliku albo ``None``, gdy pliku nie ma.
+    """
+    source = path or calendar_path()
+    if path is None and not source.exists():
+        source = legacy_calendar_path()
+    if not source.exists():
+        return None
+    target = source.with_name(f"{source.name}.corrupt-{datetime.now().strftime('%Y%m%d-%H%M%S')}")
+    os.replace(source, target)
+    return target
+
+
+def _restore(store: CalendarStore, data: SnapshotData) -> None:
+    hidden: List[str] = []
+    for entry in data.calendars:
+        calendar_id = entry["id"]
+        if store.get_calendar(calendar_id) is None:
+            store.create_calendar(
+                entry["name"], entry.get("color_key"), source=entry.get("source", ""), calendar_id=calendar_id
+            )
+        if not entry.get("visible", True):
+            hidden.append(calendar_id)
+    store.restore_events(data.events)
+    for calendar_id in hidden:
+        store.set_calendar_visible(calendar_id, False)
+
+
+def _read_legacy_json(path: Path) -> SnapshotData:
+    try:
+        with path.open("r", encoding="utf-8") as handle:
+            payload = json.load(handle)
+    except (OSError, ValueError) as exc:
+        raise ValueError(f"Nie można odczytać kalendarza {path}: {exc}") from None
+    if not isinstance(payload, dict) or payload.get("version") != LEGACY_JSON_VERSION:
+        raise ValueError(f"Nieobsługiwany format pliku kalendarza: {path}")
+
+    fromtimestamp = datetime.fromtimestamp
+    events = [
+        Event(
+            id=event_id,
+            title=title,
+            start=fromtimestamp(start_ts, UTC),
+            end=fromtimestamp(end_ts, UTC),
+            color_key=color_key,
+            description=description,
+            calendar_id=calendar_id or DEFAULT_CALENDAR_ID,
+            uid=uid,
+        )
+        for event_id, title, start_ts, end_ts, color_key, description, calendar_id, uid in payload.get("events", [])
+    ]
+    return SnapshotData(payload.get("calendars", []), events)
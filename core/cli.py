@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import signal
+import socket
+import sys
+from datetime import date
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+from core.calendar import CalendarStore, Event, serialize_ics
+from core.calendar_storage import load_calendar, save_calendar
+from core.settings import Settings
+
+DAY_NAMES = ["pn", "wt", "śr", "cz", "pt", "so", "nd"]
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Tryb wiersza poleceń: ``python main.py cli <polecenie>``.
+
+    Korzysta wyłącznie z ``core`` – nie ładuje PyQt6, więc nadaje się do skryptów
+    (nocny import, eksport) i paska stanu. Działa na tym samym zapisanym
+    kalendarzu co aplikacja.
+    """
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+    try:
+        store = load_calendar(store=CalendarStore(Settings().display_timezone()))
+        return args.handler(store, args)
+    except BrokenPipeError:
+        # Odbiorca (np. ``head``) zamknął potok – wynik nie jest już potrzebny.
+        sys.stdout = open(os.devnull, "w")
+        return 0
+    except (OSError, ValueError, KeyError) as exc:
+        message = exc.args[0] if isinstance(exc, KeyError) and exc.args else exc
+        print(f"Błąd: {message}", file=sys.stderr)
+        return 1
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="main.py cli", description="StudyHub bez interfejsu graficznego.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = commands.add_parser("import", help="importuje plik .ics do zapisanego kalendarza")
+    import_parser.add_argument("path", type=Path)
+    import_parser.add_argument("--calendar", help="nazwa kalendarza docelowego (domyślnie nazwa pliku)")
+    import_parser.set_defaults(handler=_cmd_import)
+
+    today_parser = commands.add_parser("today", help="wydarzenia z dzisiaj")
+    today_parser.add_argument("--json", action="store_true", help="wynik w formacie JSON")
+    today_parser.set_defaults(handler=_cmd_today)
+
+    week_parser = commands.add_parser("week", help="wydarzenia z bieżącego (lub wskazanego) tygodnia")
+    week_parser.add_argument("--date", type=date.fromisoformat, help="dowolny dzień tygodnia, RRRR-MM-DD")
+    week_parser.add_argument("--json", action="store_true", help="wynik w formacie JSON")
+    week_parser.set_defaults(handler=_cmd_week)
+
+    search_parser = commands.add_parser("search", help="szuka w tytułach i opisach wydarzeń")
+    search_parser.add_argument("query")
+    search_parser.add_argument("--limit", type=int, default=50)
+    search_parser.add_argument("--json", action="store_true", help="wynik w formacie JSON")
+    search_parser.set_defaults(handler=_cmd_search)
+
+    export_parser = commands.add_parser("export", help="zapisuje wydarzenia do pliku .ics")
+    export_parser.add_argument("path", type=Path)
+    export_parser.add_argument("--calendar", help="eksportuje tylko kalendarz o tej nazwie")
+    export_parser.set_defaults(handler=_cmd_export)
+
+    serve_parser = commands.add_parser("serve", help="uruchamia lokalną usługę zapytań JSON")
+    serve_parser.add_argument("--port", type=int, help="port TCP na 127.0.0.1 zamiast gniazda Unix")
+    serve_parser.add_argument("--socket", type=Path, help="ścieżka gniazda Unix")
+    serve_parser.set_defaults(handler=_cmd_serve)
+    return parser
+
+
+# --- polecenia ----------------------------------------------------------
+def _cmd_import(store: CalendarStore, args: argparse.Namespace) -> int:
+    from core.ics_cache import IcsCache
+
+    if not args.path.exists():
+        raise FileNotFoundError(f"Nie znaleziono pliku: {args.path}")
+    if args.calendar:
+        target = _find_calendar(store, args.calendar) or store.create_calendar(args.calendar)
+    else:
+        target = store.calendar_for_file(args.path)
+    # Nocny import tego samego eksportu zwykle trafia w pamięć podręczną i nie ładuje icalendar.
+    count = store.import_records(IcsCache().parse_file(args.path), target.id, f"Import {args.path.name}")
+    save_calendar(store)
+    print(f"Zaimportowano wydarzeń: {count}")
+    return 0
+
+
+def _cmd_today(store: CalendarStore, args: argparse.Namespace) -> int:
+    _print_events(store, store.events_for_day(store.now().date()), args.json)
+    return 0
+
+
+def _cmd_week(store: CalendarStore, args: argparse.Namespace) -> int:
+    _print_events(store, store.events_for_week(args.date or store.now().date()), args.json)
+    return 0
+
+
+def _cmd_search(store: CalendarStore, args: argparse.Namespace) -> int:
+    needle = args.query.casefold()
+    matches = [
+        event for event in store.all_events()
+        if needle in event.title.casefold() or needle in event.description.casefold()
+    ]
+    _print_events(store, matches[: max(args.limit, 0)], args.json)
+    return 0
+
+
+def _cmd_export(store: CalendarStore, args: argparse.Namespace) -> int:
+    events = store.all_events(include_hidden=True)
+    if args.calendar:
+        info = _find_calendar(store, args.calendar)
+        if info is None:
+            raise KeyError(f"Brak kalendarza o nazwie {args.calendar}")
+        events = [event for event in events if event.calendar_id == info.id]
+    args.path.write_bytes(serialize_ics(events))
+    print(f"Wyeksportowano wydarzeń: {len(events)}")
+    return 0
+
+
+def _cmd_serve(store: CalendarStore, args: argparse.Namespace) -> int:
+    from core.paths import query_socket_path
+    from core.query_service import DEFAULT_PORT, QueryService
+
+    # Bez wątku GUI właścicielem magazynu jest sama pętla asyncio.
+    service = QueryService(store)
+    revision = store.revision
+
+    async def serve() -> None:
+        if args.port is not None or not hasattr(socket, "AF_UNIX"):
+            host, port = await service.start_tcp(port=DEFAULT_PORT if args.port is None else args.port)
+            print(f"Usługa nasłuchuje na {host}:{port}", flush=True)
+        else:
+            path = args.socket or query_socket_path()
+            path.parent.mkdir(parents=True, exist_ok=True)
+            print(f"Usługa nasłuchuje na {await service.start_unix(path)}", flush=True)
+        stopped = asyncio.Event()
+        try:
+            # SIGTERM (np. od menedżera usług) kończy pracę tak samo jak Ctrl+C – z zapisem.
+            asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, stopped.set)
+        except (NotImplementedError, AttributeError):
+            pass
+        try:
+            await stopped.wait()
+        finally:
+            await service.stop()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if store.revision != revision:
+            save_calendar(store)
+    return 0
+
+
+# --- pomocnicze -----------------------------------------------------------
+def _find_calendar(store: CalendarStore, name: str):
+    return next((info for info in store.calendars() if info.name == name), None)
+
+
+def _print_events(store: CalendarStore, events: List[Event], as_json: bool) -> None:
+    if as_json:
+        rows = [
+            {
+                "id": event.id,
+                "title": event.title,
+                "start": event.local_start.isoformat(),
+                "end": event.local_end.isoformat(),
+                "calendar": _calendar_name(store, event),
+                "description": event.description,
+            }
+            for event in events
+        ]
+        print(json.dumps(rows, ensure_ascii=False, indent=2))
+        return
+    if not events:
+        print("Brak wydarzeń.")
+        return
+    for event in events:
+        start, end = event.local_start, event.local_end
+        print(
+            f"{DAY_NAMES[start.weekday()]} {start.strftime('%d.%m.%Y %H:%M')}–{end.strftime('%H:%M')}"
+            f"  {event.title}  ({_calendar_name(store, event)})"
+        )
+
+
+def _calendar_name(store: CalendarStore, event: Event) -> str:
+    info = store.get_calendar(event.calendar_id)
+    return info.name if info is not None else ""
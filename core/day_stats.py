@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+from datetime import date, datetime, time, timedelta, tzinfo
+from typing import Dict, Iterator, List, Tuple
+
+from core.calendar import CalendarStore, Event
+
+# (liczba wydarzeń, zajęte godziny) dla każdego dnia roku
+_YearArrays = Tuple[List[int], List[float]]
+
+
+class DayTotals:
+    """Liczba wydarzeń i zajęte godziny dla każdego dnia roku.
+
+    Tablice roku są budowane jednym zapytaniem zakresowym przy pierwszym użyciu,
+    a potem aktualizowane przyrostowo przez odbiorcę zmian magazynu (także przy
+    cofaniu i ponawianiu). Dane są trzymane osobno dla każdego kalendarza, więc
+    przełączanie widoczności warstw nie wymaga przeliczania.
+
+    Wydarzenie liczy się w dniu, w którym się zaczyna; godziny wydarzeń
+    wielodniowych są rozdzielane między kolejne dni.
+    """
+
+    def __init__(self, store: CalendarStore) -> None:
+        self._store = store
+        self._tz: tzinfo = store.display_tz
+        # rok -> ID kalendarza -> tablice dni
+        self._years: Dict[int, Dict[str, _YearArrays]] = {}
+        store.add_change_listener(self._on_store_change)
+        store.add_listener(self._on_store_notify)
+
+    def close(self) -> None:
+        self._store.remove_change_listener(self._on_store_change)
+        self._store.remove_listener(self._on_store_notify)
+
+    # --- zapytania ------------------------------------------------------
+    def counts(self, year: int, *, include_hidden: bool = False) -> List[int]:
+        return self._sum(year, 0, include_hidden)
+
+    def hours(self, year: int, *, include_hidden: bool = False) -> List[float]:
+        return self._sum(year, 1, include_hidden)
+
+    def _sum(self, year: int, column: int, include_hidden: bool) -> list:
+        per_calendar = self._year(year)
+        total = [0] * _days_in_year(year)
+        for calendar_id, arrays in per_calendar.items():
+            info = self._store.get_calendar(calendar_id)
+            if info is None or not (include_hidden or info.visible):
+                continue
+            total = [a + b for a, b in zip(total, arrays[column])]
+        return total
+
+    def _year(self, year: int) -> Dict[str, _YearArrays]:
+        per_calendar = self._years.get(year)
+        if per_calendar is None:
+            per_calendar = {}
+            self._years[year] = per_calendar
+            tz = self._tz
+            start = datetime.combine(date(year, 1, 1), time.min, tz)
+            end = datetime.combine(date(year + 1, 1, 1), time.min, tz)
+            # Wydarzenia zaczęte w poprzednim roku też mogą zajmować godziny w tym.
+            for event in self._store.events_between(start, end, include_hidden=True):
+                self._add(per_calendar, year, event.calendar_id, event.local_start, event.local_end, 1)
+        return per_calendar
+
+    # --- aktualizacje -----------------------------------------------------
+    def _on_store_notify(self) -> None:
+        if self._store.display_tz is not self._tz:
+            # Inna strefa wyświetlania to inne granice dni – liczymy od nowa.
+            self._tz = self._store.display_tz
+            self._years.clear()
+
+    def _on_store_change(self, kind: str, events: List[Event], before: Dict[str, object]) -> None:
+        if not self._years:
+            return
+        sign = -1 if kind == "remove" else 1
+        for event in events:
+            if kind == "update":
+                if not {"start", "end", "calendar_id"} & before.keys():
+                    continue
+                old_start = before.get("start", event.start).astimezone(self._tz)
+                old_end = before.get("end", event.end).astimezone(self._tz)
+                self._apply(before.get("calendar_id", event.calendar_id), old_start, old_end, -1)
+            self._apply(
+                event.calendar_id,
+                event.start.astimezone(self._tz),
+                event.end.astimezone(self._tz),
+                sign,
+            )
+
+    def _apply(self, calendar_id: str, local_start: datetime, local_end: datetime, sign: int) -> None:
+        for year in range(local_start.year, local_end.year + 1):
+            per_calendar = self._years.get(year)
+            if per_calendar is not None:
+                self._add(per_calendar, year, calendar_id, local_start, local_end, sign)
+
+    @staticmethod
+    def _add(
+        per_calendar: Dict[str, _YearArrays],
+        year: int,
+        calendar_id: str,
+        local_start: datetime,
+        local_end: datetime,
+        sign: int,
+    ) -> None:
+        arrays = per_calendar.get(calendar_id)
+        if arrays is None:
+            size = _days_in_year(year)
+            arrays = ([0] * size, [0.0] * size)
+            per_calendar[calendar_id] = arrays
+        counts, hours = arrays
+        first = date(year, 1, 1).toordinal()
+        if local_start.year == year:
+            counts[local_start.toordinal() - first] += sign
+        for day, seconds in _split_by_day(local_start, local_end):
+            if day.year == year:
+                hours[day.toordinal() - first] += sign * seconds / 3600
+
+
+def _split_by_day(local_start: datetime, local_end: datetime) -> Iterator[Tuple[date, float]]:
+    day = local_start.date()
+    if local_end.date() == day:
+        # Najczęstszy przypadek: wydarzenie mieści się w jednym dniu.
+        yield day, local_end.timestamp() - local_start.timestamp()
+        return
+    cursor = local_start
+    while cursor < local_end:
+        next_midnight = datetime.combine(cursor.date() + timedelta(days=1), time.min, cursor.tzinfo)
+        segment_end = min(next_midnight, local_end)
+        yield cursor.date(), segment_end.timestamp() - cursor.timestamp()
+        cursor = segment_end
+
+
+def _days_in_year(year: int) -> int:
+    return date(year + 1, 1, 1).toordinal() - date(year, 1, 1).toordinal()
+
+
+def day_index(day: date) -> int:
+    """Numer dnia w roku liczony od zera – indeks w tablicach ``DayTotals``."""
+    return day.toordinal() - date(day.year, 1, 1).toordinal()
+
@@ -0,0 +1,381 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import time
+from bisect import bisect_left, bisect_right, insort
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+from uuid import uuid4
+
+DECK_FORMAT_VERSION = 1
+DAY_SECONDS = 86400
+# Karta oceniona jako zapomniana wraca jeszcze w tej samej sesji.
+RELEARN_SECONDS = 10 * 60
+DEFAULT_EASE = 2.5
+MIN_EASE = 1.3
+
+# Oceny w stylu SM-2 (0–5) odpowiadające przyciskom w widoku powtórek.
+GRADE_AGAIN = 1
+GRADE_HARD = 3
+GRADE_GOOD = 4
+GRADE_EASY = 5
+
+_UNSAFE_NAME = re.compile(r"[^\w\- ąćęłńóśźżĄĆĘŁŃÓŚŹŻ]+")
+
+
+@dataclass
+class Card:
+    """Fiszka wraz ze stanem powtórek SM-2. ``due`` to czas epoki (sekundy, UTC)."""
+
+    id: str
+    deck: str
+    front: str
+    back: str
+    due: float = 0.0
+    interval: float = 0.0
+    ease: float = DEFAULT_EASE
+    repetitions: int = 0
+    lapses: int = 0
+
+    def as_row(self) -> list:
+        return [
+            self.id,
+            self.front,
+            self.back,
+            round(self.due, 1),
+            round(self.interval, 4),
+            round(self.ease, 3),
+            self.repetitions,
+            self.lapses,
+        ]
+
+    @classmethod
+    def from_row(cls, deck: str, row: list) -> "Card":
+        card_id, front, back, due, interval, ease, repetitions, lapses = row
+        return cls(card_id, deck, front, back, due, interval, ease, repetitions, lapses)
+
+
+class DueQueue:
+    """Kolejka priorytetowa kart według terminu powtórki.
+
+    Trzymamy posortowaną tablicę par (termin, ID) zamiast kopca binarnego: daje
+    ten sam dostęp do najbliższej karty, a dodatkowo liczenie kart do danego
+    terminu to jedno wyszukiwanie binarne.
+    """
+
+    def __init__(self) -> None:
+        self._entries: List[Tuple[float, str]] = []
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def push(self, due: float, card_id: str) -> None:
+        insort(self._entries, (due, card_id))
+
+    def remove(self, due: float, card_id: str) -> None:
+        index = bisect_left(self._entries, (due, card_id))
+        if index < len(self._entries) and self._entries[index] == (due, card_id):
+            del self._entries[index]
+
+    def peek(self) -> Optional[Tuple[float, str]]:
+        return self._entries[0] if self._entries else None
+
+    def count_until(self, moment: float) -> int:
+        return bisect_right(self._entries, (moment, "\uffff"))
+
+    def head(self, limit: int, until: float) -> List[str]:
+        stop = min(limit, self.count_until(until))
+        return [card_id for _, card_id in self._entries[:stop]]
+
+    def card_ids(self) -> List[str]:
+        return [card_id for _, card_id in self._entries]
+
+    def rebuild(self, entries: List[Tuple[float, str]]) -> None:
+        self._entries = sorted(entries)
+
+    def extend(self, entries: List[Tuple[float, str]]) -> None:
+        self._entries.extend(entries)
+        self._entries.sort()
+
+
+class FlashcardStore:
+    """Talie fiszek zapisane w katalogu; każda talia to jeden plik JSON.
+
+    Karty zapisujemy jako tablice pól (bez powtarzania kluczy), a na dysk trafiają
+    tylko talie zmienione od ostatniego zapisu.
+    """
+
+    def __init__(self, root: str | Path) -> None:
+        self._root = Path(root)
+        self._cards: Dict[str, Card] = {}
+        self._decks: Dict[str, DueQueue] = {}
+        self._deck_files: Dict[str, Path] = {}
+        self._dirty: Set[str] = set()
+
+    @property
+    def root(self) -> Path:
+        return self._root
+
+    @property
+    def media_dir(self) -> Path:
+        return self._root / "media"
+
+    def media_path(self, source: str) -> Path:
+        path = Path(source)
+        return path if path.is_absolute() else self.media_dir / path
+
+    # --- trwałość -------------------------------------------------------
+    def load(self) -> None:
+        self._cards.clear()
+        self._decks.clear()
+        self._deck_files.clear()
+        self._dirty.clear()
+        if not self._root.exists():
+            return
+
+        for path in sorted(self._root.glob("*.json")):
+            try:
+                with path.open("r", encoding="utf-8") as handle:
+                    payload = json.load(handle)
+            except (OSError, ValueError):
+                continue
+            if payload.get("version") != DECK_FORMAT_VERSION:
+                continue
+            deck = str(payload["name"])
+            self._deck_files[deck] = path
+            entries: List[Tuple[float, str]] = []
+            for row in payload["cards"]:
+                card = Card.from_row(deck, row)
+                self._cards[card.id] = card
+                entries.append((card.due, card.id))
+            queue = DueQueue()
+            queue.rebuild(entries)
+            self._decks[deck] = queue
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+        self._root.mkdir(parents=True, exist_ok=True)
+        for deck in list(self._dirty):
+            path = self._deck_path(deck)
+            queue = self._decks.get(deck)
+            if queue is None:
+                path.unlink(missing_ok=True)
+                self._deck_files.pop(deck, None)
+                continue
+            rows = [self._cards[card_id].as_row() for card_id in queue.card_ids()]
+            payload = {"version": DECK_FORMAT_VERSION, "name": deck, "cards": rows}
+            tmp_path = path.with_suffix(".tmp")
+            with tmp_path.open("w", encoding="utf-8") as handle:
+                json.dump(payload, handle, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_path, path)
+        self._dirty.clear()
+
+    @property
+    def has_unsaved_changes(self) -> bool:
+        return bool(self._dirty)
+
+    # --- talie i karty --------------------------------------------------
+    def decks(self) -> List[str]:
+        return sorted(self._decks, key=str.casefold)
+
+    def create_deck(self, name: str) -> str:
+        deck = name.strip() or "Nowa talia"
+        if deck not in self._decks:
+            self._decks[deck] = DueQueue()
+            self._dirty.add(deck)
+        return deck
+
+    def remove_deck(self, deck: str) -> None:
+        queue = self._decks.pop(deck, None)
+        if queue is None:
+            return
+        for card_id in queue.card_ids():
+            self._cards.pop(card_id, None)
+        self._dirty.add(deck)
+
+    def deck_size(self, deck: str) -> int:
+        queue = self._decks.get(deck)
+        return len(queue) if queue is not None else 0
+
+    def __len__(self) -> int:
+        return len(self._cards)
+
+    def add_card(self, deck: str, front: str, back: str, *, now: Optional[float] = None) -> str:
+        deck = self.create_deck(deck)
+        card = Card(
+            id=uuid4().hex,
+            deck=deck,
+            front=front.strip(),
+            back=back.strip(),
+            due=time.time() if now is None else now,
+        )
+        if not card.front:
+            raise ValueError("Fiszka musi mieć treść pytania.")
+        self._cards[card.id] = card
+        self._decks[deck].push(card.due, card.id)
+        self._dirty.add(deck)
+        return card.id
+
+    def add_cards(self, deck: str, pairs: List[Tuple[str, str]], *, now: Optional[float] = None) -> int:
+        """Dodaje paczkę kart naraz – kolejkę sortujemy raz zamiast wstawiać pojedynczo."""
+        deck = self.create_deck(deck)
+        moment = time.time() if now is None else now
+        entries: List[Tuple[float, str]] = []
+        for front, back in pairs:
+            front = front.strip()
+            if not front:
+                continue
+            card = Card(id=uuid4().hex, deck=deck, front=front, back=back.strip(), due=moment)
+            self._cards[card.id] = card
+            entries.append((card.due, card.id))
+        if entries:
+            self._decks[deck].extend(entries)
+            self._dirty.add(deck)
+        return len(entries)
+
+    def card_digests(self, deck: str) -> Set[bytes]:
+        queue = self._decks.get(deck)
+        if queue is None:
+            return set()
+        return {card_digest(self._cards[card_id].front, self._cards[card_id].back) for card_id in queue.card_ids()}
+
+    def update_card(self, card_id: str, *, front: Optional[str] = None, back: Optional[str] = None) -> None:
+        card = self._require(card_id)
+        if front is not None:
+            if not front.strip():
+                raise ValueError("Fiszka musi mieć treść pytania.")
+            card.front = front.strip()
+        if back is not None:
+            card.back = back.strip()
+        self._dirty.add(card.deck)
+
+    def remove_card(self, card_id: str) -> None:
+        card = self._cards.pop(card_id, None)
+        if card is None:
+            return
+        self._decks[card.deck].remove(card.due, card.id)
+        self._dirty.add(card.deck)
+
+    def get_card(self, card_id: str) -> Optional[Card]:
+        return self._cards.get(card_id)
+
+    # --- kolejka powtórek ----------------------------------------------
+    def next_due(self, deck: Optional[str] = None, *, now: Optional[float] = None) -> Optional[Card]:
+        moment = time.time() if now is None else now
+        best: Optional[Tuple[float, str]] = None
+        for queue in self._queues(deck):
+            head = queue.peek()
+            if head is not None and head[0] <= moment and (best is None or head < best):
+                best = head
+        return self._cards[best[1]] if best is not None else None
+
+    def due_cards(self, deck: Optional[str] = None, *, limit: int = 20, now: Optional[float] = None) -> List[Card]:
+        """Najbliższe ``limit`` kart do powtórki, posortowane po terminie."""
+        moment = time.time() if now is None else now
+        candidates: List[Tuple[float, str]] = []
+        for queue in self._queues(deck):
+            candidates.extend((self._cards[card_id].due, card_id) for card_id in queue.head(limit, moment))
+        candidates.sort()
+        return [self._cards[card_id] for _, card_id in candidates[:limit]]
+
+    def count_due(self, deck: Optional[str] = None, *, until: Optional[float] = None) -> int:
+        moment = end_of_today() if until is None else until
+        return sum(queue.count_until(moment) for queue in self._queues(deck))
+
+    def review(self, card_id: str, grade: int, *, now: Optional[float] = None) -> Card:
+        """Ocena odpowiedzi w skali 0–5 i wyznaczenie kolejnego terminu (SM-2)."""
+        card = self._require(card_id)
+        moment = time.time() if now is None else now
+        grade = max(0, min(5, grade))
+        queue = self._decks[card.deck]
+        queue.remove(card.due, card.id)
+
+        if grade < 3:
+            card.repetitions = 0
+            card.lapses += 1
+            card.interval = 0.0
+            card.due = moment + RELEARN_SECONDS
+        else:
+            if card.repetitions == 0:
+                card.interval = 1.0
+            elif card.repetitions == 1:
+                card.interval = 6.0
+            else:
+                card.interval = card.interval * card.ease
+            card.repetitions += 1
+            card.due = moment + card.interval * DAY_SECONDS
+        penalty = 5 - grade
+        card.ease = max(MIN_EASE, card.ease + 0.1 - penalty * (0.08 + penalty * 0.02))
+
+        queue.push(card.due, card.id)
+        self._dirty.add(card.deck)
+        return card
+
+    # --- pomocnicze -----------------------------------------------------
+    def _queues(self, deck: Optional[str]) -> List[DueQueue]:
+        if deck is None:
+            return list(self._decks.values())
+        queue = self._decks.get(deck)
+        return [queue] if queue is not None else []
+
+    def _require(self, card_id: str) -> Card:
+        card = self._cards.get(card_id)
+        if card is None:
+            raise KeyError(f"Brak fiszki o ID {card_id}")
+        return card
+
+    def _deck_path(self, deck: str) -> Path:
+        path = self._deck_files.get(deck)
+        if path is None:
+            base = _UNSAFE_NAME.sub(" ", deck).strip() or "talia"
+            path = self._root / f"{base}.json"
+            counter = 2
+            taken = set(self._deck_files.values())
+            while path in taken or path.exists():
+                path = self._root / f"{base} ({counter}).json"
+                counter += 1
+            self._deck_files[deck] = path
+        return path
+
+
+class ReviewSession:
+    """Sesja powtórek jednej talii (lub wszystkich) oparta o kolejkę terminów."""
+
+    def __init__(self, store: FlashcardStore, deck: Optional[str] = None) -> None:
+        self._store = store
+        self.deck = deck
+        self.reviewed = 0
+        self.current: Optional[Card] = None
+
+    def next_card(self) -> Optional[Card]:
+        self.current = self._store.next_due(self.deck)
+        return self.current
+
+    def answer(self, grade: int) -> Optional[Card]:
+        if self.current is not None:
+            self._store.review(self.current.id, grade)
+            self.reviewed += 1
+        return self.next_card()
+
+    def remaining(self) -> int:
+        return self._store.count_due(self.deck, until=time.time())
+
+    def upcoming(self, limit: int) -> List[Card]:
+        return self._store.due_cards(self.deck, limit=limit)
+
+
+def card_digest(front: str, back: str) -> bytes:
+    """Skrót treści karty (bez różnic w wielkości liter i białych znakach) do wykrywania duplikatów."""
+    normalized = f"{' '.join(front.split()).casefold()}\x1f{' '.join(back.split()).casefold()}"
+    return hashlib.blake2b(normalized.encode("utf-8"), digest_size=12).digest()
+
+
+def end_of_today() -> float:
+    tomorrow = datetime.now().date() + timedelta(days=1)
+    return datetime.combine(tomorrow, datetime.min.time()).timestamp()
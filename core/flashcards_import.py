@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import codecs
+import csv
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, List, Optional, Set, Tuple
+
+from core.flashcards import FlashcardStore, card_digest
+
+IMPORT_BATCH_SIZE = 1000
+# Nagłówki kolumn, które rozpoznajemy i pomijamy w pierwszym wierszu pliku.
+HEADER_NAMES = {"front", "back", "question", "answer", "przód", "tył", "pytanie", "odpowiedź"}
+
+CardPair = Tuple[str, str]
+
+
+@dataclass
+class ImportProgress:
+    total_bytes: int
+    read_bytes: int = 0
+    imported: int = 0
+    duplicates: int = 0
+    skipped: int = 0
+
+    @property
+    def fraction(self) -> float:
+        if not self.total_bytes:
+            return 1.0
+        return min(1.0, self.read_bytes / self.total_bytes)
+
+
+def iter_card_batches(
+    path: str | Path,
+    *,
+    known: Set[bytes],
+    progress: ImportProgress,
+    batch_size: int = IMPORT_BATCH_SIZE,
+    should_stop: Callable[[], bool] = lambda: False,
+) -> Iterator[List[CardPair]]:
+    """Strumieniowo czyta plik CSV/TSV i oddaje paczki nowych kart (bez duplikatów).
+
+    Z treści pliku w pamięci jest naraz tylko jedna paczka, ale zbiór skrótów
+    ``known`` rośnie o jeden wpis (12-bajtowy skrót, ok. 100 B z narzutem zbioru)
+    na każdy unikalny wiersz – pamięć rośnie więc z liczbą nowych kart, choć dużo
+    wolniej niż sam plik. ``known`` jest uzupełniany o nowe skróty.
+    """
+    file_path = Path(path)
+    with file_path.open("rb") as handle:
+        delimiter = _detect_delimiter(file_path, handle.read(4096))
+        handle.seek(0)
+        rows = csv.reader(_decoded_lines(handle, progress), delimiter=delimiter)
+
+        batch: List[CardPair] = []
+        for line_no, row in enumerate(rows):
+            if should_stop():
+                return
+            pair = _row_to_card(row)
+            if pair is None:
+                progress.skipped += 1
+                continue
+            if line_no == 0 and pair[0].strip().casefold() in HEADER_NAMES:
+                continue
+            digest = card_digest(*pair)
+            if digest in known:
+                progress.duplicates += 1
+                continue
+            known.add(digest)
+            batch.append(pair)
+            if len(batch) >= batch_size:
+                progress.imported += len(batch)
+                yield batch
+                batch = []
+        if batch:
+            progress.imported += len(batch)
+            yield batch
+
+
+def import_deck_file(
+    store: FlashcardStore,
+    path: str | Path,
+    deck: str,
+    *,
+    on_progress: Optional[Callable[[ImportProgress], None]] = None,
+) -> ImportProgress:
+    """Import w bieżącym wątku – dla skryptów; GUI wykonuje go w tle paczkami."""
+    file_path = Path(path)
+    progress = ImportProgress(total_bytes=file_path.stat().st_size)
+    known = store.card_digests(deck)
+    for batch in iter_card_batches(file_path, known=known, progress=progress):
+        store.add_cards(deck, batch)
+        if on_progress is not None:
+            on_progress(progress)
+    return progress
+
+
+# --- funkcje pomocnicze -------------------------------------------------
+
+def _decoded_lines(handle, progress: ImportProgress) -> Iterable[str]:
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    for raw in handle:
+        progress.read_bytes += len(raw)
+        yield decoder.decode(raw)
+
+
+def _detect_delimiter(path: Path, sample: bytes) -> str:
+    if path.suffix.lower() in (".tsv", ".tab", ".txt"):
+        return "\t"
+    text = sample.decode("utf-8", errors="replace")
+    try:
+        return csv.Sniffer().sniff(text, delimiters=",;\t").delimiter
+    except csv.Error:
+        return ","
+
+
+def _row_to_card(row: List[str]) -> Optional[CardPair]:
+    if not row:
+        return None
+    front = row[0].strip()
+    if not front:
+        return None
+    back = row[1].strip() if len(row) > 1 else ""
+    return (front, back)
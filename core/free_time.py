@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from operator import attrgetter
+from typing import Collection, Iterable, List, Tuple
+
+from core.calendar import CalendarStore, Event
+
+
+@dataclass
+class FreeTimeQuery:
+    """Parametry wyszukiwania wolnego czasu: minimalna długość i godziny pracy."""
+
+    min_length: timedelta = timedelta(minutes=30)
+    day_start: time = time(8, 0)
+    day_end: time = time(20, 0)
+
+    def __post_init__(self) -> None:
+        if self.day_end <= self.day_start:
+            raise ValueError("Koniec dnia pracy musi być późniejszy niż jego początek.")
+        if self.min_length <= timedelta(0):
+            raise ValueError("Minimalna długość okna musi być dodatnia.")
+
+
+@dataclass
+class FreeSlot:
+    """Wolne okno w strefie wyświetlania magazynu."""
+
+    start: datetime
+    end: datetime
+
+    @property
+    def duration(self) -> timedelta:
+        return self.end - self.start
+
+
+def merge_busy(events: Iterable[Event]) -> List[Tuple[float, float]]:
+    """Scala nakładające się wydarzenia w rozłączne przedziały zajętości (UTC, sekundy).
+
+    Linia zamiatania po posortowanych początkach: O(n log n). Wyniki zapytań
+    magazynu są już posortowane po początku, więc wtedy sortowanie jest pomijane.
+    """
+    ordered = list(events)
+    if any(ordered[index].start_ts > ordered[index + 1].start_ts for index in range(len(ordered) - 1)):
+        ordered.sort(key=attrgetter("start_ts"))
+
+    merged: List[Tuple[float, float]] = []
+    current_start = current_end = None
+    for event in ordered:
+        start, end = event.start_ts, event.end_ts
+        if current_end is not None and start <= current_end:
+            if end > current_end:
+                current_end = end
+            continue
+        if current_end is not None:
+            merged.append((current_start, current_end))
+        current_start, current_end = start, end
+    if current_end is not None:
+        merged.append((current_start, current_end))
+    return merged
+
+
+def find_free_slots(
+    store: CalendarStore,
+    first_day: date,
+    last_day: date,
+    query: FreeTimeQuery | None = None,
+    *,
+    include_hidden: bool = False,
+    ignore: Collection[str] = (),
+) -> List[FreeSlot]:
+    """Wolne okna w godzinach pracy każdego dnia z zakresu [first_day, last_day].
+
+    ``ignore`` to ID wydarzeń traktowanych jak wolny czas (np. sesje do przełożenia).
+    """
+    query = query or FreeTimeQuery()
+    if last_day < first_day:
+        return []
+
+    tz = store.display_tz
+    windows: List[Tuple[float, float]] = []
+    day = first_day
+    while day <= last_day:
+        # Granice liczymy osobno dla każdego dnia, żeby zmiana czasu nie przesuwała godzin pracy.
+        windows.append((
+            datetime.combine(day, query.day_start, tz).timestamp(),
+            datetime.combine(day, query.day_end, tz).timestamp(),
+        ))
+        day += timedelta(days=1)
+
+    range_start = datetime.combine(first_day, query.day_start, tz)
+    range_end = datetime.combine(last_day, query.day_end, tz)
+    events = store.events_between(range_start, range_end, include_hidden=include_hidden)
+    if ignore:
+        events = [event for event in events if event.id not in ignore]
+    busy = merge_busy(events)
+
+    min_seconds = query.min_length.total_seconds()
+    slots: List[FreeSlot] = []
+    first_busy = 0
+    for window_start, window_end in windows:
+        # Okna dni rosną, więc przedziały zakończone przed oknem pomijamy na stałe.
+        while first_busy < len(busy) and busy[first_busy][1] <= window_start:
+            first_busy += 1
+
+        cursor = window_start
+        index = first_busy
+        while index < len(busy) and busy[index][0] < window_end:
+            busy_start, busy_end = busy[index]
+            if busy_start - cursor >= min_seconds:
+                slots.append(_slot(cursor, busy_start, tz))
+            cursor = max(cursor, busy_end)
+            index += 1
+        if window_end - cursor >= min_seconds:
+            slots.append(_slot(cursor, window_end, tz))
+    return slots
+
+
+def _slot(start_ts: float, end_ts: float, tz) -> FreeSlot:
+    return FreeSlot(datetime.fromtimestamp(start_ts, tz), datetime.fromtimestamp(end_ts, tz))
@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import struct
+import threading
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+
+from core.calendar import UTC, IcsRecord, parse_ics_data
+from core.paths import ics_cache_dir
+
+MAGIC = b"SHIC"
+# Zmiana układu rekordu albo tego, co parser wyciąga z VEVENT, wymaga nowej wersji:
+# wersja wchodzi do nazwy pliku, więc stare wpisy po prostu przestają trafiać
+# i wypadają z pamięci podręcznej przy najbliższym przycinaniu.
+CACHE_VERSION = 2
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# magia, wersja, CRC32 reszty pliku, liczba rekordów, długość tablicy napisów
+_HEADER = struct.Struct("<4sHIII")
+# początek, koniec (sekundy), indeksy napisów: uid, tytuł, opis, przypomnienia („15,60”); flagi czasu lokalnego
+_RECORD = struct.Struct("<ddIIIIB3x")
+_START_FLOATING = 0x01
+_END_FLOATING = 0x02
+_STRING_SEPARATOR = "\x00"
+_SUFFIX = ".rec"
+
+
+def content_digest(data: bytes) -> str:
+    """Skrót treści pliku .ics – ten sam, którego używa obserwator folderu."""
+    return hashlib.blake2b(data).hexdigest()
+
+
+class IcsCache:
+    """Sparsowane rekordy plików .ics zapisane na dysku według skrótu treści.
+
+    Ponowny import niezmienionego pliku omija ``icalendar`` (``Calendar.from_ical``
+    i dekodowanie dat) i wczytuje gotowe rekordy z pliku o stałej szerokości
+    rekordu. Łączny rozmiar katalogu jest ograniczony; przy przekroczeniu usuwane
+    są wpisy najdawniej używane (trafienie odświeża czas modyfikacji pliku).
+
+    Metody są bezpieczne w wątkach roboczych – każdy wpis zapisuje się atomowo,
+    a uszkodzony wpis jest traktowany jak brak trafienia.
+    """
+
+    def __init__(self, directory: str | Path | None = None, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.directory = Path(directory) if directory is not None else ics_cache_dir()
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    # --- import -----------------------------------------------------------
+    def parse_file(self, path: str | Path) -> List[IcsRecord]:
+        with Path(path).open("rb") as handle:
+            return self.parse(handle.read())
+
+    def parse(self, data: bytes, digest: Optional[str] = None) -> List[IcsRecord]:
+        """Rekordy z treści pliku: z pamięci podręcznej albo z parsera (i zapisane)."""
+        key = digest or content_digest(data)
+        records = self.get(key)
+        if records is None:
+            records = parse_ics_data(data)
+            self.put(key, records)
+        return records
+
+    # --- wpisy ------------------------------------------------------------
+    def get(self, digest: str) -> Optional[List[IcsRecord]]:
+        path = self._entry_path(digest)
+        try:
+            data = path.read_bytes()
+        except OSError:
+            return None
+        try:
+            records = _decode(data)
+        except (ValueError, struct.error, UnicodeDecodeError, IndexError, OverflowError, OSError):
+            self._remove(path)
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return records
+
+    def put(self, digest: str, records: List[IcsRecord]) -> None:
+        if not self.max_bytes:
+            return
+        data = _encode(records)
+        if len(data) > self.max_bytes:
+            return
+        path = self._entry_path(digest)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            # Pamięć podręczna jest tylko przyspieszeniem – błąd zapisu nie psuje importu.
+            self._remove(tmp_path)
+            return
+        self._trim()
+
+    def clear(self) -> None:
+        with self._lock:
+            for path in self._entries():
+                self._remove(path)
+
+    def _entry_path(self, digest: str) -> Path:
+        return self.directory / f"v{CACHE_VERSION}-{digest}{_SUFFIX}"
+
+    def _entries(self) -> List[Path]:
+        try:
+            return [path for path in self.directory.iterdir() if path.suffix == _SUFFIX]
+        except OSError:
+            return []
+
+    def _trim(self) -> None:
+        with self._lock:
+            entries = []
+            for path in self._entries():
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime_ns, stat.st_size, path))
+            total = sum(size for _mtime, size, _path in entries)
+            if total <= self.max_bytes:
+                return
+            entries.sort(key=lambda entry: entry[0])
+            for _mtime, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                self._remove(path)
+                total -= size
+
+    @staticmethod
+    def _remove(path: Path) -> None:
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+
+# --- format wpisu -----------------------------------------------------------
+# Czasy ze strefą zapisujemy jako chwilę UTC (to ta sama chwila, więc import daje
+# identyczne wydarzenia). Czasy „pływające” (bez strefy, np. całodniowe) zapisujemy
+# jako czas ścienny z flagą, żeby magazyn nadal interpretował je w strefie widoku.
+def _encode(records: List[IcsRecord]) -> bytes:
+    strings = {"": 0}
+
+    def intern(value: str) -> int:
+        index = strings.get(value)
+        if index is None:
+            index = strings[value] = len(strings)
+        return index
+
+    def timestamp(value: datetime) -> float:
+        if value.tzinfo is None:
+            return value.replace(tzinfo=UTC).timestamp()
+        return value.timestamp()
+
+    pack = _RECORD.pack
+    body = b"".join(
+        pack(
+            timestamp(record.start),
+            timestamp(record.end),
+            intern(record.uid),
+            intern(record.title),
+            intern(record.description),
+            intern(",".join(map(str, record.alarms))),
+            (_START_FLOATING if record.start.tzinfo is None else 0)
+            | (_END_FLOATING if record.end.tzinfo is None else 0),
+        )
+        for record in records
+    )
+    string_data = _STRING_SEPARATOR.join(value.replace(_STRING_SEPARATOR, "") for value in strings).encode("utf-8")
+    checksum = zlib.crc32(string_data, zlib.crc32(body))
+    return _HEADER.pack(MAGIC, CACHE_VERSION, checksum, len(records), len(string_data)) + body + string_data
+
+
+def _decode(data: bytes) -> List[IcsRecord]:
+    magic, version, checksum, count, strings_size = _HEADER.unpack_from(data)
+    if magic != MAGIC or version != CACHE_VERSION:
+        raise ValueError("Nieznany format wpisu pamięci podręcznej.")
+    records_end = _HEADER.size + count * _RECORD.size
+    if records_end + strings_size != len(data):
+        raise ValueError("Rozmiary sekcji wpisu nie zgadzają się z długością pliku.")
+    with memoryview(data) as view, view[_HEADER.size:] as body:
+        if zlib.crc32(body) != checksum:
+            raise ValueError("Suma kontrolna wpisu się nie zgadza.")
+    strings = data[records_end:].decode("utf-8").split(_STRING_SEPARATOR)
+
+    fromtimestamp = datetime.fromtimestamp
+
+    def restore(value: float, floating: int) -> datetime:
+        moment = fromtimestamp(value, UTC)
+        return moment.replace(tzinfo=None) if floating else moment
+
+    with memoryview(data) as view, view[_HEADER.size:records_end] as records:
+        return [
+            IcsRecord(
+                uid=strings[uid_index],
+                title=strings[title_index],
+                start=restore(start_ts, flags & _START_FLOATING),
+                end=restore(end_ts, flags & _END_FLOATING),
+                description=strings[description_index],
+                alarms=tuple(int(item) for item in strings[alarms_index].split(",")) if alarms_index else (),
+            )
+            for start_ts, end_ts, uid_index, title_index, description_index, alarms_index, flags
+            in _RECORD.iter_unpack(records)
+        ]
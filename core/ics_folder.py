@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from core.calendar import IcsRecord, parse_ics_data
+from core.ics_cache import IcsCache, content_digest
+
+
+@dataclass
+class FileSignature:
+    """Ślad pliku .ics: szybkie porównanie po mtime/rozmiarze, pewne po skrócie treści."""
+
+    mtime_ns: int
+    size: int
+    digest: str = ""
+
+
+@dataclass
+class FolderChange:
+    """Wynik przygotowany w wątku roboczym dla jednego pliku z folderu."""
+
+    path: str
+    signature: FileSignature
+    # ``None`` oznacza, że zmienił się tylko mtime, a treść jest ta sama.
+    records: Optional[List[IcsRecord]] = None
+    error: str = ""
+
+
+class IcsFolderState:
+    """Pamięta, które pliki folderu zostały już zaimportowane i w jakiej wersji.
+
+    ``scan`` porównuje tylko metadane (bez czytania plików), a ``prepare``
+    czyta i parsuje wyłącznie pliki o zmienionej treści. Obie metody nie
+    dotykają magazynu kalendarza, więc ``prepare`` może działać w tle.
+    Z ``cache`` pliki znane z poprzednich uruchomień nie są parsowane ponownie.
+    """
+
+    def __init__(self, directory: str | Path, cache: Optional[IcsCache] = None) -> None:
+        self.directory = Path(directory)
+        self._cache = cache
+        self._files: Dict[str, FileSignature] = {}
+
+    def files(self) -> List[str]:
+        return list(self._files)
+
+    def scan(self) -> Tuple[List[str], List[str]]:
+        """Zwraca (pliki nowe lub zmienione według mtime/rozmiaru, pliki usunięte)."""
+        present: Dict[str, Tuple[int, int]] = {}
+        try:
+            with os.scandir(self.directory) as entries:
+                for entry in entries:
+                    if not entry.name.lower().endswith(".ics") or not entry.is_file():
+                        continue
+                    stat = entry.stat()
+                    present[os.path.abspath(entry.path)] = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            present = {}
+
+        changed = [
+            path for path, (mtime_ns, size) in present.items()
+            if (known := self._files.get(path)) is None or (known.mtime_ns, known.size) != (mtime_ns, size)
+        ]
+        removed = [path for path in self._files if path not in present]
+        return sorted(changed), removed
+
+    def prepare(
+        self, paths: List[str], should_stop: Optional[Callable[[], bool]] = None
+    ) -> List[FolderChange]:
+        """Czyta wskazane pliki; parsuje tylko te, których skrót treści się zmienił."""
+        known = dict(self._files)
+        changes: List[FolderChange] = []
+        for path in paths:
+            if should_stop is not None and should_stop():
+                break
+            try:
+                stat = os.stat(path)
+                with open(path, "rb") as handle:
+                    data = handle.read()
+            except OSError as exc:
+                changes.append(FolderChange(path, FileSignature(0, -1), error=str(exc)))
+                continue
+
+            signature = FileSignature(stat.st_mtime_ns, stat.st_size, content_digest(data))
+            previous = known.get(path)
+            if previous is not None and previous.digest == signature.digest:
+                changes.append(FolderChange(path, signature))
+                continue
+            try:
+                if self._cache is not None:
+                    records = self._cache.parse(data, signature.digest)
+                else:
+                    records = parse_ics_data(data)
+            except Exception as exc:  # noqa: BLE001
+                changes.append(FolderChange(path, signature, error=str(exc)))
+                continue
+            changes.append(FolderChange(path, signature, records))
+        return changes
+
+    def mark(self, path: str, signature: FileSignature) -> None:
+        self._files[path] = signature
+
+    def forget(self, path: str) -> None:
+        self._files.pop(path, None)
@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+import hashlib
+import html
+import re
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+# Długie akapity (np. transkrypcje bez pustych linii) dzielimy na kawałki,
+# żeby pojedynczy blok dało się wyrenderować bez zauważalnej przerwy.
+MAX_BLOCK_LINES = 48
+
+_FENCE_RE = re.compile(r"^\s*(```|~~~)")
+_HEADING_RE = re.compile(r"^(#{1,6})\s+(.*)$")
+_BULLET_RE = re.compile(r"^\s*[-*+]\s+(.*)$")
+_ORDERED_RE = re.compile(r"^\s*\d+[.)]\s+(.*)$")
+_RULE_RE = re.compile(r"^\s*([-*_])(\s*\1){2,}\s*$")
+_CODE_SPAN_RE = re.compile(r"`([^`]+)`")
+_BOLD_RE = re.compile(r"\*\*(.+?)\*\*|__(.+?)__")
+_ITALIC_RE = re.compile(r"(?<!\*)\*(?!\*)(.+?)(?<!\*)\*(?!\*)|(?<!\w)_(?!_)(.+?)(?<!_)_(?!\w)")
+_IMAGE_RE = re.compile(r"!\[([^\]]*)\]\(([^)\s]+)\)")
+_LINK_RE = re.compile(r"(?<!!)\[([^\]]+)\]\(([^)\s]+)\)")
+
+
+@dataclass
+class MarkdownBlock:
+    """Jeden blok Markdown (akapit, nagłówek, lista, blok kodu) i jego położenie w tekście."""
+
+    start: int
+    text: str
+    digest: str
+
+    @property
+    def end(self) -> int:
+        return self.start + len(self.text)
+
+
+class BlockDocument:
+    """Podział notatki na bloki, aktualizowany tylko w okolicy zmian.
+
+    Zmiany z edytora zgłaszamy przez ``note_change`` (pozycja, usunięte, dodane
+    znaki – jak w ``QTextDocument.contentsChange``); ``flush`` dzieli ponownie
+    wyłącznie zmieniony fragment i przesuwa położenie pozostałych bloków.
+    """
+
+    def __init__(self, text: str = "") -> None:
+        self.blocks: List[MarkdownBlock] = []
+        self._length = 0
+        self._pending: Optional[Tuple[int, int, int]] = None
+        self.set_text(text)
+
+    def set_text(self, text: str) -> None:
+        self.blocks = split_blocks(text)
+        self._length = len(text)
+        self._pending = None
+
+    def note_change(self, position: int, removed: int, added: int) -> None:
+        if self._pending is None:
+            self._pending = (position, removed, added)
+            return
+        # Łączymy kolejne zmiany w jeden zakres: (początek, długość przed, długość po).
+        start, old_len, new_len = self._pending
+        lo = min(start, position)
+        hi = max(start + new_len, position + removed)
+        merged_old = (hi - lo) - new_len + old_len
+        self._pending = (lo, merged_old, (hi - lo) - removed + added)
+
+    @property
+    def has_pending_changes(self) -> bool:
+        return self._pending is not None
+
+    def flush(self, text: str) -> Tuple[int, int, int]:
+        """Uwzględnia zebrane zmiany; zwraca (pierwszy blok, ile usunięto, ile wstawiono)."""
+        pending, self._pending = self._pending, None
+        if pending is None:
+            return (0, 0, 0)
+
+        position, removed, added = pending
+        delta = added - removed
+        if len(text) != self._length + delta or not self.blocks:
+            # Niespójne pozycje (np. znaki spoza BMP liczone przez Qt jako dwa) –
+            # bezpieczniej podzielić całość od nowa.
+            old_count = len(self.blocks)
+            self.set_text(text)
+            return (0, old_count, len(self.blocks))
+
+        starts = [block.start for block in self.blocks]
+        first = max(bisect_right(starts, position) - 2, 0)
+        last = min(bisect_right(starts, position + removed), len(self.blocks) - 1)
+        region_start = self.blocks[first].start if first > 0 else 0
+        old_region_end = self.blocks[last + 1].start if last + 1 < len(self.blocks) else self._length
+        new_region_end = old_region_end + delta
+
+        if _has_open_fence(text[region_start:new_region_end]):
+            # Otwarty blok kodu pochłania resztę dokumentu.
+            last = len(self.blocks) - 1
+            new_region_end = len(text)
+
+        fresh = split_blocks(text[region_start:new_region_end], base=region_start)
+        for block in self.blocks[last + 1:]:
+            block.start += delta
+        self.blocks[first:last + 1] = fresh
+        self._length = len(text)
+        return (first, last + 1 - first, len(fresh))
+
+
+# --- podział na bloki ----------------------------------------------------
+
+def split_blocks(text: str, base: int = 0) -> List[MarkdownBlock]:
+    blocks: List[MarkdownBlock] = []
+    block_start: Optional[int] = None
+    block_lines = 0
+    in_fence = False
+    offset = 0
+
+    for line in text.splitlines(keepends=True):
+        stripped = line.strip()
+        if _FENCE_RE.match(line):
+            if block_start is None:
+                block_start = offset
+                block_lines = 0
+            in_fence = not in_fence
+        elif not stripped and not in_fence:
+            if block_start is not None:
+                blocks.append(_make_block(text, block_start, offset, base))
+                block_start = None
+        elif block_start is None:
+            block_start = offset
+            block_lines = 0
+        elif not in_fence and block_lines >= MAX_BLOCK_LINES:
+            blocks.append(_make_block(text, block_start, offset, base))
+            block_start = offset
+            block_lines = 0
+        block_lines += 1
+        offset += len(line)
+
+    if block_start is not None:
+        blocks.append(_make_block(text, block_start, offset, base))
+    return blocks
+
+
+def _make_block(text: str, start: int, end: int, base: int) -> MarkdownBlock:
+    chunk = text[start:end].rstrip("\r\n")
+    digest = hashlib.blake2b(chunk.encode("utf-8"), digest_size=12).hexdigest()
+    return MarkdownBlock(start=base + start, text=chunk, digest=digest)
+
+
+def _has_open_fence(text: str) -> bool:
+    open_fence = False
+    for line in text.splitlines():
+        if _FENCE_RE.match(line):
+            open_fence = not open_fence
+    return open_fence
+
+
+# --- renderowanie ----------------------------------------------------------
+
+def render_html(text: str) -> str:
+    """Renderuje cały (krótki) tekst Markdown, np. treść fiszki."""
+    return "".join(render_block_html(block.text) for block in split_blocks(text))
+
+
+def image_sources(text: str) -> List[str]:
+    return [match.group(2) for match in _IMAGE_RE.finditer(text)]
+
+
+def render_block_html(text: str) -> str:
+    """Zamienia pojedynczy blok Markdown na prosty HTML obsługiwany przez QTextDocument."""
+    lines = text.splitlines()
+    if not lines:
+        return ""
+
+    if _FENCE_RE.match(lines[0]):
+        body = lines[1:]
+        if body and _FENCE_RE.match(body[-1]):
+            body = body[:-1]
+        return f"<pre>{html.escape(chr(10).join(body))}</pre>"
+
+    if len(lines) == 1:
+        heading = _HEADING_RE.match(lines[0])
+        if heading:
+            level = len(heading.group(1))
+            return f"<h{level}>{_inline(heading.group(2))}</h{level}>"
+        if _RULE_RE.match(lines[0]):
+            return "<hr/>"
+
+    if all(line.lstrip().startswith(">") for line in lines):
+        quoted = " ".join(line.lstrip()[1:].strip() for line in lines)
+        return f"<blockquote>{_inline(quoted)}</blockquote>"
+
+    if all(_BULLET_RE.match(line) or line.startswith((" ", "\t")) for line in lines) and _BULLET_RE.match(lines[0]):
+        return _render_list(lines, _BULLET_RE, "ul")
+    if all(_ORDERED_RE.match(line) or line.startswith((" ", "\t")) for line in lines) and _ORDERED_RE.match(lines[0]):
+        return _render_list(lines, _ORDERED_RE, "ol")
+
+    return f"<p>{'<br/>'.join(_inline(line) for line in lines)}</p>"
+
+
+def _render_list(lines: List[str], pattern: re.Pattern, tag: str) -> str:
+    items: List[str] = []
+    for line in lines:
+        match = pattern.match(line)
+        if match:
+            items.append(match.group(1))
+        elif items:
+            items[-1] += " " + line.strip()
+    inner = "".join(f"<li>{_inline(item)}</li>" for item in items)
+    return f"<{tag}>{inner}</{tag}>"
+
+
+def _inline(text: str) -> str:
+    parts = _CODE_SPAN_RE.split(text)
+    rendered: List[str] = []
+    for index, part in enumerate(parts):
+        if index % 2:
+            rendered.append(f"<code>{html.escape(part)}</code>")
+            continue
+        chunk = html.escape(part, quote=False)
+        chunk = _IMAGE_RE.sub(lambda m: f'<img src="{html.escape(m.group(2))}" alt="{html.escape(m.group(1))}"/>', chunk)
+        chunk = _LINK_RE.sub(lambda m: f'<a href="{html.escape(m.group(2))}">{m.group(1)}</a>', chunk)
+        chunk = _BOLD_RE.sub(lambda m: f"<b>{m.group(1) or m.group(2)}</b>", chunk)
+        chunk = _ITALIC_RE.sub(lambda m: f"<i>{m.group(1) or m.group(2)}</i>", chunk)
+        rendered.append(chunk)
+    return "".join(rendered)
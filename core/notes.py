@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import mmap
+import os
+import re
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+NOTE_SUFFIXES = (".md", ".markdown")
+# Pliki większe niż próg czytamy przez mmap zamiast przez bufor read().
+MMAP_THRESHOLD = 1 << 20
+# Ile znaków treści notatek trzymamy w pamięci podręcznej naraz.
+BODY_CACHE_CHARS = 8 << 20
+
+_UNSAFE_NAME = re.compile(r"[^\w\- ąćęłńóśźżĄĆĘŁŃÓŚŹŻ]+")
+
+
+@dataclass
+class NoteMeta:
+    """Metadane notatki trzymane w indeksie; treść ładujemy dopiero na żądanie."""
+
+    id: str
+    title: str
+    path: Path
+    size: int
+    mtime: float
+
+
+class NotesStore:
+    """Biblioteka notatek Markdown zapisanych w katalogu na dysku.
+
+    W pamięci trzymamy tylko indeks tytułów i metadanych zbudowany z ``os.scandir``
+    (bez otwierania plików). Treści wczytujemy leniwie i przechowujemy w małej
+    pamięci podręcznej LRU ograniczonej liczbą znaków.
+    """
+
+    def __init__(self, root: str | Path, *, cache_chars: int = BODY_CACHE_CHARS) -> None:
+        self._root = Path(root)
+        self._notes: Dict[str, NoteMeta] = {}
+        self._order: List[str] = []
+        self._bodies: "OrderedDict[str, str]" = OrderedDict()
+        self._cached_chars = 0
+        self._cache_limit = cache_chars
+
+    @property
+    def root(self) -> Path:
+        return self._root
+
+    # --- indeks ---------------------------------------------------------
+    def scan(self) -> int:
+        self._root.mkdir(parents=True, exist_ok=True)
+        notes: Dict[str, NoteMeta] = {}
+        for entry in _walk_notes(self._root):
+            stat = entry.stat()
+            path = Path(entry.path)
+            note_id = path.relative_to(self._root).as_posix()
+            notes[note_id] = NoteMeta(
+                id=note_id,
+                title=path.stem,
+                path=path,
+                size=stat.st_size,
+                mtime=stat.st_mtime,
+            )
+        self._notes = notes
+        self._order = sorted(notes, key=lambda key: notes[key].title.casefold())
+        self._bodies.clear()
+        self._cached_chars = 0
+        return len(notes)
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def note_at(self, row: int) -> NoteMeta:
+        return self._notes[self._order[row]]
+
+    def row_of(self, note_id: str) -> int:
+        try:
+            return self._order.index(note_id)
+        except ValueError:
+            return -1
+
+    def get(self, note_id: str) -> Optional[NoteMeta]:
+        return self._notes.get(note_id)
+
+    def all_notes(self) -> List[NoteMeta]:
+        return [self._notes[key] for key in self._order]
+
+    # --- treść ----------------------------------------------------------
+    def read_body(self, note_id: str) -> str:
+        cached = self._bodies.get(note_id)
+        if cached is not None:
+            self._bodies.move_to_end(note_id)
+            return cached
+
+        meta = self._require(note_id)
+        text = read_text(meta.path)
+        self._remember(note_id, text)
+        return text
+
+    def save_body(self, note_id: str, text: str) -> NoteMeta:
+        meta = self._require(note_id)
+        tmp_path = meta.path.with_suffix(meta.path.suffix + ".tmp")
+        tmp_path.write_text(text, encoding="utf-8")
+        os.replace(tmp_path, meta.path)
+        stat = meta.path.stat()
+        meta.size = stat.st_size
+        meta.mtime = stat.st_mtime
+        self._forget(note_id)
+        self._remember(note_id, text)
+        return meta
+
+    def create_note(self, title: str) -> NoteMeta:
+        base = _UNSAFE_NAME.sub(" ", title).strip() or "Nowa notatka"
+        path = self._root / f"{base}.md"
+        counter = 2
+        while path.exists():
+            path = self._root / f"{base} ({counter}).md"
+            counter += 1
+
+        self._root.mkdir(parents=True, exist_ok=True)
+        path.write_text(f"# {title.strip() or base}\n", encoding="utf-8")
+        stat = path.stat()
+        note_id = path.relative_to(self._root).as_posix()
+        meta = NoteMeta(id=note_id, title=path.stem, path=path, size=stat.st_size, mtime=stat.st_mtime)
+        self._notes[note_id] = meta
+        self._order.append(note_id)
+        self._order.sort(key=lambda key: self._notes[key].title.casefold())
+        return meta
+
+    def remove_note(self, note_id: str) -> None:
+        meta = self._notes.pop(note_id, None)
+        if meta is None:
+            return
+        self._order.remove(note_id)
+        self._forget(note_id)
+        meta.path.unlink(missing_ok=True)
+
+    # --- pomocnicze -----------------------------------------------------
+    def _require(self, note_id: str) -> NoteMeta:
+        meta = self._notes.get(note_id)
+        if meta is None:
+            raise KeyError(f"Brak notatki o ID {note_id}")
+        return meta
+
+    def _remember(self, note_id: str, text: str) -> None:
+        if len(text) > self._cache_limit:
+            return
+        self._bodies[note_id] = text
+        self._cached_chars += len(text)
+        while self._cached_chars > self._cache_limit and self._bodies:
+            _, evicted = self._bodies.popitem(last=False)
+            self._cached_chars -= len(evicted)
+
+    def _forget(self, note_id: str) -> None:
+        text = self._bodies.pop(note_id, None)
+        if text is not None:
+            self._cached_chars -= len(text)
+
+
+# --- funkcje pomocnicze -------------------------------------------------
+
+def read_text(path: Path) -> str:
+    size = path.stat().st_size
+    if size == 0:
+        return ""
+    with path.open("rb") as handle:
+        if size < MMAP_THRESHOLD:
+            return handle.read().decode("utf-8", errors="replace")
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            with memoryview(mapped) as view:
+                return str(view, "utf-8", errors="replace")
+
+
+def _walk_notes(root: Path) -> Iterator[os.DirEntry]:
+    pending = [str(root)]
+    while pending:
+        current = pending.pop()
+        try:
+            entries = os.scandir(current)
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.name.startswith("."):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+                elif entry.name.lower().endswith(NOTE_SUFFIXES):
+                    yield entry
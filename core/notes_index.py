@@ -0,0 +1,294 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+from core.notes import NotesStore, read_text
+
+INDEX_VERSION = 1
+# Po tylu wpisach w dzienniku przy najbliższej synchronizacji zapisujemy pełny obraz indeksu.
+COMPACT_AFTER = 500
+
+_TOKEN_RE = re.compile(r"\w+")
+_BLOCK_SPLIT_RE = re.compile(r"\n[ \t]*\n")
+_QUERY_RE = re.compile(r'"([^"]+)"|(\S+)')
+
+
+@dataclass
+class IndexedNote:
+    """Stan notatki w indeksie: sygnatura pliku i lista hashy jej bloków."""
+
+    mtime: float
+    size: int
+    digest: str
+    blocks: List[str] = field(default_factory=list)
+
+
+class NotesIndex:
+    """Trwały indeks odwrócony z pozycjami słów, aktualizowany blokami.
+
+    Notatkę dzielimy na bloki (akapity rozdzielone pustą linią) adresowane hashem
+    treści. Pozycje słów trzymamy per blok, więc po zapisie notatki tokenizujemy
+    wyłącznie bloki, których jeszcze nie ma w indeksie. Frazy są wyszukiwane
+    w obrębie jednego bloku.
+
+    Na dysku indeks to pełny obraz (``<nazwa>.json``) i dziennik zmian
+    (``<nazwa>.log``) dopisywany przy każdej aktualizacji.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self._path = Path(path)
+        self._journal_path = self._path.with_suffix(".log")
+        self._notes: Dict[str, IndexedNote] = {}
+        # hash bloku -> słowo -> pozycje w bloku
+        self._blocks: Dict[str, Dict[str, List[int]]] = {}
+        # hash bloku -> notatka -> liczba wystąpień bloku w notatce
+        self._block_refs: Dict[str, Counter] = {}
+        # słowo -> hashe bloków, w których występuje
+        self._postings: Dict[str, Set[str]] = {}
+        self._journal_entries = 0
+
+    # --- trwałość -------------------------------------------------------
+    def load(self) -> None:
+        self._notes.clear()
+        self._blocks.clear()
+        self._block_refs.clear()
+        self._postings.clear()
+        self._journal_entries = 0
+
+        try:
+            with self._path.open("r", encoding="utf-8") as handle:
+                payload = json.load(handle)
+        except (OSError, ValueError):
+            payload = None
+        if payload and payload.get("version") == INDEX_VERSION:
+            for block_hash, terms in payload["blocks"].items():
+                self._add_block(block_hash, terms)
+            for note_id, raw in payload["notes"].items():
+                self._attach(note_id, IndexedNote(**raw))
+
+        try:
+            with self._journal_path.open("r", encoding="utf-8") as handle:
+                for line in handle:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        break  # urwany ostatni wpis po awarii
+                    self._replay(entry)
+                    self._journal_entries += 1
+        except OSError:
+            pass
+        self._drop_orphan_blocks()
+
+    def save(self) -> None:
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "version": INDEX_VERSION,
+            "blocks": self._blocks,
+            "notes": {note_id: note.__dict__ for note_id, note in self._notes.items()},
+        }
+        tmp_path = self._path.with_suffix(".tmp")
+        with tmp_path.open("w", encoding="utf-8") as handle:
+            json.dump(payload, handle, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, self._path)
+        self._journal_path.unlink(missing_ok=True)
+        self._journal_entries = 0
+
+    def sync(self, store: NotesStore) -> int:
+        """Dopasowuje indeks do biblioteki; czyta tylko pliki ze zmienioną sygnaturą."""
+        changed = 0
+        seen: Set[str] = set()
+        for meta in store.all_notes():
+            seen.add(meta.id)
+            indexed = self._notes.get(meta.id)
+            if indexed is not None and indexed.mtime == meta.mtime and indexed.size == meta.size:
+                continue
+            try:
+                text = read_text(meta.path)
+            except OSError:
+                continue
+            digest = _digest(text)
+            if indexed is not None and indexed.digest == digest:
+                indexed.mtime = meta.mtime
+                indexed.size = meta.size
+                self._journal({"op": "touch", "id": meta.id, "mtime": meta.mtime, "size": meta.size})
+                continue
+            self.update_note(meta.id, text, mtime=meta.mtime, size=meta.size)
+            changed += 1
+
+        for note_id in [key for key in self._notes if key not in seen]:
+            self.remove_note(note_id)
+            changed += 1
+
+        if self._journal_entries >= COMPACT_AFTER:
+            self.save()
+        return changed
+
+    # --- aktualizacje ---------------------------------------------------
+    def update_note(self, note_id: str, text: str, *, mtime: float = 0.0, size: int = 0) -> None:
+        blocks = _split_blocks(text)
+        hashes = [_digest(block) for block in blocks]
+        new_blocks: Dict[str, Dict[str, List[int]]] = {}
+        for block_hash, block in zip(hashes, blocks):
+            if block_hash not in self._blocks and block_hash not in new_blocks:
+                new_blocks[block_hash] = _positions(block)
+
+        note = IndexedNote(mtime=mtime, size=size or len(text.encode("utf-8")), digest=_digest(text), blocks=hashes)
+        self._apply_update(note_id, note, new_blocks)
+        self._journal(
+            {"op": "update", "id": note_id, "note": note.__dict__, "new_blocks": new_blocks}
+        )
+
+    def remove_note(self, note_id: str) -> None:
+        if note_id not in self._notes:
+            return
+        self._drop_blocks(self._detach(note_id))
+        self._journal({"op": "remove", "id": note_id})
+
+    # --- wyszukiwanie ---------------------------------------------------
+    def search(self, query: str) -> List[str]:
+        """Zwraca ID notatek pasujących do wszystkich słów i fraz w cudzysłowie."""
+        clauses: List[List[str]] = []
+        for phrase, word in _QUERY_RE.findall(query):
+            terms = tokenize(phrase or word)
+            if terms:
+                clauses.append(terms)
+        if not clauses:
+            return []
+
+        note_hits: Optional[Counter] = None
+        for terms in clauses:
+            hits: Counter = Counter()
+            for block_hash in self._matching_blocks(terms):
+                for note_id in self._block_refs.get(block_hash, ()):
+                    hits[note_id] += 1
+            if note_hits is None:
+                note_hits = hits
+            else:
+                note_hits = Counter({key: note_hits[key] + hits[key] for key in note_hits if key in hits})
+            if not note_hits:
+                return []
+        assert note_hits is not None
+        return [note_id for note_id, _ in note_hits.most_common()]
+
+    def __contains__(self, note_id: object) -> bool:
+        return note_id in self._notes
+
+    def _matching_blocks(self, terms: List[str]) -> Iterable[str]:
+        candidate_sets = [self._postings.get(term) for term in terms]
+        if not all(candidate_sets):
+            return []
+        candidates = set.intersection(*sorted(candidate_sets, key=len))  # type: ignore[arg-type]
+        if len(terms) == 1:
+            return candidates
+        return [block_hash for block_hash in candidates if _has_phrase(self._blocks[block_hash], terms)]
+
+    # --- pomocnicze -----------------------------------------------------
+    def _apply_update(
+        self,
+        note_id: str,
+        note: IndexedNote,
+        new_blocks: Dict[str, Dict[str, List[int]]],
+    ) -> None:
+        for block_hash, terms in new_blocks.items():
+            if block_hash not in self._blocks:
+                self._add_block(block_hash, terms)
+        released = self._detach(note_id)
+        self._attach(note_id, note)
+        self._drop_blocks(released)
+
+    def _replay(self, entry: Dict[str, object]) -> None:
+        op = entry.get("op")
+        note_id = str(entry.get("id"))
+        if op == "update":
+            self._apply_update(note_id, IndexedNote(**entry["note"]), entry["new_blocks"])  # type: ignore[arg-type]
+        elif op == "remove":
+            self._drop_blocks(self._detach(note_id))
+        elif op == "touch" and note_id in self._notes:
+            self._notes[note_id].mtime = float(entry["mtime"])  # type: ignore[arg-type]
+            self._notes[note_id].size = int(entry["size"])  # type: ignore[arg-type]
+
+    def _add_block(self, block_hash: str, terms: Dict[str, List[int]]) -> None:
+        self._blocks[block_hash] = terms
+        for term in terms:
+            self._postings.setdefault(term, set()).add(block_hash)
+
+    def _attach(self, note_id: str, note: IndexedNote) -> None:
+        self._notes[note_id] = note
+        for block_hash in note.blocks:
+            self._block_refs.setdefault(block_hash, Counter())[note_id] += 1
+
+    def _detach(self, note_id: str) -> Set[str]:
+        """Odpina notatkę od jej bloków; zwraca hashe bloków, które mogły osierocieć."""
+        note = self._notes.pop(note_id, None)
+        if note is None:
+            return set()
+        released: Set[str] = set()
+        for block_hash in note.blocks:
+            refs = self._block_refs.get(block_hash)
+            if refs is None:
+                continue
+            refs[note_id] -= 1
+            if refs[note_id] <= 0:
+                del refs[note_id]
+                released.add(block_hash)
+        return released
+
+    def _drop_orphan_blocks(self) -> None:
+        self._drop_blocks([block_hash for block_hash in self._blocks if not self._block_refs.get(block_hash)])
+
+    def _drop_blocks(self, candidates: Iterable[str]) -> None:
+        for block_hash in candidates:
+            if self._block_refs.get(block_hash) or block_hash not in self._blocks:
+                continue
+            for term in self._blocks.pop(block_hash):
+                postings = self._postings.get(term)
+                if postings is not None:
+                    postings.discard(block_hash)
+                    if not postings:
+                        del self._postings[term]
+            self._block_refs.pop(block_hash, None)
+
+    def _journal(self, entry: Dict[str, object]) -> None:
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        with self._journal_path.open("a", encoding="utf-8") as handle:
+            handle.write(json.dumps(entry, ensure_ascii=False, separators=(",", ":")))
+            handle.write("\n")
+        self._journal_entries += 1
+
+
+# --- funkcje pomocnicze -------------------------------------------------
+
+def tokenize(text: str) -> List[str]:
+    return [match.group().casefold() for match in _TOKEN_RE.finditer(text)]
+
+
+def _positions(block: str) -> Dict[str, List[int]]:
+    positions: Dict[str, List[int]] = {}
+    for position, term in enumerate(tokenize(block)):
+        positions.setdefault(term, []).append(position)
+    return positions
+
+
+def _has_phrase(positions: Dict[str, List[int]], terms: List[str]) -> bool:
+    starts = set(positions.get(terms[0], ()))
+    for offset, term in enumerate(terms[1:], start=1):
+        starts &= {position - offset for position in positions.get(term, ())}
+        if not starts:
+            return False
+    return bool(starts)
+
+
+def _split_blocks(text: str) -> List[str]:
+    return [block for block in _BLOCK_SPLIT_RE.split(text) if block.strip()]
+
+
+def _digest(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=12).hexdigest()
+
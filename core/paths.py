@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+# Katalog danych aplikacji można nadpisać zmienną środowiskową (np. w testach
+# lub przy pracy na kilku profilach).
+DATA_DIR_ENV = "STUDYHUB_HOME"
+
+
+def data_dir() -> Path:
+    override = os.environ.get(DATA_DIR_ENV)
+    if override:
+        return Path(override).expanduser()
+    return Path.home() / ".studyhub"
+
+
+def notes_dir() -> Path:
+    return data_dir() / "notes"
+
+
+def notes_index_path() -> Path:
+    return data_dir() / "notes_index.json"
+
+
+def flashcards_dir() -> Path:
+    return data_dir() / "flashcards"
+
+
+def settings_path() -> Path:
+    return data_dir() / "settings.json"
+
+
+def calendar_path() -> Path:
+    return data_dir() / "calendar.snap"
+
+
+def legacy_calendar_path() -> Path:
+    # Zapis JSON sprzed binarnego formatu zrzutu; wczytywany jednorazowo przy migracji.
+    return data_dir() / "calendar.json"
+
+
+def planner_path() -> Path:
+    return data_dir() / "planner.json"
+
+
+def query_socket_path() -> Path:
+    return data_dir() / "studyhub.sock"
+
+
+def ics_cache_dir() -> Path:
+    return data_dir() / "cache" / "ics"
@@ -0,0 +1,365 @@
+from __future__ import annotations
+
+import heapq
+import json
+import os
+from dataclasses import dataclass, field
+from datetime import datetime, time, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from uuid import uuid4
+
+from core.calendar import CalendarStore, Event
+from core.free_time import FreeTimeQuery, find_free_slots
+
+PLANNER_CALENDAR_NAME = "Plan nauki"
+SESSION_PREFIX = "Nauka: "
+# UID sesji: prefiks, ID zadania i losowa część – po ponownym uruchomieniu
+# sesje wczytane z zapisu kalendarza wracają do swoich zadań.
+SESSION_UID_PREFIX = "studyhub-plan:"
+PLANNER_FORMAT_VERSION = 1
+# Sesje zaczynają się o pełnych kwadransach.
+SLOT_ALIGNMENT = timedelta(minutes=15)
+
+
+@dataclass
+class StudyTask:
+    """Zadanie do rozplanowania: ile godzin nauki, do kiedy i w jak długich blokach."""
+
+    subject: str
+    total: timedelta
+    deadline: datetime
+    max_session: timedelta = timedelta(hours=2)
+    id: str = field(default_factory=lambda: str(uuid4()))
+
+    def __post_init__(self) -> None:
+        if self.total <= timedelta(0):
+            raise ValueError("Czas nauki musi być dodatni.")
+        if self.max_session <= timedelta(0):
+            raise ValueError("Maksymalna długość sesji musi być dodatnia.")
+
+
+@dataclass
+class PlanResult:
+    created: int = 0
+    removed: int = 0
+    # ID zadania -> czas, którego nie udało się zmieścić przed terminem.
+    shortfall: Dict[str, timedelta] = field(default_factory=dict)
+
+
+class StudyPlanner:
+    """Rozkłada sesje nauki w wolnym czasie przed terminami zadań.
+
+    Planowanie to EDF (najpierw najbliższy termin): wolne okna są przeglądane
+    chronologicznie, a w każdym kolejne sesje dostaje zadanie z najwcześniejszym
+    terminem, któremu zostały godziny. Sesje są zwykłymi wydarzeniami w osobnym
+    kalendarzu, więc zajmują czas tak jak zajęcia.
+
+    Po zmianach w kalendarzu ``replan`` rusza tylko sesje, na które nałożyło się
+    nowe lub przesunięte wydarzenie; ich czas wraca do puli zadania i jest
+    rozkładany w najbliższe wolne okna. Pozostałe sesje zostają bez zmian.
+
+    Z podaną ścieżką ``path`` zadania są zapisywane w pliku JSON. Przy tworzeniu
+    planera przyszłe sesje w jego kalendarzu, których zadanie nie istnieje
+    (np. zapisane przez starszą wersję), są traktowane jak unieważnione
+    i usuwane przy najbliższym planowaniu.
+    """
+
+    def __init__(
+        self,
+        store: CalendarStore,
+        calendar_id: Optional[str] = None,
+        query: Optional[FreeTimeQuery] = None,
+        *,
+        min_session: timedelta = timedelta(minutes=30),
+        break_length: timedelta = timedelta(minutes=15),
+        path: Optional[Path] = None,
+    ) -> None:
+        self._store = store
+        self._path = path
+        if calendar_id is None:
+            calendar_id = next(
+                (info.id for info in store.calendars() if info.name == PLANNER_CALENDAR_NAME),
+                None,
+            ) or store.create_calendar(PLANNER_CALENDAR_NAME, "Fioletowy").id
+        elif store.get_calendar(calendar_id) is None:
+            raise KeyError(f"Brak kalendarza o ID {calendar_id}")
+        self.calendar_id = calendar_id
+        self.query = query or FreeTimeQuery(day_start=time(8, 0), day_end=time(21, 0))
+        self.min_session = min_session
+        self.break_length = break_length
+        self._tasks: Dict[str, StudyTask] = {}
+        # ID wydarzenia sesji -> ID zadania
+        self._sessions: Dict[str, str] = {}
+        self._task_sessions: Dict[str, Set[str]] = {}
+        self._invalid: Set[str] = set()
+        self._dirty: Set[str] = set()
+        self._applying = False
+        self._load_tasks()
+        self._restore_sessions()
+        store.add_change_listener(self._on_store_change)
+
+    def close(self) -> None:
+        self._store.remove_change_listener(self._on_store_change)
+
+    # --- zadania --------------------------------------------------------
+    def tasks(self) -> List[StudyTask]:
+        return sorted(self._tasks.values(), key=lambda task: task.deadline)
+
+    def add_task(self, task: StudyTask) -> StudyTask:
+        self._tasks[task.id] = task
+        self._task_sessions.setdefault(task.id, set())
+        self._dirty.add(task.id)
+        self._save_tasks()
+        return task
+
+    def remove_task(self, task_id: str) -> None:
+        task = self._tasks.pop(task_id, None)
+        if task is None:
+            raise KeyError(f"Brak zadania o ID {task_id}")
+        self._dirty.discard(task_id)
+        self._save_tasks()
+        sessions = self._task_sessions.pop(task_id, set())
+        self._apply(remove=sessions, add=[], label=f"Usunięcie planu: {task.subject}")
+
+    def sessions(self, task_id: str) -> List[Event]:
+        events = [self._store.get_event(event_id) for event_id in self._task_sessions.get(task_id, ())]
+        return sorted((event for event in events if event is not None), key=lambda event: event.start_ts)
+
+    def scheduled(self, task_id: str) -> timedelta:
+        return sum((event.end - event.start for event in self.sessions(task_id)), timedelta(0))
+
+    @property
+    def has_pending(self) -> bool:
+        return bool(self._invalid or self._dirty)
+
+    @property
+    def has_invalid_sessions(self) -> bool:
+        """Czy jakieś sesje nachodzą na nowe wydarzenia (bez zmian wprowadzonych w samym planie)."""
+        return bool(self._invalid)
+
+    # --- planowanie -----------------------------------------------------
+    def plan(self, now: Optional[datetime] = None) -> PlanResult:
+        """Układa plan od nowa: usuwa przyszłe sesje i rozkłada wszystkie zadania."""
+        now = self._now(now)
+        future = {
+            event_id for event_id in self._sessions
+            if (event := self._store.get_event(event_id)) is not None and event.start >= now
+        }
+        self._invalid.clear()
+        self._dirty = set(self._tasks)
+        return self._replace(future, now)
+
+    def replan(self, now: Optional[datetime] = None) -> PlanResult:
+        """Poprawia plan przyrostowo: tylko unieważnione sesje i zadania ze zmianami."""
+        now = self._now(now)
+        invalid, self._invalid = self._invalid, set()
+        return self._replace(invalid, now)
+
+    def _replace(self, removed: Set[str], now: datetime) -> PlanResult:
+        removed = {event_id for event_id in removed if event_id in self._sessions}
+        for event_id in removed:
+            self._dirty.add(self._sessions[event_id])
+
+        placements, shortfall = self._place(self._dirty, removed, now)
+        self._dirty.clear()
+        created = self._apply(removed, placements, "Plan nauki")
+        return PlanResult(created=created, removed=len(removed), shortfall=shortfall)
+
+    def _place(
+        self, task_ids: Iterable[str], removed: Set[str], now: datetime
+    ) -> Tuple[List[Tuple[str, datetime, datetime]], Dict[str, timedelta]]:
+        store = self._store
+        heap: List[Tuple[float, str]] = []
+        remaining: Dict[str, float] = {}
+        for task_id in task_ids:
+            task = self._tasks.get(task_id)
+            if task is None:
+                continue
+            done = sum(
+                event.end_ts - event.start_ts
+                for event_id in self._task_sessions.get(task_id, ())
+                if event_id not in removed and (event := store.get_event(event_id)) is not None
+            )
+            left = task.total.total_seconds() - done
+            if left > 0:
+                remaining[task_id] = left
+                heapq.heappush(heap, (store.to_utc(task.deadline).timestamp(), task_id))
+        if not heap:
+            return [], {}
+
+        start = _align(now)
+        horizon = max(store.to_utc(self._tasks[task_id].deadline) for task_id in remaining)
+        tz = store.display_tz
+        slots = find_free_slots(
+            store,
+            start.astimezone(tz).date(),
+            horizon.astimezone(tz).date(),
+            self.query,
+            include_hidden=True,
+            ignore=removed,
+        )
+
+        min_seconds = self.min_session.total_seconds()
+        break_seconds = self.break_length.total_seconds()
+        alignment = SLOT_ALIGNMENT.total_seconds()
+        placements: List[Tuple[str, datetime, datetime]] = []
+        start_ts = start.timestamp()
+        for slot in slots:
+            cursor = max(slot.start.timestamp(), start_ts)
+            cursor = -(-cursor // alignment) * alignment
+            slot_end = slot.end.timestamp()
+            while heap and cursor < slot_end:
+                deadline_ts, task_id = heap[0]
+                if deadline_ts - cursor < min(min_seconds, remaining[task_id]):
+                    # Termin minął, zanim zadanie się zmieściło – reszta zostaje jako niedobór.
+                    heapq.heappop(heap)
+                    continue
+                task = self._tasks[task_id]
+                length = min(
+                    remaining[task_id],
+                    task.max_session.total_seconds(),
+                    slot_end - cursor,
+                    deadline_ts - cursor,
+                )
+                if length < min(min_seconds, remaining[task_id]):
+                    break
+                placements.append((task_id, _from_ts(cursor, tz), _from_ts(cursor + length, tz)))
+                remaining[task_id] -= length
+                if remaining[task_id] <= 0:
+                    heapq.heappop(heap)
+                cursor += length + break_seconds
+                cursor = -(-cursor // alignment) * alignment
+            if not heap:
+                break
+
+        shortfall = {
+            task_id: timedelta(seconds=left) for task_id, left in remaining.items() if left > 0
+        }
+        return placements, shortfall
+
+    def _apply(self, remove: Set[str], add: List[Tuple[str, datetime, datetime]], label: str) -> int:
+        store = self._store
+        color = store.get_calendar(self.calendar_id).color_key
+        self._applying = True
+        try:
+            with store.batch(label):
+                for event_id in remove:
+                    task_id = self._sessions.pop(event_id, None)
+                    if task_id is not None:
+                        self._task_sessions.get(task_id, set()).discard(event_id)
+                    store.remove_event(event_id)
+                for task_id, start, end in add:
+                    task = self._tasks[task_id]
+                    event_id = store.add_event(
+                        SESSION_PREFIX + task.subject,
+                        start,
+                        end,
+                        color,
+                        f"Termin: {task.deadline.strftime('%d.%m.%Y %H:%M')}",
+                        self.calendar_id,
+                        uid=f"{SESSION_UID_PREFIX}{task_id}:{uuid4()}",
+                    )
+                    self._sessions[event_id] = task_id
+                    self._task_sessions.setdefault(task_id, set()).add(event_id)
+        finally:
+            self._applying = False
+        return len(add)
+
+    def _on_store_change(self, kind: str, events: List[Event], before: Dict[str, object]) -> None:
+        if self._applying:
+            return
+        store = self._store
+        for event in events:
+            task_id = self._sessions.get(event.id)
+            if task_id is not None:
+                # Użytkownik sam przesunął lub usunął sesję – liczymy godziny zadania od nowa.
+                self._dirty.add(task_id)
+                continue
+            if kind == "remove":
+                # Zwolniony czas nie psuje istniejącego planu.
+                continue
+            # Nowe lub przesunięte wydarzenie unieważnia tylko sesje, na które zachodzi:
+            # zapytanie zakresowe po indeksie, bez przeglądania wszystkich sesji.
+            for other in store.events_between(event.start, event.end, include_hidden=True):
+                if (
+                    other.id in self._sessions
+                    and other.start_ts < event.end_ts
+                    and other.end_ts > event.start_ts
+                ):
+                    self._invalid.add(other.id)
+
+    def _now(self, now: Optional[datetime]) -> datetime:
+        return self._store.to_utc(now if now is not None else self._store.now())
+
+    # --- zapis ----------------------------------------------------------
+    def _restore_sessions(self) -> None:
+        now = self._now(None)
+        for event in self._store.events_in_calendar(self.calendar_id):
+            task_id = _session_task_id(event.uid)
+            if task_id in self._tasks:
+                self._sessions[event.id] = task_id
+                self._task_sessions[task_id].add(event.id)
+            elif event.start >= now:
+                # Sesja bez zadania zajmowałaby czas na zawsze; usuwa ją najbliższy ``replan``.
+                self._sessions[event.id] = ""
+                self._invalid.add(event.id)
+
+    def _load_tasks(self) -> None:
+        if self._path is None:
+            return
+        try:
+            with self._path.open("r", encoding="utf-8") as handle:
+                data = json.load(handle)
+            if data.get("version") != PLANNER_FORMAT_VERSION:
+                return
+            for entry in data["tasks"]:
+                task = StudyTask(
+                    subject=entry["subject"],
+                    total=timedelta(minutes=entry["total_minutes"]),
+                    deadline=datetime.fromisoformat(entry["deadline"]),
+                    max_session=timedelta(minutes=entry["max_session_minutes"]),
+                    id=entry["id"],
+                )
+                self._tasks[task.id] = task
+                self._task_sessions[task.id] = set()
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return
+
+    def _save_tasks(self) -> None:
+        if self._path is None:
+            return
+        data = {
+            "version": PLANNER_FORMAT_VERSION,
+            "tasks": [
+                {
+                    "id": task.id,
+                    "subject": task.subject,
+                    "total_minutes": task.total.total_seconds() / 60,
+                    "deadline": task.deadline.isoformat(),
+                    "max_session_minutes": task.max_session.total_seconds() / 60,
+                }
+                for task in self.tasks()
+            ],
+        }
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._path.with_suffix(".tmp")
+        with tmp_path.open("w", encoding="utf-8") as handle:
+            json.dump(data, handle, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self._path)
+
+
+def _session_task_id(uid: str) -> Optional[str]:
+    if not uid.startswith(SESSION_UID_PREFIX):
+        return None
+    return uid[len(SESSION_UID_PREFIX):].split(":", 1)[0]
+
+
+def _align(value: datetime) -> datetime:
+    seconds = SLOT_ALIGNMENT.total_seconds()
+    aligned = -(-value.timestamp() // seconds) * seconds
+    return datetime.fromtimestamp(aligned, value.tzinfo)
+
+
+def _from_ts(value: float, tz) -> datetime:
+    return datetime.fromtimestamp(value, tz)
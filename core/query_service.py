@@ -0,0 +1,455 @@
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime, time as day_time, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from core.calendar import CalendarStore, Event
+
+# Ile różnych odpowiedzi zapytań trzymamy w pamięci podręcznej.
+CACHE_SIZE = 256
+# Jak daleko w przód szukamy najbliższych wydarzeń dla "next".
+NEXT_HORIZON = timedelta(days=365)
+# Maksymalna długość jednej linii żądania.
+MAX_REQUEST_BYTES = 1 << 20
+LOCAL_HOSTS = ("127.0.0.1", "::1", "localhost")
+# Port TCP używany tam, gdzie nie ma gniazd Unix.
+DEFAULT_PORT = 47631
+
+# Przekazuje funkcję do wątku, który jest właścicielem magazynu, i zwraca jej wynik jako Future.
+OwnerCall = Callable[[Callable[[], object]], "concurrent.futures.Future[object]"]
+
+READ_METHODS = ("ping", "calendars", "today", "day", "week", "between", "next", "search")
+WRITE_METHODS = ("add", "update", "remove")
+
+
+class QueryError(ValueError):
+    """Błąd żądania zwracany klientowi w polu ``error``."""
+
+
+class QueryService:
+    """Zapytania i zmiany ``CalendarStore`` jako JSON – jedna linia na żądanie.
+
+    Żądanie: ``{"id": 1, "method": "between", "params": {...}}``, odpowiedź:
+    ``{"id": 1, "result": ...}`` albo ``{"id": 1, "error": "..."}``. Żądania
+    z jednego połączenia są obsługiwane współbieżnie, więc odpowiedzi mogą
+    przyjść w innej kolejności – dopasowuje się je po ``id``.
+
+    Magazyn nie jest wielowątkowy, dlatego każda operacja na nim trafia przez
+    ``owner_call`` do wątku, który go posiada (w aplikacji – wątku GUI). Wyniki
+    zapytań są zapamiętywane razem z ``store.revision``: powtórzone zapytanie przy
+    niezmienionej rewizji jest obsługiwane w pętli asyncio, bez angażowania
+    wątku właściciela.
+    """
+
+    def __init__(
+        self,
+        store: CalendarStore,
+        owner_call: Optional[OwnerCall] = None,
+        *,
+        cache_size: int = CACHE_SIZE,
+    ) -> None:
+        self._store = store
+        self._owner_call = owner_call
+        self._cache_size = cache_size
+        # klucz zapytania -> (rewizja, ważność do znacznika czasu albo None, zakodowany wynik)
+        self._cache: "OrderedDict[Tuple[str, str], Tuple[int, Optional[float], str]]" = OrderedDict()
+        # Zapytania w toku: identyczne żądania czekają na jeden wynik zamiast liczyć go ponownie.
+        self._inflight: Dict[Tuple[str, str], "asyncio.Future[str]"] = {}
+        self._servers: List[asyncio.AbstractServer] = []
+        self._socket_paths: List[str] = []
+        # zadanie obsługi połączenia -> (strumień zapisu, zadania odpowiedzi w toku)
+        self._clients: Dict["asyncio.Task[None]", Tuple[asyncio.StreamWriter, Set[asyncio.Future]]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    # --- serwer -----------------------------------------------------------
+    async def start_tcp(self, host: str = "127.0.0.1", port: int = 0) -> Tuple[str, int]:
+        if host not in LOCAL_HOSTS:
+            raise ValueError("Usługa nasłuchuje wyłącznie na adresie lokalnym.")
+        server = await asyncio.start_server(self._serve_client, host, port, limit=MAX_REQUEST_BYTES)
+        self._servers.append(server)
+        address = server.sockets[0].getsockname()
+        return address[0], address[1]
+
+    async def start_unix(self, path: str | Path) -> str:
+        path = str(path)
+        if os.path.exists(path):
+            # Pozostałość po poprzednim uruchomieniu.
+            os.unlink(path)
+        server = await asyncio.start_unix_server(self._serve_client, path, limit=MAX_REQUEST_BYTES)
+        os.chmod(path, 0o600)
+        self._servers.append(server)
+        self._socket_paths.append(path)
+        return path
+
+    async def stop(self) -> None:
+        servers, self._servers = self._servers, []
+        for server in servers:
+            server.close()
+        # Zamknięcie połączeń kończy ich pętle zwykłym końcem strumienia, bez anulowania zadań.
+        clients = list(self._clients.items())
+        for _task, (writer, _answers) in clients:
+            writer.close()
+        if clients:
+            tasks = [task for task, _client in clients]
+            # Żądanie czekające na wątek właściciela (zajęty zamykaniem) nie skończy się samo;
+            # anulujemy same odpowiedzi, a obsługa połączenia kończy się zwyczajnie.
+            _done, stuck = await asyncio.wait(tasks, timeout=1.0)
+            for task, (_writer, answers) in clients:
+                if task in stuck:
+                    for answer in list(answers):
+                        answer.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        for server in servers:
+            await server.wait_closed()
+        paths, self._socket_paths = self._socket_paths, []
+        for path in paths:
+            if os.path.exists(path):
+                os.unlink(path)
+
+    async def _serve_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        write_lock = asyncio.Lock()
+        pending: Set[asyncio.Future] = set()
+        last_write: Optional[asyncio.Future] = None
+        current = asyncio.current_task()
+        self._clients[current] = (writer, pending)
+
+        async def answer(line: bytes, after: List[asyncio.Future]) -> None:
+            if after:
+                await asyncio.gather(*after, return_exceptions=True)
+            response = await self.handle_line(line)
+            async with write_lock:
+                writer.write(response.encode("utf-8") + b"\n")
+                await writer.drain()
+
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (asyncio.LimitOverrunError, ValueError):
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                # Zmiana czeka na wcześniejsze żądania, a późniejsze – na nią, żeby klient
+                # zawsze widział skutek własnych zmian; same odczyty idą równolegle.
+                if _is_write(line):
+                    task = asyncio.ensure_future(answer(line, list(pending)))
+                    last_write = task
+                else:
+                    after = [last_write] if last_write is not None and not last_write.done() else []
+                    task = asyncio.ensure_future(answer(line, after))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+        except ConnectionError:
+            pass
+        finally:
+            self._clients.pop(current, None)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    # --- żądania ------------------------------------------------------------
+    async def handle_line(self, line: bytes) -> str:
+        request_id = None
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise QueryError("Żądanie musi być obiektem JSON.")
+            request_id = request.get("id")
+            method = request.get("method")
+            params = request.get("params") or {}
+            if not isinstance(params, dict):
+                raise QueryError("Pole params musi być obiektem.")
+            result = await self.call(method, params)
+        except QueryError as exc:
+            return json.dumps({"id": request_id, "error": str(exc)}, ensure_ascii=False)
+        except (ValueError, KeyError, TypeError) as exc:
+            message = exc.args[0] if isinstance(exc, KeyError) and exc.args else str(exc)
+            return json.dumps({"id": request_id, "error": message}, ensure_ascii=False)
+        return f'{{"id": {json.dumps(request_id)}, "result": {result}}}'
+
+    async def call(self, method: str, params: Dict[str, object]) -> str:
+        """Wykonuje metodę i zwraca wynik zakodowany jako JSON."""
+        if method in WRITE_METHODS:
+            return json.dumps(await self._on_owner(lambda: self._write(method, params)), ensure_ascii=False)
+        if method not in READ_METHODS:
+            raise QueryError(f"Nieznana metoda: {method}")
+
+        key = (method, json.dumps(params, sort_keys=True))
+        revision = self._store.revision
+        cached = self._cache.get(key)
+        if cached is not None and cached[0] != revision:
+            # Magazyn się zmienił (także strefa wyświetlania) – wyniki sprzed zmiany odpadają.
+            self._drop_stale(revision)
+            cached = None
+        if cached is not None and (cached[1] is None or time.time() < cached[1]):
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return cached[2]
+
+        running = self._inflight.get(key)
+        if running is not None:
+            self.hits += 1
+            return await asyncio.shield(running)
+
+        self.misses += 1
+        future: "asyncio.Future[str]" = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            revision, (result, expires) = await self._on_owner(
+                lambda: (self._store.revision, self._read(method, params))
+            )
+            encoded = json.dumps(result, ensure_ascii=False)
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Błąd przekazujemy czekającym; sam Future nie musi być już odczytany.
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+        self._remember(key, revision, expires, encoded)
+        future.set_result(encoded)
+        return encoded
+
+    def _remember(self, key: Tuple[str, str], revision: int, expires: Optional[float], encoded: str) -> None:
+        self._drop_stale(revision)
+        self._cache[key] = (revision, expires, encoded)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+
+    def _drop_stale(self, revision: int) -> None:
+        if self._cache and next(iter(self._cache.values()))[0] != revision:
+            # Stare wpisy i tak nie trafiłyby w rewizję.
+            self._cache = OrderedDict(item for item in self._cache.items() if item[1][0] == revision)
+
+    async def _on_owner(self, fn: Callable[[], object]):
+        if self._owner_call is None:
+            # Pętla asyncio sama jest właścicielem magazynu (np. tryb wiersza poleceń).
+            return fn()
+        return await asyncio.wrap_future(self._owner_call(fn))
+
+    # --- metody (wykonywane w wątku właściciela magazynu) --------------------
+    def _read(self, method: str, params: Dict[str, object]) -> Tuple[object, Optional[float]]:
+        """Zwraca (wynik, do kiedy wynik jest aktualny niezależnie od rewizji)."""
+        store = self._store
+        if method == "ping":
+            return "pong", None
+        if method == "calendars":
+            calendars = [
+                {"id": info.id, "name": info.name, "color_key": info.color_key, "visible": info.visible}
+                for info in store.calendars()
+            ]
+            return calendars, None
+        include_hidden = bool(params.get("include_hidden", False))
+        if method == "today":
+            events = store.events_for_day(store.now().date(), include_hidden=include_hidden)
+            return _events_json(store, events), _next_midnight(store)
+        if method == "day":
+            events = store.events_for_day(_date_param(params, "date"), include_hidden=include_hidden)
+            return _events_json(store, events), None
+        if method == "week":
+            relative = "date" not in params
+            day = store.now().date() if relative else _date_param(params, "date")
+            events = store.events_for_week(day, include_hidden=include_hidden)
+            return _events_json(store, events), _next_midnight(store) if relative else None
+        if method == "between":
+            start = _datetime_param(params, "start")
+            end = _datetime_param(params, "end")
+            return _events_json(store, store.events_between(start, end, include_hidden=include_hidden)), None
+        if method == "next":
+            relative = "after" not in params
+            now = store.now() if relative else store.to_utc(_datetime_param(params, "after"))
+            count = _int_param(params, "count", 1)
+            upcoming = (
+                event for event in store.events_between(now, now + NEXT_HORIZON, include_hidden=include_hidden)
+                if event.start >= now
+            )
+            events = [event for _, event in zip(range(count), upcoming)]
+            expires = None
+            if relative:
+                # Wynik liczony od "teraz" zmienia się, gdy zacznie się pierwsze z wydarzeń.
+                expires = events[0].start_ts if events else time.time() + 3600
+            return _events_json(store, events), expires
+        # search
+        needle = str(params.get("query", "")).casefold()
+        if not needle:
+            raise QueryError("Podaj tekst do wyszukania (query).")
+        limit = _int_param(params, "limit", 50)
+        matches = (
+            event for event in store.all_events(include_hidden=include_hidden)
+            if needle in event.title.casefold() or needle in event.description.casefold()
+        )
+        return _events_json(store, [event for _, event in zip(range(limit), matches)]), None
+
+    def _write(self, method: str, params: Dict[str, object]) -> object:
+        store = self._store
+        if method == "add":
+            return store.add_event(
+                str(params.get("title", "")),
+                _datetime_param(params, "start"),
+                _datetime_param(params, "end"),
+                str(params.get("color_key", "Niebieski")),
+                str(params.get("description", "")),
+                str(params.get("calendar_id", "default")),
+                alarms=_alarms_param(params) or (),
+            )
+        event_id = str(params.get("id", ""))
+        if store.get_event(event_id) is None:
+            raise QueryError(f"Brak wydarzenia o ID {event_id}")
+        if method == "remove":
+            store.remove_event(event_id)
+            return True
+        fields: Dict[str, object] = {}
+        for name in ("title", "color_key", "description", "calendar_id"):
+            if name in params:
+                fields[name] = str(params[name])
+        for name, target in (("start", "start_dt"), ("end", "end_dt")):
+            if name in params:
+                fields[target] = _datetime_param(params, name)
+        if "alarms" in params:
+            fields["alarms"] = _alarms_param(params)
+        store.update_event(event_id, **fields)
+        return True
+
+
+class QueryServiceThread:
+    """Uruchamia ``QueryService`` we własnej pętli asyncio w osobnym wątku.
+
+    Wątek wywołujący (np. GUI) nie jest blokowany; operacje na magazynie wracają
+    do niego przez ``owner_call``.
+    """
+
+    def __init__(self, service: QueryService) -> None:
+        self.service = service
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self.address: object = None
+
+    def start(self, *, host: str = "127.0.0.1", port: int = 0, socket_path: Optional[str | Path] = None) -> object:
+        """Startuje serwer; zwraca (host, port) albo ścieżkę gniazda Unix."""
+        if self._thread is not None:
+            raise RuntimeError("Usługa już działa.")
+        loop = asyncio.new_event_loop()
+        ready: "concurrent.futures.Future[object]" = concurrent.futures.Future()
+
+        async def open_server() -> object:
+            if socket_path is not None:
+                return await self.service.start_unix(socket_path)
+            return await self.service.start_tcp(host, port)
+
+        def run() -> None:
+            asyncio.set_event_loop(loop)
+            try:
+                ready.set_result(loop.run_until_complete(open_server()))
+            except Exception as exc:  # noqa: BLE001
+                ready.set_exception(exc)
+                loop.close()
+                return
+            loop.run_forever()
+            loop.run_until_complete(self.service.stop())
+            loop.close()
+
+        self._loop = loop
+        self._thread = threading.Thread(target=run, name="studyhub-query-service", daemon=True)
+        self._thread.start()
+        try:
+            self.address = ready.result()
+        except Exception:
+            self._thread.join()
+            self._thread = None
+            self._loop = None
+            raise
+        return self.address
+
+    def stop(self) -> None:
+        if self._thread is None or self._loop is None:
+            return
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._thread = None
+        self._loop = None
+        self.address = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+
+def _events_json(store: CalendarStore, events: List[Event]) -> List[Dict[str, object]]:
+    return [
+        {
+            "id": event.id,
+            "title": event.title,
+            "start": event.local_start.isoformat(),
+            "end": event.local_end.isoformat(),
+            "color_key": event.color_key,
+            "description": event.description,
+            "calendar_id": event.calendar_id,
+            "alarms": list(event.alarms),
+            "conflict": store.has_conflict(event),
+        }
+        for event in events
+    ]
+
+
+def _is_write(line: bytes) -> bool:
+    try:
+        request = json.loads(line)
+    except ValueError:
+        return False
+    return isinstance(request, dict) and request.get("method") in WRITE_METHODS
+
+
+def _next_midnight(store: CalendarStore) -> float:
+    tomorrow = store.now().date() + timedelta(days=1)
+    return datetime.combine(tomorrow, day_time.min, store.display_tz).timestamp()
+
+
+def _date_param(params: Dict[str, object], name: str) -> date:
+    try:
+        return date.fromisoformat(str(params[name]))
+    except KeyError:
+        raise QueryError(f"Brak parametru {name}.") from None
+    except ValueError:
+        raise QueryError(f"Niepoprawna data w parametrze {name}.") from None
+
+
+def _datetime_param(params: Dict[str, object], name: str) -> datetime:
+    try:
+        return datetime.fromisoformat(str(params[name]))
+    except KeyError:
+        raise QueryError(f"Brak parametru {name}.") from None
+    except ValueError:
+        raise QueryError(f"Niepoprawny czas w parametrze {name}.") from None
+
+
+def _alarms_param(params: Dict[str, object]) -> Optional[List[int]]:
+    value = params.get("alarms")
+    if value is None:
+        return None
+    if not isinstance(value, list) or not all(isinstance(item, int) for item in value):
+        raise QueryError("Parametr alarms musi być listą liczb minut.")
+    return value
+
+
+def _int_param(params: Dict[str, object], name: str, default: int) -> int:
+    try:
+        value = int(params.get(name, default))
+    except (TypeError, ValueError):
+        raise QueryError(f"Parametr {name} musi być liczbą.") from None
+    return max(value, 0)
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from typing import Optional, Tuple
+
+from core.calendar import COLOR_KEYS, DEFAULT_COLOR_KEY
+
+DEFAULT_DURATION = timedelta(hours=1)
+
+_RELATIVE_DAYS = {"dziś": 0, "dzis": 0, "dzisiaj": 0, "jutro": 1, "pojutrze": 2}
+# Formy w mianowniku i bierniku („w środę”) oraz skróty; wartości jak w ``date.weekday()``.
+_WEEKDAYS = {
+    "poniedziałek": 0, "pon": 0,
+    "wtorek": 1, "wt": 1,
+    "środa": 2, "środę": 2, "śr": 2,
+    "czwartek": 3, "czw": 3,
+    "piątek": 4, "pt": 4,
+    "sobota": 5, "sobotę": 5, "sob": 5,
+    "niedziela": 6, "niedzielę": 6, "nd": 6, "niedz": 6,
+}
+
+_DAY_WORDS = "|".join(sorted((*_RELATIVE_DAYS, *_WEEKDAYS), key=len, reverse=True))
+_DAY_WORD_RE = re.compile(rf"(?<!\w)(?:(?:w|we)\s+)?({_DAY_WORDS})\.?(?!\w)", re.IGNORECASE)
+_DATE_RE = re.compile(r"(?<![\w.:])(\d{1,2})[./](\d{1,2})(?:[./](\d{4}))?(?![\w:])")
+_TIME = r"(\d{1,2})(?::(\d{2}))?"
+_RANGE_RE = re.compile(rf"(?<![\w.:])(?:(?:od|w\s+godz\.?)\s+)?{_TIME}\s*(?:-|–|—|do\s)\s*{_TIME}(?![\w:])", re.IGNORECASE)
+# Sama godzina wymaga minut albo przyimka („o 9”), żeby nie zjadać liczb z tytułu.
+_SINGLE_RE = re.compile(r"(?<![\w.:])(?:(?:o|od|godz\.?)\s+(\d{1,2})(?::(\d{2}))?|(\d{1,2}):(\d{2}))(?![\w:])", re.IGNORECASE)
+_COLOR_RE = re.compile(r"(?<!\w)#(\w+)")
+
+
+@dataclass
+class QuickEvent:
+    """Wynik parsowania wiersza szybkiego dodawania (czas ścienny bez strefy)."""
+
+    title: str
+    start: datetime
+    end: datetime
+    color_key: str = DEFAULT_COLOR_KEY
+
+
+def parse_quick_event(text: str, today: Optional[date] = None) -> QuickEvent:
+    """Zamienia zapis typu „jutro 14:00-15:30 Analiza matematyczna” na wydarzenie.
+
+    Rozpoznawane są: dzień („dziś”, „jutro”, „pojutrze”, nazwa dnia tygodnia –
+    najbliższy taki dzień, licząc od dziś – albo data „dd.mm[.rrrr]”), przedział
+    godzin („14-15:30”, „od 14 do 16”) lub sama godzina („o 9”, „9:30”; wtedy
+    wydarzenie trwa godzinę) i kolor („#zielony”). Reszta tekstu jest tytułem.
+    Bez dnia przyjmowany jest dzisiejszy; godzina jest wymagana.
+    """
+    today = today or date.today()
+    rest = text
+
+    color_key = DEFAULT_COLOR_KEY
+    colors = {name.lower(): name for name in COLOR_KEYS}
+    for match in _COLOR_RE.finditer(rest):
+        if match.group(1).lower() in colors:
+            color_key = colors[match.group(1).lower()]
+            rest = _cut(rest, match)
+            break
+
+    day, rest = _take_day(rest, today)
+
+    match = _RANGE_RE.search(rest)
+    if match is not None:
+        start_time = _make_time(match.group(1), match.group(2))
+        end_time = _make_time(match.group(3), match.group(4), end=True)
+        rest = _cut(rest, match)
+    else:
+        match = _SINGLE_RE.search(rest)
+        if match is None:
+            raise ValueError("Podaj godzinę, np. „14:00” albo „14-15:30”.")
+        if match.group(1) is not None:
+            start_time = _make_time(match.group(1), match.group(2))
+        else:
+            start_time = _make_time(match.group(3), match.group(4))
+        end_time = None
+        rest = _cut(rest, match)
+
+    start = datetime.combine(day, start_time)
+    if end_time is None:
+        end = start + DEFAULT_DURATION
+    else:
+        end = datetime.combine(day, end_time)
+        # „22-1” oznacza wydarzenie kończące się po północy.
+        if end <= start:
+            end += timedelta(days=1)
+
+    title = " ".join(rest.split()).strip(" ,;-–")
+    if not title:
+        raise ValueError("Podaj tytuł wydarzenia.")
+    return QuickEvent(title=title, start=start, end=end, color_key=color_key)
+
+
+def _take_day(text: str, today: date) -> Tuple[date, str]:
+    match = _DATE_RE.search(text)
+    if match is not None:
+        day_number, month, year = int(match.group(1)), int(match.group(2)), match.group(3)
+        try:
+            day = date(int(year) if year else today.year, month, day_number)
+        except ValueError:
+            raise ValueError(f"Niepoprawna data: {match.group(0)}.") from None
+        # Data bez roku, która już minęła, dotyczy przyszłego roku.
+        if year is None and day < today:
+            try:
+                day = day.replace(year=today.year + 1)
+            except ValueError:
+                pass
+        return day, _cut(text, match)
+
+    match = _DAY_WORD_RE.search(text)
+    if match is not None:
+        word = match.group(1).lower()
+        if word in _RELATIVE_DAYS:
+            day = today + timedelta(days=_RELATIVE_DAYS[word])
+        else:
+            day = today + timedelta(days=(_WEEKDAYS[word] - today.weekday()) % 7)
+        return day, _cut(text, match)
+    return today, text
+
+
+def _make_time(hours: str, minutes: Optional[str], end: bool = False) -> time:
+    hour, minute = int(hours), int(minutes or 0)
+    # „24:00” to tylko koniec dnia; jako początek dawałoby północ bieżącego dnia.
+    if end and hour == 24 and minute == 0:
+        return time(0, 0)
+    if hour > 23 or minute > 59:
+        raise ValueError(f"Niepoprawna godzina: {hours}:{minutes or '00'}.")
+    return time(hour, minute)
+
+
+def _cut(text: str, match: re.Match) -> str:
+    return f"{text[:match.start()]} {text[match.end():]}"
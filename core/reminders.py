@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import heapq
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from core.calendar import CalendarStore, Event, normalize_alarms
+
+DEFAULT_OFFSETS: Tuple[int, ...] = (15,)
+# Gotowe ustawienia do wyboru w menu (minuty przed początkiem).
+OFFSET_PRESETS: Tuple[int, ...] = (0, 5, 10, 15, 30, 60, 24 * 60)
+# Przebudowa kopca, gdy nieaktualne wpisy stanowią ponad połowę (i jest ich dość dużo).
+_COMPACT_MIN_STALE = 256
+
+# Wpis kopca: (chwila przypomnienia w sekundach UTC, ID wydarzenia, minuty przed, wersja wpisów).
+_Entry = Tuple[float, str, int, int]
+
+
+@dataclass
+class Reminder:
+    event: Event
+    minutes_before: int
+
+
+def format_offset(minutes: int) -> str:
+    """Opis wyprzedzenia przypomnienia, np. „15 min”, „1 h”, „1 dzień”."""
+    if minutes == 0:
+        return "w chwili rozpoczęcia"
+    if minutes % (24 * 60) == 0:
+        days = minutes // (24 * 60)
+        return "1 dzień" if days == 1 else f"{days} dni"
+    if minutes % 60 == 0:
+        return f"{minutes // 60} h"
+    return f"{minutes} min"
+
+
+class ReminderQueue:
+    """Nadchodzące przypomnienia w kopcu minimalnym, uporządkowane po czasie.
+
+    Kopiec buduje się raz z magazynu, a potem aktualizuje wyłącznie ze zmian
+    zgłaszanych przez ``add_change_listener`` – magazyn nie jest odpytywany.
+    Wpisy edytowanych lub usuniętych wydarzeń nie są wyszukiwane w kopcu:
+    wydarzenie dostaje nowy numer wersji, a wpisy ze starszym numerem są
+    pomijane przy zdejmowaniu (leniwe usuwanie). Wersje pochodzą z jednego
+    licznika, więc nigdy się nie powtarzają. ``on_reschedule`` jest
+    wywoływane po każdej zmianie, żeby właściciel mógł przestawić budzik na
+    ``next_due()``.
+    """
+
+    def __init__(
+        self,
+        store: CalendarStore,
+        offsets: Iterable[int] = DEFAULT_OFFSETS,
+        on_reschedule: Optional[Callable[[], None]] = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._store = store
+        self._offsets = normalize_alarms(offsets)
+        self._on_reschedule = on_reschedule
+        self._clock = clock
+        self._heap: List[_Entry] = []
+        # Aktualna wersja i liczba żywych wpisów tylko dla wydarzeń obecnych w kopcu.
+        self._versions: Dict[str, int] = {}
+        self._live: Dict[str, int] = {}
+        self._stale = 0
+        self._serial = 0
+        self._build()
+        store.add_change_listener(self._on_change)
+
+    @property
+    def offsets(self) -> Tuple[int, ...]:
+        return self._offsets
+
+    def set_offsets(self, offsets: Iterable[int]) -> None:
+        """Zmienia domyślne przypomnienia (dla wydarzeń bez własnych VALARM)."""
+        offsets = normalize_alarms(offsets)
+        if offsets == self._offsets:
+            return
+        self._offsets = offsets
+        self._build()
+        self._reschedule()
+
+    def close(self) -> None:
+        self._store.remove_change_listener(self._on_change)
+        self._heap = []
+        self._versions = {}
+        self._live = {}
+
+    def __len__(self) -> int:
+        return len(self._heap) - self._stale
+
+    # --- kolejka ----------------------------------------------------------
+    def next_due(self) -> Optional[float]:
+        """Chwila najbliższego przypomnienia (sekundy UTC) albo ``None``."""
+        heap = self._heap
+        while heap and self._is_stale(heap[0]):
+            heapq.heappop(heap)
+            self._stale -= 1
+        return heap[0][0] if heap else None
+
+    def pop_due(self, now: Optional[float] = None) -> List[Reminder]:
+        """Zdejmuje przypomnienia, których czas minął.
+
+        Spóźnione przypomnienia (np. po uśpieniu komputera) są pokazywane, dopóki
+        wydarzenie trwa; z kilku zaległych dla jednego wydarzenia zostaje najbliższe
+        początku. Ukryte kalendarze nie dostają powiadomień.
+        """
+        now = self._clock() if now is None else now
+        heap = self._heap
+        due: Dict[str, Reminder] = {}
+        while heap and heap[0][0] <= now:
+            entry = heapq.heappop(heap)
+            if self._is_stale(entry):
+                self._stale -= 1
+                continue
+            _fire_at, event_id, minutes, _version = entry
+            self._consume(event_id)
+            event = self._store.get_event(event_id)
+            if event is None or event.end_ts <= now or not self._store.is_visible(event):
+                continue
+            previous = due.get(event_id)
+            if previous is None or minutes < previous.minutes_before:
+                due[event_id] = Reminder(event, minutes)
+        return sorted(due.values(), key=lambda reminder: reminder.event.start_ts)
+
+    # --- aktualizacja -----------------------------------------------------
+    def _build(self) -> None:
+        now = self._clock()
+        self._heap = []
+        self._versions = {}
+        self._live = {}
+        self._stale = 0
+        for event in self._store.all_events(include_hidden=True):
+            if event.start_ts > now:
+                self._push(event, now, heapify=False)
+        heapq.heapify(self._heap)
+
+    def _on_change(self, kind: str, events: List[Event], _before: Dict[str, object]) -> None:
+        now = self._clock()
+        for event in events:
+            self._invalidate(event.id)
+            if kind != "remove" and event.start_ts > now:
+                self._push(event, now)
+        self._compact()
+        self._reschedule()
+
+    def _push(self, event: Event, now: float, heapify: bool = True) -> None:
+        self._serial += 1
+        version = self._serial
+        pushed = 0
+        for minutes in event.alarms or self._offsets:
+            fire_at = event.start_ts - minutes * 60
+            if fire_at <= now:
+                continue
+            entry = (fire_at, event.id, minutes, version)
+            if heapify:
+                heapq.heappush(self._heap, entry)
+            else:
+                self._heap.append(entry)
+            pushed += 1
+        if pushed:
+            self._versions[event.id] = version
+            self._live[event.id] = pushed
+
+    def _invalidate(self, event_id: str) -> None:
+        # Bez żywych wpisów wydarzenie znika z ``_versions``, więc jego dotychczasowe
+        # wpisy w kopcu stają się nieaktualne.
+        live = self._live.pop(event_id, 0)
+        if live:
+            del self._versions[event_id]
+            self._stale += live
+
+    def _consume(self, event_id: str) -> None:
+        remaining = self._live[event_id] - 1
+        if remaining:
+            self._live[event_id] = remaining
+        else:
+            del self._live[event_id]
+            del self._versions[event_id]
+
+    def _is_stale(self, entry: _Entry) -> bool:
+        return self._versions.get(entry[1]) != entry[3]
+
+    def _compact(self) -> None:
+        if self._stale < _COMPACT_MIN_STALE or self._stale * 2 < len(self._heap):
+            return
+        self._heap = [entry for entry in self._heap if not self._is_stale(entry)]
+        heapq.heapify(self._heap)
+        self._stale = 0
+
+    def _reschedule(self) -> None:
+        if self._on_reschedule is not None:
+            self._on_reschedule()
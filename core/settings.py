@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, Optional
+
+from core.paths import settings_path
+
+# Nazwa strefy IANA, w której widoki układają dni; brak klucza = strefa domyślna magazynu.
+DISPLAY_TIMEZONE_KEY = "calendar.display_timezone"
+
+
+class Settings:
+    """Drobne ustawienia aplikacji (np. obserwowany folder) w pliku JSON."""
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        self._path = path or settings_path()
+        self._values: Dict[str, object] = {}
+        self._loaded = False
+
+    def get(self, key: str, default: object = None) -> object:
+        self._ensure_loaded()
+        return self._values.get(key, default)
+
+    def set(self, key: str, value: object) -> None:
+        self._ensure_loaded()
+        if self._values.get(key) == value:
+            return
+        if value is None:
+            self._values.pop(key, None)
+        else:
+            self._values[key] = value
+        self._save()
+
+    def display_timezone(self) -> Optional[str]:
+        """Zapisana strefa wyświetlania kalendarza, o ile jest poprawna."""
+        from core.calendar import resolve_timezone
+
+        value = self.get(DISPLAY_TIMEZONE_KEY)
+        if not isinstance(value, str) or not value:
+            return None
+        try:
+            resolve_timezone(value)
+        except ValueError:
+            return None
+        return value
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            with self._path.open("r", encoding="utf-8") as handle:
+                data = json.load(handle)
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict):
+            self._values = data
+
+    def _save(self) -> None:
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._path.with_suffix(".tmp")
+        with tmp_path.open("w", encoding="utf-8") as handle:
+            json.dump(self._values, handle, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self._path)
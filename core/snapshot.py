@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+import zlib
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Sequence, Tuple
+
+from core.calendar import COLOR_PRESETS, DEFAULT_CALENDAR_ID, DEFAULT_COLOR_KEY, UTC, Event
+
+MAGIC = b"SHCS"
+FORMAT_VERSION = 2
+
+# magia, wersja, zarezerwowane, CRC32 reszty pliku, liczba wydarzeń, długość metadanych, długość tablicy napisów
+_HEADER = struct.Struct("<4sHHIIII")
+# początek, koniec (sekundy UTC), indeksy napisów: id, tytuł, opis, uid; indeks kalendarza, indeks koloru
+_RECORD_V1 = struct.Struct("<ddIIIIHBx")
+# jak w wersji 1 oraz indeks napisu z przypomnieniami („15,60”)
+_RECORD_V2 = struct.Struct("<ddIIIIIHBx")
+_STRING_SEPARATOR = "\x00"
+
+# Wiersz wydarzenia w zrzucie: (id, tytuł, start_ts, end_ts, kolor, opis, ID kalendarza, uid, przypomnienia).
+EventRow = Tuple[str, str, float, float, str, str, str, str, Tuple[int, ...]]
+
+
+class SnapshotError(ValueError):
+    """Plik zrzutu jest uszkodzony albo zapisany w nieznanej wersji formatu."""
+
+
+@dataclass
+class SnapshotData:
+    calendars: List[Dict[str, object]] = field(default_factory=list)
+    events: List[Event] = field(default_factory=list)
+
+
+def write_snapshot(path: Path, calendars: Sequence[Dict[str, object]], rows: Sequence[EventRow]) -> None:
+    """Zapisuje zrzut w najnowszej wersji formatu (atomowo, przez plik tymczasowy).
+
+    Rekordy mają stałą szerokość: czasy jako liczby zmiennoprzecinkowe, kalendarz
+    i kolor jako indeksy do tablic w metadanych, a teksty jako indeksy do tablicy
+    napisów, w której każdy napis występuje raz (tytuły zajęć często się powtarzają).
+    """
+    calendar_index = {entry["id"]: index for index, entry in enumerate(calendars)}
+    colors = [name for name, _hex in COLOR_PRESETS]
+    color_index = {name: index for index, name in enumerate(colors)}
+    default_color = color_index[DEFAULT_COLOR_KEY]
+    default_calendar = calendar_index.get(DEFAULT_CALENDAR_ID, 0)
+
+    strings: Dict[str, int] = {"": 0}
+
+    def intern(value: str) -> int:
+        index = strings.get(value)
+        if index is None:
+            index = strings[value] = len(strings)
+        return index
+
+    pack = _RECORD_V2.pack
+    records = b"".join(
+        pack(
+            start_ts,
+            end_ts,
+            intern(event_id),
+            intern(title),
+            intern(description),
+            intern(uid),
+            intern(",".join(map(str, alarms))),
+            calendar_index.get(calendar_id, default_calendar),
+            color_index.get(color_key, default_color),
+        )
+        for event_id, title, start_ts, end_ts, color_key, description, calendar_id, uid, alarms in rows
+    )
+    # Słownik zachowuje kolejność wstawiania, więc pozycja napisu to jego indeks.
+    # Separator nie może wystąpić wewnątrz napisu.
+    string_data = _STRING_SEPARATOR.join(value.replace(_STRING_SEPARATOR, "") for value in strings).encode("utf-8")
+    meta = json.dumps({"calendars": list(calendars), "colors": colors}, ensure_ascii=False).encode("utf-8")
+
+    body = [meta, records, string_data]
+    checksum = 0
+    for part in body:
+        checksum = zlib.crc32(part, checksum)
+    header = _HEADER.pack(MAGIC, FORMAT_VERSION, 0, checksum, len(rows), len(meta), len(string_data))
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    with tmp_path.open("wb") as handle:
+        handle.write(header)
+        for part in body:
+            handle.write(part)
+    os.replace(tmp_path, path)
+
+
+def read_snapshot(path: Path) -> SnapshotData:
+    """Wczytuje zrzut w dowolnej obsługiwanej wersji formatu.
+
+    Plik jest mapowany do pamięci; rekordy są dekodowane wprost z mapowania,
+    bez wczytywania całego pliku do osobnego bufora.
+    """
+    with path.open("rb") as handle:
+        size = os.fstat(handle.fileno()).st_size
+        if size < _HEADER.size:
+            raise SnapshotError(f"Plik zrzutu jest za krótki: {path}")
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped, memoryview(mapped) as view:
+            magic, version, _reserved, checksum, count, meta_size, strings_size = _HEADER.unpack_from(view)
+            if magic != MAGIC:
+                raise SnapshotError(f"To nie jest plik zrzutu kalendarza: {path}")
+            reader = _READERS.get(version)
+            if reader is None:
+                raise SnapshotError(f"Nieobsługiwana wersja zrzutu ({version}): {path}")
+            with view[_HEADER.size:] as body:
+                if zlib.crc32(body) != checksum:
+                    raise SnapshotError(f"Suma kontrolna zrzutu się nie zgadza: {path}")
+                return reader(body, count, meta_size, strings_size)
+
+
+def _read_v1(body: memoryview, count: int, meta_size: int, strings_size: int) -> SnapshotData:
+    records_size = count * _RECORD_V1.size
+    if meta_size + records_size + strings_size != len(body):
+        raise SnapshotError("Rozmiary sekcji zrzutu nie zgadzają się z długością pliku.")
+    with body[:meta_size] as meta_view:
+        meta = json.loads(str(meta_view, "utf-8"))
+    with body[meta_size + records_size:] as strings_view:
+        strings = str(strings_view, "utf-8").split(_STRING_SEPARATOR)
+
+    calendars = meta["calendars"]
+    calendar_ids = [entry["id"] for entry in calendars]
+    colors = meta["colors"]
+    fromtimestamp = datetime.fromtimestamp
+    with body[meta_size:meta_size + records_size] as records:
+        events = [
+            Event(
+                strings[id_index],
+                strings[title_index],
+                fromtimestamp(start_ts, UTC),
+                fromtimestamp(end_ts, UTC),
+                colors[color],
+                strings[description_index],
+                calendar_ids[calendar],
+                strings[uid_index],
+            )
+            for start_ts, end_ts, id_index, title_index, description_index, uid_index, calendar, color
+            in _RECORD_V1.iter_unpack(records)
+        ]
+    return SnapshotData(calendars, events)
+
+
+def _read_v2(body: memoryview, count: int, meta_size: int, strings_size: int) -> SnapshotData:
+    records_size = count * _RECORD_V2.size
+    if meta_size + records_size + strings_size != len(body):
+        raise SnapshotError("Rozmiary sekcji zrzutu nie zgadzają się z długością pliku.")
+    with body[:meta_size] as meta_view:
+        meta = json.loads(str(meta_view, "utf-8"))
+    with body[meta_size + records_size:] as strings_view:
+        strings = str(strings_view, "utf-8").split(_STRING_SEPARATOR)
+
+    calendars = meta["calendars"]
+    calendar_ids = [entry["id"] for entry in calendars]
+    colors = meta["colors"]
+    fromtimestamp = datetime.fromtimestamp
+    # Zestawów przypomnień jest kilka, więc każdy napis dekodujemy raz.
+    alarm_sets: Dict[int, Tuple[int, ...]] = {}
+
+    def alarms(index: int) -> Tuple[int, ...]:
+        value = alarm_sets.get(index)
+        if value is None:
+            text = strings[index]
+            value = alarm_sets[index] = tuple(int(item) for item in text.split(",")) if text else ()
+        return value
+
+    with body[meta_size:meta_size + records_size] as records:
+        events = [
+            Event(
+                strings[id_index],
+                strings[title_index],
+                fromtimestamp(start_ts, UTC),
+                fromtimestamp(end_ts, UTC),
+                colors[color],
+                strings[description_index],
+                calendar_ids[calendar],
+                strings[uid_index],
+                alarms(alarms_index),
+            )
+            for start_ts, end_ts, id_index, title_index, description_index, uid_index, alarms_index, calendar, color
+            in _RECORD_V2.iter_unpack(records)
+        ]
+    return SnapshotData(calendars, events)
+
+
+# Czytniki kolejnych wersji formatu. Zmiana układu rekordu to nowa wersja:
+# zapis zawsze używa najnowszej, a starsze czytniki zostają, więc stare pliki
+# wczytują się bez konwersji i przy najbliższym zapisie przechodzą na nowy format.
+_READERS: Dict[int, Callable[[memoryview, int, int, int], SnapshotData]] = {
+    1: _read_v1,
+    2: _read_v2,
+}
@@ -2,12 +2,18 @@ from __future__ import annotations
 
 import sys
 
-from PyQt6.QtWidgets import QApplication
 
-from ui.main_window import MainWindow
+def main() -> None:
+    if len(sys.argv) > 1 and sys.argv[1] == "cli":
+        # Tryb bez interfejsu: nie importujemy PyQt6, więc start trwa ułamek sekundy.
+        from core.cli import main as cli_main
 
+        sys.exit(cli_main(sys.argv[2:]))
+
+    from PyQt6.QtWidgets import QApplication
+
+    from ui.main_window import MainWindow
 
-def main() -> None:
     app = QApplication(sys.argv)
     window = MainWindow()
     window.show()
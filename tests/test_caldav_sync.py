@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from datetime import timedelta
+from pathlib import Path
+
+from core.caldav import CalDavClient, CalDavSync
+from core.caldav_server import LocalCalDavServer
+from core.calendar import DEFAULT_COLOR_KEY, CalendarStore
+from core.calendar_storage import load_calendar, save_calendar
+
+
+def _ics(uid: str, title: str, start: str, end: str) -> bytes:
+    return (
+        "BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//test//EN\r\n"
+        f"BEGIN:VEVENT\r\nUID:{uid}\r\nSUMMARY:{title}\r\n"
+        f"DTSTART:{start}\r\nDTEND:{end}\r\nEND:VEVENT\r\nEND:VCALENDAR\r\n"
+    ).encode()
+
+
+class CalDavRestartTest(unittest.TestCase):
+    """Stan synchronizacji nie jest zapisywany – ponowne uruchomienie nie może dublować wydarzeń."""
+
+    def setUp(self) -> None:
+        self.server = LocalCalDavServer()
+        self.url = self.server.start()
+        self.addCleanup(self.server.stop)
+        self.path = Path(tempfile.mkdtemp()) / "calendar.snap"
+        self.server.put_resource("lecture.ics", _ics("lecture-1", "Lecture", "20261020T080000Z", "20261020T093000Z"))
+        self.server.put_resource("lab.ics", _ics("lab-1", "Lab", "20261021T080000Z", "20261021T093000Z"))
+
+    def _connect(self, store: CalendarStore) -> CalDavSync:
+        target = store.calendar_for_source(self.url) or store.create_calendar("CalDAV", source=self.url)
+        sync = CalDavSync(store, CalDavClient(self.url), target.id)
+        self.addCleanup(sync.close)
+        return sync
+
+    def _restart(self, store: CalendarStore) -> CalendarStore:
+        save_calendar(store, self.path)
+        return load_calendar(self.path)
+
+    def _titles(self, store: CalendarStore) -> list:
+        return sorted(event.title for event in store.all_events(include_hidden=True))
+
+    def test_restart_does_not_duplicate_remote_events(self) -> None:
+        store = CalendarStore()
+        self._connect(store).sync()
+        self.assertEqual(self._titles(store), ["Lab", "Lecture"])
+
+        store = self._restart(store)
+        sync = self._connect(store)
+        sync.sync()
+        self.assertEqual(self._titles(store), ["Lab", "Lecture"])
+
+        self.server.put_resource("lecture.ics", _ics("lecture-1", "Moved", "20261020T100000Z", "20261020T113000Z"))
+        sync.sync()
+        self.assertEqual(self._titles(store), ["Lab", "Moved"])
+
+    def test_restart_applies_changes_made_while_offline(self) -> None:
+        store = CalendarStore()
+        self._connect(store).sync()
+        store = self._restart(store)
+
+        self.server.delete_resource("lab.ics")
+        self.server.put_resource("lecture.ics", _ics("lecture-1", "Moved", "20261020T100000Z", "20261020T113000Z"))
+        self._connect(store).sync()
+        self.assertEqual(self._titles(store), ["Moved"])
+
+    def test_local_edit_after_restart_updates_existing_resource(self) -> None:
+        store = CalendarStore()
+        self._connect(store).sync()
+        store = self._restart(store)
+        sync = self._connect(store)
+        sync.sync()
+
+        lecture = next(event for event in store.all_events() if event.title == "Lecture")
+        store.update_event(lecture.id, title="Renamed")
+        sync.sync()
+        resources = self.server.resources()
+        self.assertEqual(len(resources), 2)
+        self.assertIn(b"SUMMARY:Renamed", resources[self.server.collection + "lecture.ics"])
+
+
+class CalDavUndoTest(unittest.TestCase):
+    """Zmiany z serwera nie są krokiem cofania – Ctrl+Z nie może ich odwrócić ani wysłać."""
+
+    def setUp(self) -> None:
+        self.server = LocalCalDavServer()
+        self.url = self.server.start()
+        self.addCleanup(self.server.stop)
+        self.server.put_resource("lecture.ics", _ics("lecture-1", "Lecture", "20261020T080000Z", "20261020T093000Z"))
+
+    def test_undo_skips_remote_changes(self) -> None:
+        store = CalendarStore()
+        target = store.create_calendar("CalDAV", source=self.url)
+        sync = CalDavSync(store, CalDavClient(self.url), target.id)
+        self.addCleanup(sync.close)
+        sync.sync()
+        self.assertFalse(store.can_undo)
+
+        own = store.add_event("Własne", store.now(), store.now() + timedelta(hours=1), DEFAULT_COLOR_KEY)
+        self.server.put_resource("lab.ics", _ics("lab-1", "Lab", "20261021T080000Z", "20261021T093000Z"))
+        sync.sync()
+
+        self.assertEqual(store.undo(), "Dodanie wydarzenia")
+        self.assertIsNone(store.get_event(own))
+        self.assertFalse(sync.has_pending)
+        sync.sync()
+        self.assertEqual(len(self.server.resources()), 2)
+
+    def test_remote_update_drops_stale_undo_step(self) -> None:
+        store = CalendarStore()
+        target = store.create_calendar("CalDAV", source=self.url)
+        sync = CalDavSync(store, CalDavClient(self.url), target.id)
+        self.addCleanup(sync.close)
+        sync.sync()
+
+        lecture = next(iter(store.events_in_calendar(target.id)))
+        store.update_event(lecture.id, title="Lokalnie")
+        sync.sync()
+        self.server.put_resource("lecture.ics", _ics("lecture-1", "Zdalnie", "20261020T080000Z", "20261020T093000Z"))
+        sync.sync()
+
+        self.assertEqual(lecture.title, "Zdalnie")
+        self.assertFalse(store.can_undo)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from core.calendar import CalendarStore
+from core.calendar_storage import load_calendar, save_calendar, set_aside_unreadable
+
+
+class UnreadableCalendarTest(unittest.TestCase):
+    """Nieczytelny zrzut musi zostać odłożony, zanim nowy zapis go nadpisze."""
+
+    def test_unreadable_snapshot_is_set_aside(self) -> None:
+        path = Path(tempfile.mkdtemp()) / "calendar.snap"
+        path.write_bytes(b"to nie jest zrzut")
+        with self.assertRaises(ValueError):
+            load_calendar(path)
+
+        backup = set_aside_unreadable(path)
+        self.assertIsNotNone(backup)
+        self.assertTrue(backup.name.startswith("calendar.snap.corrupt-"))
+        self.assertEqual(backup.read_bytes(), b"to nie jest zrzut")
+        self.assertFalse(path.exists())
+
+        save_calendar(CalendarStore(), path)
+        self.assertEqual(backup.read_bytes(), b"to nie jest zrzut")
+
+    def test_missing_file_is_not_an_error(self) -> None:
+        self.assertIsNone(set_aside_unreadable(Path(tempfile.mkdtemp()) / "calendar.snap"))
+
+
+if __name__ == "__main__":
+    unittest.main()
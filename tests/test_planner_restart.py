@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from core.calendar import CalendarStore
+from core.calendar_storage import load_calendar, save_calendar
+from core.planner import StudyPlanner, StudyTask
+
+# Sesje wczytane z zapisu są oceniane względem prawdziwego zegara, więc plan musi leżeć w przyszłości.
+NOW = (datetime.now() + timedelta(days=1)).replace(hour=7, minute=0, second=0, microsecond=0)
+
+
+class PlannerRestartTest(unittest.TestCase):
+    """Zadania i powiązania sesji muszą przetrwać zapis kalendarza i ponowne uruchomienie."""
+
+    def setUp(self) -> None:
+        directory = Path(tempfile.mkdtemp())
+        self.calendar_path = directory / "calendar.snap"
+        self.planner_path = directory / "planner.json"
+
+    def _restart(self, store: CalendarStore, planner: StudyPlanner) -> tuple:
+        planner.close()
+        save_calendar(store, self.calendar_path)
+        store = load_calendar(self.calendar_path)
+        return store, StudyPlanner(store, path=self.planner_path)
+
+    def _session_count(self, store: CalendarStore, planner: StudyPlanner) -> int:
+        return len(store.events_in_calendar(planner.calendar_id))
+
+    def test_tasks_and_sessions_survive_restart(self) -> None:
+        store = CalendarStore()
+        planner = StudyPlanner(store, path=self.planner_path)
+        task = planner.add_task(StudyTask("Analiza", timedelta(hours=6), NOW + timedelta(days=5)))
+        planner.plan(NOW)
+        sessions = self._session_count(store, planner)
+        self.assertGreater(sessions, 0)
+
+        store, planner = self._restart(store, planner)
+        self.assertEqual([restored.id for restored in planner.tasks()], [task.id])
+        self.assertEqual(planner.scheduled(task.id), timedelta(hours=6))
+        self.assertFalse(planner.has_pending)
+
+        planner.plan(NOW)
+        self.assertEqual(self._session_count(store, planner), sessions)
+        self.assertEqual(planner.scheduled(task.id), timedelta(hours=6))
+
+    def test_sessions_without_task_are_removed(self) -> None:
+        store = CalendarStore()
+        planner = StudyPlanner(store, path=self.planner_path)
+        planner.add_task(StudyTask("Fizyka", timedelta(hours=4), NOW + timedelta(days=3)))
+        planner.plan(NOW)
+        self.planner_path.unlink()
+
+        store, planner = self._restart(store, planner)
+        self.assertEqual(planner.tasks(), [])
+        self.assertTrue(planner.has_invalid_sessions)
+        planner.replan(NOW)
+        self.assertEqual(self._session_count(store, planner), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
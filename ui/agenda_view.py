@@ -0,0 +1,348 @@
+from __future__ import annotations
+
+from collections import deque
+from datetime import date, datetime, time
+from typing import Deque, List, Optional, Tuple
+
+from PyQt6.QtCore import QAbstractListModel, QLocale, QModelIndex, Qt, QTimer, pyqtSignal
+from PyQt6.QtGui import QFont
+from PyQt6.QtWidgets import QAbstractItemView, QFrame, QHBoxLayout, QLabel, QListView, QPushButton, QVBoxLayout, QWidget
+
+from core.calendar import COLOR_KEYS, CalendarStore, Event
+from ui import theme
+
+# Strona to jeden miesiąc; tyle stron trzymamy naraz w modelu.
+MAX_PAGES = 24
+# Ile wierszy zapasu nad i pod widokiem, zanim dociągniemy kolejną stronę.
+PREFETCH_ROWS = 30
+
+# Rodzaje wierszy
+ROW_MONTH = 0
+ROW_DAY = 1
+ROW_EVENT = 2
+
+Row = Tuple[int, object]
+
+
+class _Page:
+    def __init__(self, year: int, month: int, rows: List[Row]) -> None:
+        self.year = year
+        self.month = month
+        self.rows = rows
+
+    @property
+    def key(self) -> Tuple[int, int]:
+        return (self.year, self.month)
+
+
+class AgendaModel(QAbstractListModel):
+    """Okno kolejnych miesięcy wydarzeń ładowane z zapytań zakresowych magazynu.
+
+    Strony (miesiące) są doklejane na początku lub końcu w miarę przewijania,
+    a najdalsze od widoku są zwalniane, więc liczba wierszy w pamięci jest
+    ograniczona niezależnie od tego, jak daleko użytkownik przewinie.
+    """
+
+    def __init__(self, store: CalendarStore, parent=None) -> None:
+        super().__init__(parent)
+        self._store = store
+        self._pages: Deque[_Page] = deque()
+        self._rows: List[Row] = []
+        self._locale = QLocale(QLocale.Language.Polish, QLocale.Country.Poland)
+        self._icons = {}
+
+    # --- Qt -------------------------------------------------------------
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:  # noqa: B008
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        kind, payload = self._rows[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self._row_text(kind, payload)
+        if role == Qt.ItemDataRole.UserRole:
+            return payload.id if kind == ROW_EVENT else None
+        if role == Qt.ItemDataRole.DecorationRole and kind == ROW_EVENT:
+            return self._icon(payload.color_key)
+        if role == Qt.ItemDataRole.FontRole and kind != ROW_EVENT:
+            font = QFont()
+            font.setBold(True)
+            return font
+        if role == Qt.ItemDataRole.ForegroundRole:
+            if kind == ROW_MONTH:
+                return theme.color("agenda_month")
+            if kind == ROW_DAY:
+                return theme.color("day_header")
+        return None
+
+    def flags(self, index: QModelIndex) -> Qt.ItemFlag:
+        if index.isValid() and self._rows[index.row()][0] == ROW_EVENT:
+            return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+        return Qt.ItemFlag.ItemIsEnabled
+
+    # --- strony -----------------------------------------------------------
+    @property
+    def page_count(self) -> int:
+        return len(self._pages)
+
+    def first_page_rows(self) -> int:
+        return len(self._pages[0].rows)
+
+    def last_page_start(self) -> int:
+        return len(self._rows) - len(self._pages[-1].rows)
+
+    def reset_to(self, day: date) -> int:
+        """Ładuje stronę z podanym dniem; zwraca wiersz, od którego zacząć widok."""
+        self.beginResetModel()
+        page = self._load_page(day.year, day.month)
+        self._pages = deque([page])
+        self._rows = list(page.rows)
+        self.endResetModel()
+        return self.row_for_day(day)
+
+    def prepend_page(self) -> int:
+        """Dokłada poprzedni miesiąc; zwraca liczbę dodanych wierszy."""
+        first = self._pages[0]
+        year, month = _shift_month(first.year, first.month, -1)
+        page = self._load_page(year, month)
+        self.beginInsertRows(QModelIndex(), 0, len(page.rows) - 1)
+        self._pages.appendleft(page)
+        self._rows[0:0] = page.rows
+        self.endInsertRows()
+        return len(page.rows)
+
+    def append_page(self) -> int:
+        last = self._pages[-1]
+        year, month = _shift_month(last.year, last.month, 1)
+        page = self._load_page(year, month)
+        start = len(self._rows)
+        self.beginInsertRows(QModelIndex(), start, start + len(page.rows) - 1)
+        self._pages.append(page)
+        self._rows.extend(page.rows)
+        self.endInsertRows()
+        return len(page.rows)
+
+    def evict_first(self) -> int:
+        page = self._pages[0]
+        count = len(page.rows)
+        self.beginRemoveRows(QModelIndex(), 0, count - 1)
+        self._pages.popleft()
+        del self._rows[:count]
+        self.endRemoveRows()
+        return count
+
+    def evict_last(self) -> int:
+        page = self._pages[-1]
+        count = len(page.rows)
+        start = len(self._rows) - count
+        self.beginRemoveRows(QModelIndex(), start, len(self._rows) - 1)
+        self._pages.pop()
+        del self._rows[start:]
+        self.endRemoveRows()
+        return count
+
+    def reload(self) -> None:
+        """Odświeża załadowane strony po zmianie danych (ich liczba jest ograniczona)."""
+        if not self._pages:
+            return
+        self.beginResetModel()
+        self._pages = deque(self._load_page(page.year, page.month) for page in self._pages)
+        self._rows = [row for page in self._pages for row in page.rows]
+        self.endResetModel()
+
+    def day_at(self, row: int) -> Optional[date]:
+        """Dzień, do którego należy wiersz (dla nagłówka miesiąca – jego pierwszy dzień)."""
+        for index in range(min(row, len(self._rows) - 1), -1, -1):
+            kind, payload = self._rows[index]
+            if kind == ROW_DAY:
+                return payload
+            if kind == ROW_MONTH:
+                return payload
+            if kind == ROW_EVENT:
+                return payload.local_day
+        return None
+
+    def row_for_day(self, day: date) -> int:
+        for index, (kind, payload) in enumerate(self._rows):
+            if kind == ROW_DAY and payload >= day:
+                return index
+            if kind == ROW_EVENT and payload.local_day >= day:
+                return max(index - 1, 0)
+        return 0
+
+    def _load_page(self, year: int, month: int) -> _Page:
+        tz = self._store.display_tz
+        first = date(year, month, 1)
+        next_year, next_month = _shift_month(year, month, 1)
+        start = datetime.combine(first, time.min, tz)
+        end = datetime.combine(date(next_year, next_month, 1), time.min, tz)
+
+        rows: List[Row] = [(ROW_MONTH, first)]
+        current_day: Optional[date] = None
+        for event in self._store.events_between(start, end):
+            # Wydarzenia trwające z poprzedniego miesiąca pokazujemy na stronie, w której się zaczęły.
+            if event.local_start < start or event.local_start >= end:
+                continue
+            if event.local_day != current_day:
+                current_day = event.local_day
+                rows.append((ROW_DAY, current_day))
+            rows.append((ROW_EVENT, event))
+        return _Page(year, month, rows)
+
+    def _row_text(self, kind: int, payload) -> str:
+        if kind == ROW_MONTH:
+            name = self._locale.standaloneMonthName(payload.month, QLocale.FormatType.LongFormat)
+            suffix = "" if self._has_events(payload) else " · brak wydarzeń"
+            return f"{name.capitalize()} {payload.year}{suffix}"
+        if kind == ROW_DAY:
+            day_name = self._locale.dayName(payload.isoweekday(), QLocale.FormatType.LongFormat)
+            return f"{day_name}, {payload.strftime('%d.%m.%Y')}"
+        event: Event = payload
+        return f"{event.local_start.strftime('%H:%M')} – {event.local_end.strftime('%H:%M')}  {event.title}"
+
+    def _has_events(self, first: date) -> bool:
+        page = next((page for page in self._pages if page.key == (first.year, first.month)), None)
+        return page is not None and len(page.rows) > 1
+
+    def _icon(self, color_key: str):
+        icon = self._icons.get(color_key)
+        if icon is None:
+            from ui.calendar_view import create_color_icon
+
+            icon = create_color_icon(COLOR_KEYS.get(color_key, "#3A7AFE"))
+            self._icons[color_key] = icon
+        return icon
+
+
+class AgendaPage(QWidget):
+    """Ciągła lista wydarzeń pogrupowanych po dniach, przewijana w obie strony bez końca."""
+
+    event_edit_requested = pyqtSignal(str)
+
+    def __init__(self, store: CalendarStore, parent: QWidget | None = None) -> None:
+        super().__init__(parent)
+        self._store = store
+        self._adjusting = False
+        self._stale = False
+
+        root_layout = QVBoxLayout(self)
+        root_layout.setContentsMargins(0, 0, 0, 0)
+        root_layout.setSpacing(0)
+
+        container = QFrame()
+        container.setObjectName("calendarBoard")
+        main_layout = QVBoxLayout(container)
+        main_layout.setContentsMargins(24, 24, 24, 24)
+        main_layout.setSpacing(16)
+
+        controls = QHBoxLayout()
+        controls.setSpacing(8)
+        self._today_button = QPushButton("Dzisiaj")
+        self._today_button.clicked.connect(lambda: self.show_date(self._store.now().date()))
+        self._range_label = QLabel()
+        self._range_label.setObjectName("panelTitle")
+        controls.addWidget(self._today_button)
+        controls.addStretch(1)
+        controls.addWidget(self._range_label)
+        main_layout.addLayout(controls)
+
+        self._model = AgendaModel(store, self)
+        self._view = QListView()
+        self._view.setObjectName("agendaList")
+        self._view.setModel(self._model)
+        # Jednakowa wysokość wierszy: widok nie mierzy każdego wiersza, a przewijanie
+        # po wierszach pozwala łatwo skorygować pozycję po doklejeniu strony u góry.
+        self._view.setUniformItemSizes(True)
+        self._view.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerItem)
+        self._view.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self._view.doubleClicked.connect(self._handle_double_click)
+        scroll_bar = self._view.verticalScrollBar()
+        scroll_bar.valueChanged.connect(self._schedule_fill)
+        scroll_bar.rangeChanged.connect(self._schedule_fill)
+        main_layout.addWidget(self._view)
+
+        root_layout.addWidget(container)
+
+        self._fill_timer = QTimer(self)
+        self._fill_timer.setSingleShot(True)
+        self._fill_timer.setInterval(0)
+        self._fill_timer.timeout.connect(self._fill)
+
+        self.show_date(self._store.now().date())
+
+    def show_date(self, day: date) -> None:
+        self._model.reset_to(day)
+        self._view.doItemsLayout()
+        self._fill()
+        # Po doklejeniu stron u góry wiersz dnia się przesunął, więc szukamy go ponownie.
+        self._view.scrollTo(self._model.index(self._model.row_for_day(day)), QAbstractItemView.ScrollHint.PositionAtTop)
+        self._update_label()
+
+    def refresh(self) -> None:
+        if not self.isVisible():
+            # Niewidoczna agenda przeładuje strony dopiero przy pokazaniu.
+            self._stale = True
+            return
+        self._stale = False
+        value = self._view.verticalScrollBar().value()
+        self._model.reload()
+        self._view.verticalScrollBar().setValue(value)
+        self._schedule_fill()
+
+    def showEvent(self, event) -> None:  # type: ignore[override]
+        super().showEvent(event)
+        if self._stale:
+            self.refresh()
+        self._schedule_fill()
+
+    def _schedule_fill(self, *_args) -> None:
+        if not self._adjusting:
+            self._fill_timer.start()
+        self._update_label()
+
+    def _fill(self) -> None:
+        """Dociąga strony, aż nad i pod widokiem będzie zapas wierszy; zwalnia dalekie strony."""
+        view = self._view
+        scroll_bar = view.verticalScrollBar()
+        visible_rows = max(view.viewport().height() // max(view.sizeHintForRow(0), 1), 1)
+        model = self._model
+        self._adjusting = True
+        try:
+            for _ in range(MAX_PAGES):
+                top = scroll_bar.value()
+                if top < PREFETCH_ROWS:
+                    top += model.prepend_page()
+                    # Strony widoczne na ekranie zostają, nawet gdy chwilowo przekraczamy limit.
+                    while model.page_count > MAX_PAGES and model.last_page_start() > top + visible_rows + PREFETCH_ROWS:
+                        model.evict_last()
+                elif model.rowCount() - top - visible_rows < PREFETCH_ROWS:
+                    model.append_page()
+                    while model.page_count > MAX_PAGES and model.first_page_rows() < top - PREFETCH_ROWS:
+                        top -= model.evict_first()
+                else:
+                    break
+                # Zakres suwaka Qt przelicza leniwie; bez tego korekta pozycji zostałaby obcięta.
+                view.doItemsLayout()
+                scroll_bar.setValue(top)
+            else:
+                # Rzadkie dane: zapas jeszcze niepełny, dokończymy w następnym obiegu pętli zdarzeń.
+                self._fill_timer.start()
+        finally:
+            self._adjusting = False
+        self._update_label()
+
+    def _update_label(self) -> None:
+        day = self._model.day_at(self._view.verticalScrollBar().value())
+        if day is not None:
+            self._range_label.setText(day.strftime("%m.%Y"))
+
+    def _handle_double_click(self, index: QModelIndex) -> None:
+        event_id = index.data(Qt.ItemDataRole.UserRole)
+        if isinstance(event_id, str):
+            self.event_edit_requested.emit(event_id)
+
+
+def _shift_month(year: int, month: int, delta: int) -> Tuple[int, int]:
+    index = year * 12 + (month - 1) + delta
+    return index // 12, index % 12 + 1
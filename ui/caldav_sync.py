@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+from core.caldav import CalDavClient, CalDavSync
+from core.calendar import CalendarStore, Event
+from ui.workers import BackgroundTask
+
+# Co ile sprawdzamy ctag kolekcji; niezmieniony ctag to jedno małe zapytanie.
+POLL_INTERVAL_MS = 60_000
+# Krótka zwłoka po edycji, by seria zmian poszła jednym przebiegiem.
+PUSH_DELAY_MS = 300
+
+
+class CalDavSyncController(QObject):
+    """Łączy ``CalDavSync`` z pętlą zdarzeń: sieć w tle, zmiany magazynu w wątku GUI.
+
+    Lokalne edycje są wysyłane chwilę po wprowadzeniu, a serwer jest odpytywany
+    cyklicznie. Naraz działa co najwyżej jeden przebieg synchronizacji.
+    """
+
+    synced = pyqtSignal()
+    sync_failed = pyqtSignal(str)
+
+    def __init__(self, store: CalendarStore, parent: QObject | None = None) -> None:
+        super().__init__(parent)
+        self._store = store
+        self._sync: Optional[CalDavSync] = None
+        self._url = ""
+        self._task: Optional[BackgroundTask] = None
+        self._rerun = False
+
+        self._poll_timer = QTimer(self)
+        self._poll_timer.setInterval(POLL_INTERVAL_MS)
+        self._poll_timer.timeout.connect(self.sync_now)
+
+        self._push_timer = QTimer(self)
+        self._push_timer.setSingleShot(True)
+        self._push_timer.setInterval(PUSH_DELAY_MS)
+        self._push_timer.timeout.connect(self.sync_now)
+
+    @property
+    def url(self) -> str:
+        return self._url
+
+    def connect_to(self, url: str) -> None:
+        self.disconnect_from()
+        client = CalDavClient(url)
+        target = self._store.calendar_for_source(url) or self._store.create_calendar(_calendar_name(url), source=url)
+        self._sync = CalDavSync(self._store, client, target.id)
+        self._url = url
+        self._store.add_change_listener(self._on_store_change)
+        self._poll_timer.start()
+        self.sync_now()
+
+    def disconnect_from(self) -> None:
+        if self._sync is None:
+            return
+        self._store.remove_change_listener(self._on_store_change)
+        self._poll_timer.stop()
+        self._push_timer.stop()
+        if self._task is not None:
+            self._task.cancel()
+        self._sync.close()
+        self._sync = None
+        self._url = ""
+
+    def sync_now(self) -> None:
+        sync = self._sync
+        if sync is None:
+            return
+        if self._task is not None:
+            self._rerun = True
+            return
+
+        def run(task: BackgroundTask):
+            sync.push_pending()
+            return None if task.cancelled else sync.fetch_changes()
+
+        task = BackgroundTask(run)
+        task.succeeded.connect(lambda changes: self._apply(sync, changes))
+        task.failed.connect(self.sync_failed)
+        task.done.connect(self._task_finished)
+        self._task = task
+        task.start(self)
+
+    def _apply(self, sync: CalDavSync, changes) -> None:
+        if sync is not self._sync or changes is None:
+            return
+        if sync.apply_changes(changes):
+            self.synced.emit()
+
+    def _task_finished(self) -> None:
+        self._task = None
+        if self._rerun:
+            self._rerun = False
+            self.sync_now()
+
+    def _on_store_change(self, _kind: str, _events: List[Event], _before: Dict[str, object]) -> None:
+        # Odbiorca w CalDavSync już zakolejkował zasób; tu tylko planujemy wysyłkę.
+        if self._sync is not None and self._sync.has_pending:
+            self._push_timer.start()
+
+
+def _calendar_name(url: str) -> str:
+    parts = urlsplit(url)
+    segments = [segment for segment in parts.path.split("/") if segment]
+    return segments[-1] if segments else (parts.hostname or "CalDAV")
@@ -1,21 +1,23 @@
 from __future__ import annotations
 
-from datetime import date, datetime, timedelta
+from datetime import date, datetime, time, timedelta
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Callable, Dict, Iterable, List, Optional, Set
 
 from PyQt6.QtCore import (
     QDate,
     QDateTime,
+    QEvent,
     QLocale,
+    QMimeData,
+    QTime,
     QPoint,
-    QPropertyAnimation,
-    QEasingCurve,
     QSize,
     Qt,
+    QTimer,
     pyqtSignal,
 )
-from PyQt6.QtGui import QColor, QIcon, QPainter, QPixmap
+from PyQt6.QtGui import QColor, QDrag, QIcon, QKeySequence, QPainter, QPixmap, QShortcut
 from PyQt6.QtWidgets import (
     QButtonGroup,
     QCalendarWidget,
@@ -25,35 +27,120 @@ from PyQt6.QtWidgets import (
     QFormLayout,
     QFrame,
     QHBoxLayout,
+    QInputDialog,
     QLabel,
     QListWidget,
     QListWidgetItem,
     QLineEdit,
+    QMenu,
     QMessageBox,
     QPushButton,
     QScrollArea,
     QStackedWidget,
+    QSpinBox,
+    QTableView,
     QTextEdit,
+    QTimeEdit,
     QToolButton,
+    QToolTip,
     QVBoxLayout,
     QWidget,
     QDateTimeEdit,
-    QGraphicsOpacityEffect,
 )
 
 ASSETS_DIR = Path(__file__).resolve().parent.parent / "assets" / "icons"
 
-from core.calendar import CalendarStore, Event, COLOR_KEYS, COLOR_PRESETS, _week_start
+from core.calendar import (
+    CalendarInfo,
+    CalendarStore,
+    Event,
+    IcsRecord,
+    COLOR_KEYS,
+    COLOR_PRESETS,
+    DEFAULT_CALENDAR_ID,
+    _week_start,
+)
+from core.free_time import FreeSlot, FreeTimeQuery, find_free_slots
+from core.ics_cache import IcsCache
+from core.paths import planner_path
+from core.planner import StudyPlanner
+from core.quick_add import parse_quick_event
+from core.reminders import DEFAULT_OFFSETS, OFFSET_PRESETS, format_offset
+from core.settings import DISPLAY_TIMEZONE_KEY, Settings
+from ui import theme
+from ui.agenda_view import AgendaPage
+from ui.caldav_sync import CalDavSyncController
+from ui.ics_watcher import IcsFolderWatcher
+from ui.planner_dialog import PlannerDialog
+from ui.query_service import QueryServiceController
+from ui.reminders import ReminderNotifier
+from ui.transitions import StackTransition
+from ui.workers import BackgroundTask
+from ui.year_view import YearCalendarPage
+
+WATCHED_FOLDER_KEY = "calendar.watched_folder"
+CALDAV_URL_KEY = "calendar.caldav_url"
+QUERY_SERVICE_KEY = "calendar.query_service"
+REMINDER_OFFSETS_KEY = "calendar.reminder_offsets"
+REDUCED_MOTION_KEY = "ui.reduced_motion"
+# Podpowiedzi w oknie wyboru strefy; można też wpisać dowolną nazwę IANA.
+TIMEZONE_PRESETS = ("Europe/Warsaw", "UTC", "Europe/London", "Europe/Berlin", "America/New_York", "Asia/Tokyo")
+# Przeciągane wydarzenie niesie tylko swoje ID.
+EVENT_MIME_TYPE = "application/x-studyhub-event-id"
+# Początek wolnego okna zapisany w elemencie listy tygodnia (cel upuszczenia).
+_SLOT_START_ROLE = Qt.ItemDataRole.UserRole + 1
 
 
 class CalendarView(QWidget):
     calendar_updated = pyqtSignal()
 
-    def __init__(self, store: CalendarStore, parent: QWidget | None = None) -> None:
+    def __init__(
+        self,
+        store: CalendarStore,
+        settings: Optional[Settings] = None,
+        parent: QWidget | None = None,
+    ) -> None:
         super().__init__(parent)
         self._store = store
+        self._settings = settings
+        self._import_task: Optional[BackgroundTask] = None
+        self._event_dialog: Optional[EventDialog] = None
         self.setObjectName("calendarRoot")
 
+        # Wspólna dla importu z okna dialogowego i obserwowanego folderu.
+        self._ics_cache = IcsCache()
+        self._folder_watcher = IcsFolderWatcher(store, self, self._ics_cache)
+        self._folder_watcher.calendar_changed.connect(self._on_folder_synced)
+        self._folder_watcher.sync_failed.connect(self._on_folder_failed)
+
+        self._caldav = CalDavSyncController(store, self)
+        self._caldav.synced.connect(self._on_caldav_synced)
+        self._caldav.sync_failed.connect(self._on_caldav_failed)
+        self._caldav_error_shown = False
+        self._query_service = QueryServiceController(store, self)
+        self._query_service.store_changed.connect(self._on_folder_synced)
+
+        offsets = settings.get(REMINDER_OFFSETS_KEY) if settings is not None else None
+        if not isinstance(offsets, list) or not all(isinstance(value, int) for value in offsets):
+            offsets = list(DEFAULT_OFFSETS)
+        self._reminders = ReminderNotifier(store, self, offsets)
+        self._reminder_box: Optional[QMessageBox] = None
+        if not self._reminders.uses_tray:
+            # Bez zasobnika systemowego przypomnienia pokazujemy w oknie aplikacji.
+            self._reminders.reminder_due.connect(self._show_reminder)
+
+        # Planer powstaje dopiero przy pierwszym otwarciu (tworzy własny kalendarz),
+        # chyba że zapisano już zadania – wtedy od razu pilnuje ich sesji.
+        self._planner: Optional[StudyPlanner] = None
+        self._replan_timer = QTimer(self)
+        self._replan_timer.setSingleShot(True)
+        self._replan_timer.setInterval(400)
+        self._replan_timer.timeout.connect(self._replan)
+        store.add_listener(self._on_store_changed)
+        if planner_path().exists():
+            self._planner = StudyPlanner(store, path=planner_path())
+            self._on_store_changed()
+
         main_layout = QVBoxLayout(self)
         main_layout.setContentsMargins(0, 0, 0, 0)
         main_layout.setSpacing(16)
@@ -63,26 +150,41 @@ class CalendarView(QWidget):
         self._view_stack = QStackedWidget()
         self._month_view = MonthlyCalendarPage(store)
         self._week_view = WeeklyCalendarPage(store)
+        self._agenda_view = AgendaPage(store)
+        self._year_view = YearCalendarPage(store)
 
         self._view_stack.addWidget(self._month_view)
         self._view_stack.addWidget(self._week_view)
+        self._view_stack.addWidget(self._agenda_view)
+        self._view_stack.addWidget(self._year_view)
         main_layout.addWidget(self._view_stack)
 
-        self._stack_effect = QGraphicsOpacityEffect(self._view_stack)
-        self._view_stack.setGraphicsEffect(self._stack_effect)
-        self._stack_effect.setOpacity(1.0)
-        self._fade_anim = QPropertyAnimation(self._stack_effect, b"opacity")
-        self._fade_anim.setDuration(220)
-        self._fade_anim.setEasingCurve(QEasingCurve.Type.InOutQuad)
+        # Przejścia przenikają zrzuty stron w nakładce; w spoczynku stos nie ma efektu graficznego.
+        self._transition = StackTransition(self._view_stack)
+        self._transition.set_reduced_motion(bool(settings is not None and settings.get(REDUCED_MOTION_KEY)))
 
         self._month_view.day_selected.connect(self._week_view.show_week_for_date)
         self._month_view.event_edit_requested.connect(self._edit_event)
         self._week_view.event_edit_requested.connect(self._edit_event)
+        self._agenda_view.event_edit_requested.connect(self._edit_event)
+        self._month_view.event_drop_requested.connect(self._move_event)
+        self._week_view.event_drop_requested.connect(self._move_event)
+        self._year_view.day_selected.connect(self._open_day_from_year)
         self._week_view.week_changed.connect(self._month_view.select_date)
 
         self._month_view.select_date(date.today())
         self._week_view.show_week_for_date(date.today())
-        self._play_fade_in()
+        self._update_history_buttons()
+
+        if settings is not None:
+            folder = settings.get(WATCHED_FOLDER_KEY)
+            if isinstance(folder, str) and Path(folder).is_dir():
+                self._set_watched_folder(folder)
+            caldav_url = settings.get(CALDAV_URL_KEY)
+            if isinstance(caldav_url, str) and caldav_url:
+                self._connect_caldav(caldav_url)
+            if settings.get(QUERY_SERVICE_KEY):
+                self._set_query_service(True)
 
     def _build_toolbar(self) -> QFrame:
         frame = QFrame()
@@ -101,7 +203,7 @@ class CalendarView(QWidget):
         segment_layout.setContentsMargins(4, 4, 4, 4)
         segment_layout.setSpacing(4)
 
-        for index, label in enumerate(["Miesiąc", "Tydzień"]):
+        for index, label in enumerate(["Miesiąc", "Tydzień", "Agenda", "Rok"]):
             button = QToolButton()
             button.setObjectName("calendarSegmentButton")
             button.setText(label)
@@ -116,18 +218,69 @@ class CalendarView(QWidget):
         self._segment_buttons[0].setChecked(True)
 
         layout.addWidget(self._segment_frame)
-        layout.addStretch(1)
+
+        self._quick_add_edit = QLineEdit()
+        self._quick_add_edit.setObjectName("calendarQuickAdd")
+        self._quick_add_edit.setPlaceholderText("Szybkie dodawanie, np. „jutro 14:00-15:30 Analiza”")
+        self._quick_add_edit.setToolTip(
+            "Dzień (dziś, jutro, nazwa dnia tygodnia, 24.10), godziny (14-15:30, o 9) "
+            "i tytuł; opcjonalnie kolor, np. #zielony. Enter dodaje wydarzenie."
+        )
+        self._quick_add_edit.setClearButtonEnabled(True)
+        self._quick_add_edit.setMinimumWidth(220)
+        self._quick_add_edit.returnPressed.connect(self._quick_add)
+        layout.addWidget(self._quick_add_edit, 1)
+
+        self._undo_button = QPushButton("Cofnij")
+        self._undo_button.setObjectName("calendarActionSecondary")
+        self._undo_button.setCursor(Qt.CursorShape.PointingHandCursor)
+        self._undo_button.clicked.connect(self._undo)
+
+        self._redo_button = QPushButton("Ponów")
+        self._redo_button.setObjectName("calendarActionSecondary")
+        self._redo_button.setCursor(Qt.CursorShape.PointingHandCursor)
+        self._redo_button.clicked.connect(self._redo)
+
+        for sequence, handler in ((QKeySequence.StandardKey.Undo, self._undo), (QKeySequence.StandardKey.Redo, self._redo)):
+            shortcut = QShortcut(QKeySequence(sequence), self)
+            shortcut.setContext(Qt.ShortcutContext.WidgetWithChildrenShortcut)
+            shortcut.activated.connect(handler)
+
+        self._layers_button = QToolButton()
+        self._layers_button.setObjectName("calendarLayersButton")
+        self._layers_button.setText("Kalendarze")
+        self._layers_button.setCursor(Qt.CursorShape.PointingHandCursor)
+        self._layers_button.setPopupMode(QToolButton.ToolButtonPopupMode.InstantPopup)
+        self._layers_menu = QMenu(self._layers_button)
+        self._layers_menu.aboutToShow.connect(self._populate_layers_menu)
+        self._layers_button.setMenu(self._layers_menu)
+
+        layout.addWidget(self._layers_button)
+        layout.addWidget(self._undo_button)
+        layout.addWidget(self._redo_button)
 
         self._import_button = QPushButton("Importuj kalendarz")
         self._import_button.setObjectName("calendarActionSecondary")
         self._import_button.setCursor(Qt.CursorShape.PointingHandCursor)
         self._import_button.clicked.connect(self._import_ics)
 
+        self._folder_button = QPushButton("Obserwuj folder")
+        self._folder_button.setObjectName("calendarActionSecondary")
+        self._folder_button.setCursor(Qt.CursorShape.PointingHandCursor)
+        self._folder_button.clicked.connect(self._choose_watched_folder)
+
+        self._planner_button = QPushButton("Planer nauki")
+        self._planner_button.setObjectName("calendarActionSecondary")
+        self._planner_button.setCursor(Qt.CursorShape.PointingHandCursor)
+        self._planner_button.clicked.connect(self._open_planner)
+
         self._add_button = QPushButton("Dodaj wydarzenie")
         self._add_button.setObjectName("calendarActionPrimary")
         self._add_button.setCursor(Qt.CursorShape.PointingHandCursor)
         self._add_button.clicked.connect(self._add_event)
 
+        layout.addWidget(self._planner_button)
+        layout.addWidget(self._folder_button)
         layout.addWidget(self._import_button)
         layout.addWidget(self._add_button)
         return frame
@@ -142,10 +295,57 @@ class CalendarView(QWidget):
             target_button.setChecked(True)
             self._segment_group.blockSignals(False)
 
-        self._view_stack.setCurrentIndex(index)
-        self._play_fade_in()
+        self._transition.set_current_index(index)
+
+    def _open_day_from_year(self, day: date) -> None:
+        self._month_view.select_date(day)
+        self._week_view.show_week_for_date(day)
+        self._switch_view(1)
+
+    def _populate_layers_menu(self) -> None:
+        self._layers_menu.clear()
+        for info in self._store.calendars():
+            action = self._layers_menu.addAction(create_color_icon(COLOR_KEYS.get(info.color_key, "#3A7AFE")), info.name)
+            action.setCheckable(True)
+            action.setChecked(info.visible)
+            action.toggled.connect(lambda checked, calendar_id=info.id: self._set_layer_visible(calendar_id, checked))
+        self._layers_menu.addSeparator()
+        self._layers_menu.addAction("Serwer CalDAV…", self._configure_caldav)
+        if self._caldav.url:
+            self._layers_menu.addAction("Synchronizuj teraz", self._caldav.sync_now)
+        service_action = self._layers_menu.addAction("Lokalna usługa zapytań (JSON)")
+        service_action.setCheckable(True)
+        service_action.setChecked(self._query_service.running)
+        service_action.toggled.connect(self._set_query_service)
+        if self._query_service.running:
+            self._layers_menu.addAction(f"Adres: {self._query_service.address}").setEnabled(False)
+
+        # Domyślne przypomnienia; wydarzenia z własnymi VALARM zachowują swoje.
+        reminders_menu = self._layers_menu.addMenu("Przypomnienia")
+        active = set(self._reminders.offsets)
+        for minutes in OFFSET_PRESETS:
+            label = "W chwili rozpoczęcia" if minutes == 0 else f"{format_offset(minutes)} przed"
+            action = reminders_menu.addAction(label)
+            action.setCheckable(True)
+            action.setChecked(minutes in active)
+            action.toggled.connect(lambda checked, value=minutes: self._set_reminder_offset(value, checked))
+
+        self._layers_menu.addAction(f"Strefa czasowa: {_timezone_name(self._store.display_tz)}…", self._choose_timezone)
+
+        motion_action = self._layers_menu.addAction("Ogranicz animacje")
+        motion_action.setCheckable(True)
+        motion_action.setChecked(self._transition.reduced_motion)
+        motion_action.toggled.connect(self._set_reduced_motion)
+
+    def _set_layer_visible(self, calendar_id: str, visible: bool) -> None:
+        # Przełączenie warstwy zmienia tylko maskę widoczności w magazynie.
+        self._store.set_calendar_visible(calendar_id, visible)
+        self.refresh_views()
+        self.calendar_updated.emit()
 
     def _import_ics(self) -> None:
+        if self._import_task is not None:
+            return
         path, _ = QFileDialog.getOpenFileName(
             self,
             "Importuj wydarzenia",
@@ -154,8 +354,26 @@ class CalendarView(QWidget):
         )
         if not path:
             return
+
+        # Plik parsujemy w tle (albo bierzemy z pamięci podręcznej, gdy treść się
+        # nie zmieniła); do magazynu w wątku GUI trafiają gotowe rekordy.
+        cache = self._ics_cache
+        task = BackgroundTask(lambda _task: cache.parse_file(path))
+        task.succeeded.connect(lambda records: self._finish_import(path, records))
+        task.failed.connect(lambda message: QMessageBox.warning(self, "Import nieudany", message))
+        task.done.connect(self._import_finished)
+        self._import_task = task
+        self._import_button.setEnabled(False)
+        task.start(self)
+
+    def _import_finished(self) -> None:
+        self._import_task = None
+        self._import_button.setEnabled(True)
+
+    def _finish_import(self, path: str, records: List[IcsRecord]) -> None:
         try:
-            imported = self._store.import_ics(path)
+            target = self._store.calendar_for_file(path)
+            imported = self._store.import_records(records, target.id, f"Import {Path(path).name}")
         except Exception as exc:  # noqa: BLE001
             QMessageBox.warning(self, "Import nieudany", str(exc))
             return
@@ -175,8 +393,170 @@ class CalendarView(QWidget):
                 "Nie znaleziono wydarzeń do importu w wybranym pliku.",
             )
 
+    def _choose_watched_folder(self) -> None:
+        current = self._folder_watcher.directory
+        if current is not None:
+            box = QMessageBox(self)
+            box.setWindowTitle("Obserwowany folder")
+            box.setText(f"Obserwowany folder:\n{current}")
+            change = box.addButton("Zmień folder", QMessageBox.ButtonRole.AcceptRole)
+            stop = box.addButton("Przestań obserwować", QMessageBox.ButtonRole.DestructiveRole)
+            box.addButton("Anuluj", QMessageBox.ButtonRole.RejectRole)
+            box.exec()
+            if box.clickedButton() is stop:
+                self._set_watched_folder(None)
+                return
+            if box.clickedButton() is not change:
+                return
+
+        folder = QFileDialog.getExistingDirectory(
+            self, "Wybierz folder z plikami .ics", str(current or "")
+        )
+        if folder:
+            self._set_watched_folder(folder)
+
+    def _set_watched_folder(self, folder: Optional[str]) -> None:
+        self._folder_watcher.set_directory(folder)
+        self._folder_button.setToolTip(folder or "")
+        if self._settings is not None:
+            self._settings.set(WATCHED_FOLDER_KEY, folder)
+
+    def _on_folder_synced(self) -> None:
+        self.refresh_views()
+        self.calendar_updated.emit()
+
+    def _on_folder_failed(self, message: str) -> None:
+        QMessageBox.warning(self, "Synchronizacja folderu", message)
+
+    def _configure_caldav(self) -> None:
+        url, accepted = QInputDialog.getText(
+            self,
+            "Serwer CalDAV",
+            "Adres kolekcji kalendarza (pusty, aby rozłączyć):",
+            QLineEdit.EchoMode.Normal,
+            self._caldav.url,
+        )
+        if not accepted:
+            return
+        url = url.strip()
+        if not url:
+            self._caldav.disconnect_from()
+        elif not self._connect_caldav(url):
+            return
+        if self._settings is not None:
+            self._settings.set(CALDAV_URL_KEY, url or None)
+
+    def _connect_caldav(self, url: str) -> bool:
+        try:
+            self._caldav.connect_to(url)
+        except ValueError as exc:
+            QMessageBox.warning(self, "Serwer CalDAV", str(exc))
+            return False
+        self._caldav_error_shown = False
+        return True
+
+    def _on_caldav_synced(self) -> None:
+        self._caldav_error_shown = False
+        self._on_folder_synced()
+
+    def _on_caldav_failed(self, message: str) -> None:
+        # Przy braku sieci odpytywanie powtarza błąd co minutę – pokazujemy go raz.
+        if self._caldav_error_shown:
+            return
+        self._caldav_error_shown = True
+        QMessageBox.warning(self, "Synchronizacja CalDAV", message)
+
+    def _set_query_service(self, enabled: bool) -> None:
+        if not enabled:
+            self._query_service.stop()
+        else:
+            try:
+                self._query_service.start()
+            except OSError as exc:
+                QMessageBox.warning(self, "Usługa zapytań", f"Nie udało się uruchomić usługi: {exc}")
+                enabled = False
+        if self._settings is not None:
+            self._settings.set(QUERY_SERVICE_KEY, True if enabled else None)
+
+    def _set_reminder_offset(self, minutes: int, enabled: bool) -> None:
+        offsets = set(self._reminders.offsets)
+        if enabled:
+            offsets.add(minutes)
+        else:
+            offsets.discard(minutes)
+        self._reminders.set_offsets(offsets)
+        if self._settings is not None:
+            self._settings.set(REMINDER_OFFSETS_KEY, sorted(offsets))
+
+    def _show_reminder(self, title: str, message: str) -> None:
+        """Okno przypomnień bez blokowania pracy; kolejne przypomnienia dopisuje do otwartego."""
+        text = f"{title}\n{message}"
+        box = self._reminder_box
+        if box is None:
+            box = self._reminder_box = QMessageBox(QMessageBox.Icon.Information, "Przypomnienie", "", parent=self)
+            box.setWindowModality(Qt.WindowModality.NonModal)
+        if box.isVisible():
+            text = f"{box.text()}\n\n{text}"
+        box.setText(text)
+        box.show()
+        box.raise_()
+
+    def _choose_timezone(self) -> None:
+        current = _timezone_name(self._store.display_tz)
+        zones = list(dict.fromkeys([current, *TIMEZONE_PRESETS]))
+        name, accepted = QInputDialog.getItem(
+            self, "Strefa czasowa", "Dni w kalendarzu liczone w strefie (nazwa IANA):", zones, 0, True
+        )
+        name = name.strip()
+        if not accepted or not name or name == current:
+            return
+        try:
+            self._store.set_display_timezone(name)
+        except ValueError as exc:
+            QMessageBox.warning(self, "Strefa czasowa", str(exc))
+            return
+        if self._settings is not None:
+            self._settings.set(DISPLAY_TIMEZONE_KEY, name)
+        self.refresh_views()
+        self.calendar_updated.emit()
+
+    def _set_reduced_motion(self, enabled: bool) -> None:
+        self._transition.set_reduced_motion(enabled)
+        if self._settings is not None:
+            self._settings.set(REDUCED_MOTION_KEY, True if enabled else None)
+
+    def _open_planner(self) -> None:
+        if self._planner is None:
+            self._planner = StudyPlanner(self._store, path=planner_path())
+        dialog = PlannerDialog(self._planner, self)
+        dialog.plan_changed.connect(self._on_folder_synced)
+        dialog.exec()
+
+    def _on_store_changed(self) -> None:
+        # Nowe lub przesunięte zajęcia mogły nałożyć się na sesje nauki.
+        if self._planner is not None and self._planner.has_invalid_sessions:
+            self._replan_timer.start()
+
+    def _replan(self) -> None:
+        if self._planner is None:
+            return
+        result = self._planner.replan()
+        if result.created or result.removed:
+            self.refresh_views()
+            self.calendar_updated.emit()
+
+    def _event_dialog_for(self, event: Optional[Event]) -> EventDialog:
+        # Okno wydarzenia jest budowane raz i tylko przeładowywane przy kolejnych otwarciach.
+        if self._event_dialog is None:
+            self._event_dialog = EventDialog(
+                parent=self, event=event, calendars=self._store.calendars(), now=self._store.now()
+            )
+        else:
+            self._event_dialog.load(event, self._store.calendars(), self._store.now())
+        return self._event_dialog
+
     def _add_event(self) -> None:
-        dialog = EventDialog(parent=self)
+        dialog = self._event_dialog_for(None)
         if dialog.exec() != QDialog.DialogCode.Accepted:
             return
 
@@ -190,12 +570,30 @@ class CalendarView(QWidget):
         self.refresh_views()
         self.calendar_updated.emit()
 
+    def _quick_add(self) -> None:
+        text = self._quick_add_edit.text().strip()
+        if not text:
+            return
+        try:
+            parsed = parse_quick_event(text, today=self._store.now().date())
+            self._store.add_event(parsed.title, parsed.start, parsed.end, parsed.color_key)
+        except ValueError as exc:
+            # Błąd pokazujemy przy polu, bez okna dialogowego – tekst zostaje do poprawienia.
+            edit = self._quick_add_edit
+            QToolTip.showText(edit.mapToGlobal(QPoint(0, edit.height())), str(exc), edit)
+            return
+
+        self._quick_add_edit.clear()
+        self._month_view.select_date(parsed.start.date())
+        self.refresh_views()
+        self.calendar_updated.emit()
+
     def _edit_event(self, event_id: str) -> None:
         event = self._store.get_event(event_id)
         if event is None:
             return
 
-        dialog = EventDialog(parent=self, event=event)
+        dialog = self._event_dialog_for(event)
         result = dialog.exec()
         if result != QDialog.DialogCode.Accepted:
             return
@@ -213,20 +611,68 @@ class CalendarView(QWidget):
         self.refresh_views()
         self.calendar_updated.emit()
 
+    def _move_event(self, event_id: str, start: datetime) -> None:
+        event = self._store.get_event(event_id)
+        if event is None or self._store.to_utc(start) == event.start:
+            return
+        days = self._affected_days(event_id)
+        try:
+            self._store.move_event(event_id, start)
+        except ValueError as exc:
+            QMessageBox.warning(self, "Błąd danych", str(exc))
+            return
+
+        # Przeciągnięcie zmienia tylko dni wydarzenia i jego kolizji sprzed i po przesunięciu.
+        days |= self._affected_days(event_id)
+        self._month_view.refresh_days(days)
+        self._week_view.refresh_days(days)
+        # Ukryte strony tylko oznaczają się jako nieaktualne.
+        self._agenda_view.refresh()
+        self._year_view.refresh()
+        self._update_history_buttons()
+        self.calendar_updated.emit()
+
+    def _affected_days(self, event_id: str) -> Set[date]:
+        """Dni zajmowane przez wydarzenie oraz dni początku wydarzeń z nim kolidujących."""
+        event = self._store.get_event(event_id)
+        days = {other.local_day for other in self._store.conflicts_for(event_id, include_hidden=True)}
+        day = event.local_start.date()
+        # Koniec równo o północy nie zajmuje już kolejnego dnia.
+        last_day = max(day, (event.local_end - timedelta(microseconds=1)).date())
+        while day <= last_day:
+            days.add(day)
+            day += timedelta(days=1)
+        return days
+
+    def _undo(self) -> None:
+        if self._store.undo() is not None:
+            self.refresh_views()
+            self.calendar_updated.emit()
+
+    def _redo(self) -> None:
+        if self._store.redo() is not None:
+            self.refresh_views()
+            self.calendar_updated.emit()
+
+    def _update_history_buttons(self) -> None:
+        undo_label = self._store.undo_label()
+        redo_label = self._store.redo_label()
+        self._undo_button.setEnabled(undo_label is not None)
+        self._redo_button.setEnabled(redo_label is not None)
+        self._undo_button.setToolTip(f"Cofnij: {undo_label}" if undo_label else "")
+        self._redo_button.setToolTip(f"Ponów: {redo_label}" if redo_label else "")
+
     def refresh_views(self) -> None:
         self._month_view.refresh()
         self._week_view.refresh()
-
-    def _play_fade_in(self) -> None:
-        self._fade_anim.stop()
-        self._stack_effect.setOpacity(0.0)
-        self._fade_anim.setStartValue(0.0)
-        self._fade_anim.setEndValue(1.0)
-        self._fade_anim.start()
+        self._agenda_view.refresh()
+        self._year_view.refresh()
+        self._update_history_buttons()
 
 
 class MonthlyCalendarPage(QWidget):
     event_edit_requested = pyqtSignal(str)
+    event_drop_requested = pyqtSignal(str, datetime)
     day_selected = pyqtSignal(date)
 
     def __init__(self, store: CalendarStore, parent: QWidget | None = None) -> None:
@@ -246,6 +692,7 @@ class MonthlyCalendarPage(QWidget):
 
         self._calendar = EventCalendarWidget(store)
         self._calendar.selectionChanged.connect(self._on_selection_changed)
+        self._calendar.event_dropped.connect(self._on_event_dropped)
         layout.addWidget(self._calendar, stretch=3)
 
         self._side_panel = QFrame()
@@ -258,7 +705,7 @@ class MonthlyCalendarPage(QWidget):
         self._panel_title.setObjectName("panelTitle")
         side_layout.addWidget(self._panel_title)
 
-        self._events_list = QListWidget()
+        self._events_list = _EventListWidget()
         self._events_list.itemDoubleClicked.connect(self._emit_event_edit)
         side_layout.addWidget(self._events_list)
 
@@ -279,6 +726,14 @@ class MonthlyCalendarPage(QWidget):
         self._calendar.updateCells()
         self._populate_events(self._selected_day)
 
+    def refresh_days(self, days: Iterable[date]) -> None:
+        """Przerysowuje tylko komórki podanych dni (i panel, jeśli pokazuje jeden z nich)."""
+        days = set(days)
+        for day in days:
+            self._calendar.updateCell(QDate(day.year, day.month, day.day))
+        if self._selected_day in days:
+            self._populate_events(self._selected_day)
+
     def _on_selection_changed(self) -> None:
         qdate = self._calendar.selectedDate()
         self._selected_day = qdate.toPyDate()
@@ -301,6 +756,8 @@ class MonthlyCalendarPage(QWidget):
             item = QListWidgetItem(_format_event_label(event))
             item.setData(Qt.ItemDataRole.UserRole, event.id)
             item.setIcon(create_color_icon(COLOR_KEYS.get(event.color_key, "#3A7AFE")))
+            if self._store.has_conflict(event):
+                _mark_conflict(item, self._store.conflicts_for(event.id))
             self._events_list.addItem(item)
 
     def _emit_event_edit(self, item: QListWidgetItem) -> None:
@@ -308,11 +765,20 @@ class MonthlyCalendarPage(QWidget):
         if isinstance(event_id, str):
             self.event_edit_requested.emit(event_id)
 
+    def _on_event_dropped(self, event_id: str, target_day: date) -> None:
+        # Upuszczenie na dzień w siatce miesiąca zachowuje godzinę wydarzenia.
+        event = self._store.get_event(event_id)
+        if event is not None and event.local_day != target_day:
+            self.event_drop_requested.emit(event_id, datetime.combine(target_day, event.local_start.time()))
+
 
 class EventCalendarWidget(QCalendarWidget):
+    event_dropped = pyqtSignal(str, date)
+
     def __init__(self, store: CalendarStore, parent: QWidget | None = None) -> None:
         super().__init__(parent)
         self._store = store
+        self._drop_day: Optional[date] = None
         self.setGridVisible(False)
         self.setFirstDayOfWeek(Qt.DayOfWeek.Monday)
         self.setLocale(QLocale(QLocale.Language.Polish, QLocale.Country.Poland))
@@ -320,22 +786,6 @@ class EventCalendarWidget(QCalendarWidget):
         self.setHorizontalHeaderFormat(QCalendarWidget.HorizontalHeaderFormat.ShortDayNames)
         self.setMinimumWidth(520)
         self.setAttribute(Qt.WidgetAttribute.WA_StyledBackground, True)
-        self.setStyleSheet(
-            """
-            QWidget#qt_calendar_calendarview {
-                background-color: #ffffff;
-                border-radius: 14px;
-                selection-background-color: transparent;
-                alternate-background-color: #ffffff;
-            }
-            QWidget#qt_calendar_navigationbar {
-                background-color: #ffffff;
-            }
-            QWidget {
-                background-color: transparent;
-            }
-            """
-        )
 
         prev_button = self.findChild(QToolButton, "qt_calendar_prevmonth")
         next_button = self.findChild(QToolButton, "qt_calendar_nextmonth")
@@ -370,17 +820,23 @@ class EventCalendarWidget(QCalendarWidget):
         self.currentPageChanged.connect(self._update_title)
         self._update_title(self.yearShown(), self.monthShown())
 
+        # Wydarzenia z panelu dnia można upuszczać na komórki siatki.
+        self._cell_view = self.findChild(QTableView, "qt_calendar_calendarview")
+        if self._cell_view is not None:
+            self._cell_view.viewport().setAcceptDrops(True)
+            self._cell_view.viewport().installEventFilter(self)
+
     def paintCell(self, painter: QPainter, rect, date: QDate) -> None:  # type: ignore[override]
         current_month = date.month() == self.monthShown() and date.year() == self.yearShown()
 
         if not current_month:
             painter.save()
-            painter.fillRect(rect, QColor("#ffffff"))
+            painter.fillRect(rect, theme.color("surface"))
             painter.restore()
             return
 
         painter.save()
-        painter.fillRect(rect, QColor("#ffffff"))
+        painter.fillRect(rect, theme.color("surface"))
         painter.restore()
 
         is_selected = date == self.selectedDate()
@@ -394,7 +850,7 @@ class EventCalendarWidget(QCalendarWidget):
             inset = 6
             highlight_rect = rect.adjusted(inset, inset, -inset, -inset)
             painter.setPen(Qt.PenStyle.NoPen)
-            painter.setBrush(QColor("#ff3b30") if is_today else QColor("#dfe3eb"))
+            painter.setBrush(theme.color("today") if is_today else theme.color("day_highlight"))
             painter.drawRoundedRect(highlight_rect, 10, 10)
             painter.restore()
 
@@ -402,15 +858,23 @@ class EventCalendarWidget(QCalendarWidget):
         font.setPointSize(font.pointSize() + 2)
         font.setBold(is_today)
 
-        text_color = QColor("#1f2a4a")
+        text_color = theme.color("heading")
         if is_weekend:
-            text_color = QColor("#a0a5b4")
+            text_color = theme.color("muted_value")
         if is_today and not is_selected:
-            text_color = QColor("#ff3b30")
+            text_color = theme.color("today")
         if is_today and is_selected:
-            text_color = QColor("#ffffff")
+            text_color = theme.color("today_text")
         if is_selected and not is_today:
-            text_color = QColor("#1f1f24")
+            text_color = theme.color("text")
+
+        if self._drop_day is not None and date.toPyDate() == self._drop_day:
+            painter.save()
+            painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
+            painter.setBrush(Qt.BrushStyle.NoBrush)
+            painter.setPen(theme.color("indigo_value"))
+            painter.drawRoundedRect(rect.adjusted(4, 4, -4, -4), 10, 10)
+            painter.restore()
 
         painter.save()
         painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
@@ -441,8 +905,69 @@ class EventCalendarWidget(QCalendarWidget):
                 painter.setPen(Qt.PenStyle.NoPen)
                 painter.drawEllipse(QPoint(cx, center_y), dot_radius, dot_radius)
 
+            if any(self._store.has_conflict(event) for event in events):
+                # Kolizja w danym dniu: czerwony pierścień w rogu komórki.
+                marker = QPoint(rect.right() - dot_radius - 8, rect.top() + dot_radius + 8)
+                painter.setBrush(Qt.BrushStyle.NoBrush)
+                painter.setPen(theme.color("conflict"))
+                painter.drawEllipse(marker, dot_radius + 1, dot_radius + 1)
+
             painter.restore()
 
+    def date_at(self, pos: QPoint) -> Optional[date]:
+        """Dzień komórki pod punktem widoku siatki albo ``None`` (nagłówek, inny miesiąc)."""
+        if self._cell_view is None:
+            return None
+        index = self._cell_view.indexAt(pos)
+        if not index.isValid():
+            return None
+        first_row = 0 if self.horizontalHeaderFormat() == QCalendarWidget.HorizontalHeaderFormat.NoHorizontalHeader else 1
+        row = index.row() - first_row
+        if row < 0:
+            return None
+        # Jak QCalendarModel: gdy miesiąc zaczyna się w pierwszej kolumnie,
+        # siatka pokazuje jeszcze cały tydzień poprzedniego miesiąca.
+        first = date(self.yearShown(), self.monthShown(), 1)
+        leading = (first.isoweekday() - self.firstDayOfWeek().value) % 7 or 7
+        day = first + timedelta(days=7 * row + index.column() - leading)
+        if (day.year, day.month) != (first.year, first.month):
+            return None
+        return day
+
+    def eventFilter(self, watched, event):  # type: ignore[override]
+        if self._cell_view is None or watched is not self._cell_view.viewport():
+            return super().eventFilter(watched, event)
+        kind = event.type()
+        if kind in (QEvent.Type.DragEnter, QEvent.Type.DragMove):
+            day = self.date_at(event.position().toPoint()) if event.mimeData().hasFormat(EVENT_MIME_TYPE) else None
+            self._set_drop_day(day)
+            if day is None:
+                event.ignore()
+            else:
+                event.acceptProposedAction()
+            return True
+        if kind == QEvent.Type.DragLeave:
+            self._set_drop_day(None)
+            return True
+        if kind == QEvent.Type.Drop:
+            day = self._drop_day
+            self._set_drop_day(None)
+            if day is None or not event.mimeData().hasFormat(EVENT_MIME_TYPE):
+                event.ignore()
+                return True
+            event.acceptProposedAction()
+            self.event_dropped.emit(bytes(event.mimeData().data(EVENT_MIME_TYPE)).decode(), day)
+            return True
+        return super().eventFilter(watched, event)
+
+    def _set_drop_day(self, day: Optional[date]) -> None:
+        previous, self._drop_day = self._drop_day, day
+        if previous == day:
+            return
+        for changed in (previous, day):
+            if changed is not None:
+                self.updateCell(QDate(changed.year, changed.month, changed.day))
+
     def event(self, event):  # type: ignore[override]
         if event.type() in (event.Type.Enter, event.Type.HoverEnter):
             self.setCursor(Qt.CursorShape.PointingHandCursor)
@@ -465,6 +990,7 @@ class EventCalendarWidget(QCalendarWidget):
 
 class WeeklyCalendarPage(QWidget):
     event_edit_requested = pyqtSignal(str)
+    event_drop_requested = pyqtSignal(str, datetime)
     week_changed = pyqtSignal(date)
 
     def __init__(self, store: CalendarStore, parent: QWidget | None = None) -> None:
@@ -490,11 +1016,17 @@ class WeeklyCalendarPage(QWidget):
         self._next_button = QPushButton("Następny tydzień →")
         self._next_button.clicked.connect(self._go_next_week)
 
+        self._free_time_query: Optional[FreeTimeQuery] = None
+        self._free_button = QPushButton("Wolny czas")
+        self._free_button.setCheckable(True)
+        self._free_button.toggled.connect(self._toggle_free_time)
+
         self._range_label = QLabel()
         self._range_label.setObjectName("panelTitle")
 
         controls.addWidget(self._prev_button)
         controls.addWidget(self._next_button)
+        controls.addWidget(self._free_button)
         controls.addStretch(1)
         controls.addWidget(self._range_label)
 
@@ -529,8 +1061,11 @@ class WeeklyCalendarPage(QWidget):
             header.setObjectName("daySectionTitle")
             frame_layout.addWidget(header)
 
-            events_list = QListWidget()
+            events_list = _EventListWidget(accept_drops=True)
             events_list.itemDoubleClicked.connect(self._handle_item_double_click)
+            events_list.event_dropped.connect(
+                lambda event_id, item, idx=index: self._handle_event_drop(idx, event_id, item)
+            )
             frame_layout.addWidget(events_list)
 
             self._content_layout.addWidget(frame)
@@ -549,26 +1084,73 @@ class WeeklyCalendarPage(QWidget):
             f"{week_start.strftime('%d.%m.%Y')} – {week_end.strftime('%d.%m.%Y')}"
         )
 
+        free_by_day: Dict[date, List[FreeSlot]] = {}
+        if self._free_time_query is not None:
+            # Jedno zamiatanie dla całego tygodnia zamiast osobnych zapytań na dzień.
+            for slot in find_free_slots(self._store, week_start, week_end, self._free_time_query):
+                free_by_day.setdefault(slot.start.date(), []).append(slot)
+
         polish_locale = QLocale(QLocale.Language.Polish, QLocale.Country.Poland)
         for index, section in self._day_sections.items():
             day_date = week_start + timedelta(days=index)
             day_name = polish_locale.dayName(QDate(day_date.year, day_date.month, day_date.day).dayOfWeek(), QLocale.FormatType.LongFormat)
             section.header_label.setText(f"{day_name}, {day_date.strftime('%d.%m.%Y')}")
-            section.events_list.clear()
-            section.events_list.setProperty("day_date", day_date)
-
-            events = self._store.events_for_day(day_date)
-            if not events:
-                placeholder = QListWidgetItem("Brak wydarzeń")
-                placeholder.setFlags(Qt.ItemFlag.NoItemFlags)
-                section.events_list.addItem(placeholder)
+            self._populate_day(section, day_date, free_by_day.get(day_date, []))
+
+    def refresh_days(self, days: Iterable[date]) -> None:
+        """Odświeża tylko listy podanych dni, o ile należą do pokazanego tygodnia."""
+        week_start = _week_start(self._current_day)
+        for day_date in set(days):
+            index = (day_date - week_start).days
+            if not 0 <= index < 7:
                 continue
+            free_slots: List[FreeSlot] = []
+            if self._free_time_query is not None:
+                free_slots = find_free_slots(self._store, day_date, day_date, self._free_time_query)
+            self._populate_day(self._day_sections[index], day_date, free_slots)
+
+    def _populate_day(self, section: "_DaySection", day_date: date, free_slots: List[FreeSlot]) -> None:
+        section.events_list.clear()
+        section.events_list.setProperty("day_date", day_date)
 
-            for event in events:
-                item = QListWidgetItem(_format_event_label(event))
-                item.setData(Qt.ItemDataRole.UserRole, event.id)
-                item.setIcon(create_color_icon(COLOR_KEYS.get(event.color_key, "#3A7AFE")))
-                section.events_list.addItem(item)
+        events = self._store.events_for_day(day_date)
+        if not events and not free_slots:
+            placeholder = QListWidgetItem("Brak wydarzeń")
+            placeholder.setFlags(Qt.ItemFlag.NoItemFlags)
+            section.events_list.addItem(placeholder)
+            return
+
+        entries = [(event.local_start, 1, event) for event in events]
+        entries.extend((slot.start, 0, slot) for slot in free_slots)
+        entries.sort(key=lambda entry: entry[:2])
+        for _, is_event, entry in entries:
+            if not is_event:
+                section.events_list.addItem(_free_slot_item(entry))
+                continue
+            item = QListWidgetItem(_format_event_label(entry))
+            item.setData(Qt.ItemDataRole.UserRole, entry.id)
+            item.setIcon(create_color_icon(COLOR_KEYS.get(entry.color_key, "#3A7AFE")))
+            if self._store.has_conflict(entry):
+                _mark_conflict(item, self._store.conflicts_for(entry.id))
+            section.events_list.addItem(item)
+
+    def _toggle_free_time(self, enabled: bool) -> None:
+        if enabled:
+            dialog = FreeTimeDialog(self, self._free_time_query)
+            if dialog.exec() != QDialog.DialogCode.Accepted:
+                self._free_button.blockSignals(True)
+                self._free_button.setChecked(False)
+                self._free_button.blockSignals(False)
+                return
+            try:
+                self._free_time_query = dialog.get_query()
+            except ValueError as exc:
+                QMessageBox.warning(self, "Błąd danych", str(exc))
+                self._free_button.setChecked(False)
+                return
+        else:
+            self._free_time_query = None
+        self.refresh()
 
     def _go_previous_week(self) -> None:
         self._current_day -= timedelta(days=7)
@@ -585,16 +1167,36 @@ class WeeklyCalendarPage(QWidget):
         if isinstance(event_id, str):
             self.event_edit_requested.emit(event_id)
 
+    def _handle_event_drop(self, index: int, event_id: str, target: Optional[QListWidgetItem]) -> None:
+        event = self._store.get_event(event_id)
+        if event is None:
+            return
+        # Na wolnym oknie wydarzenie zaczyna się z jego początkiem; gdzie indziej w dniu
+        # zachowuje swoją godzinę.
+        slot_start = target.data(_SLOT_START_ROLE) if target is not None else None
+        if isinstance(slot_start, datetime):
+            start = slot_start
+        else:
+            day_date = _week_start(self._current_day) + timedelta(days=index)
+            start = datetime.combine(day_date, event.local_start.time())
+        self.event_drop_requested.emit(event_id, start)
+
 
 class EventDialog(QDialog):
-    def __init__(self, parent: QWidget | None = None, event: Optional[Event] = None) -> None:
+    def __init__(
+        self,
+        parent: QWidget | None = None,
+        event: Optional[Event] = None,
+        calendars: List[CalendarInfo] | None = None,
+        now: Optional[datetime] = None,
+    ) -> None:
         super().__init__(parent)
-        self.setWindowTitle("Edytuj wydarzenie" if event else "Nowe wydarzenie")
         self.delete_requested = False
         self.setObjectName("eventDialog")
         self.setMinimumWidth(440)
 
-        self._event = event
+        self._event: Optional[Event] = None
+        self._page_title_updaters: List[Callable[..., None]] = []
 
         layout = QVBoxLayout(self)
         layout.setContentsMargins(24, 24, 24, 24)
@@ -603,7 +1205,7 @@ class EventDialog(QDialog):
         form = QFormLayout()
         form.setSpacing(12)
 
-        self.title_edit = QLineEdit(event.title if event else "")
+        self.title_edit = QLineEdit()
         form.addRow("Tytuł", self.title_edit)
 
         self.start_edit = QDateTimeEdit()
@@ -621,6 +1223,9 @@ class EventDialog(QDialog):
         self.color_combo = _color_combo()
         form.addRow("Kolor", self.color_combo)
 
+        self.calendar_combo = _calendar_combo([])
+        form.addRow("Kalendarz", self.calendar_combo)
+
         self.description_edit = QTextEdit()
         self.description_edit.setPlaceholderText("Opis (opcjonalnie)")
         form.addRow("Opis", self.description_edit)
@@ -632,29 +1237,44 @@ class EventDialog(QDialog):
         )
         layout.addWidget(self._buttons)
 
-        if event is not None:
-            self._delete_button = QPushButton("Usuń")
-            self._delete_button.setObjectName("dangerButton")
-            self._delete_button.clicked.connect(self._handle_delete)
-            self._buttons.addButton(self._delete_button, QDialogButtonBox.ButtonRole.DestructiveRole)
+        self._delete_button = QPushButton("Usuń")
+        self._delete_button.setObjectName("dangerButton")
+        self._delete_button.clicked.connect(self._handle_delete)
+        self._buttons.addButton(self._delete_button, QDialogButtonBox.ButtonRole.DestructiveRole)
 
         self._buttons.accepted.connect(self.accept)
         self._buttons.rejected.connect(self.reject)
 
-        self._apply_defaults()
+        self.load(event, calendars or [], now)
+
+    def load(self, event: Optional[Event], calendars: List[CalendarInfo], now: Optional[datetime] = None) -> None:
+        """Przygotowuje okno do kolejnego użycia – widżety powstają tylko raz.
+
+        ``now`` to bieżący czas w strefie wyświetlania magazynu; od niego zaczyna
+        się nowe wydarzenie (bez niego – czas systemowy).
+        """
+        self._event = event
+        self.delete_requested = False
+        self.setWindowTitle("Edytuj wydarzenie" if event else "Nowe wydarzenie")
+        self._delete_button.setVisible(event is not None)
+        self.title_edit.setText(event.title if event else "")
+        self.title_edit.setFocus()
 
-    def _apply_defaults(self) -> None:
+        _fill_calendar_combo(self.calendar_combo, calendars)
+        self._apply_defaults(now)
+
+    def _apply_defaults(self, now: Optional[datetime] = None) -> None:
         if self._event is None:
-            current = QDateTime.currentDateTime()
+            current = QDateTime.currentDateTime() if now is None else _to_qdatetime(now)
             self.start_edit.setDateTime(current)
             self.end_edit.setDateTime(current.addSecs(3600))
+            self.description_edit.clear()
             self.color_combo.setCurrentIndex(0)
+            self.calendar_combo.setCurrentIndex(max(self.calendar_combo.findData(DEFAULT_CALENDAR_ID), 0))
             return
 
-        local_start = self._event.start.astimezone(self._event.start.tzinfo)
-        local_end = self._event.end.astimezone(self._event.end.tzinfo)
-        self.start_edit.setDateTime(_to_qdatetime(local_start))
-        self.end_edit.setDateTime(_to_qdatetime(local_end))
+        self.start_edit.setDateTime(_to_qdatetime(self._event.local_start))
+        self.end_edit.setDateTime(_to_qdatetime(self._event.local_end))
         self.description_edit.setText(self._event.description)
 
         current_index = next(
@@ -662,6 +1282,7 @@ class EventDialog(QDialog):
             0,
         )
         self.color_combo.setCurrentIndex(current_index)
+        self.calendar_combo.setCurrentIndex(max(self.calendar_combo.findData(self._event.calendar_id), 0))
 
     def _handle_delete(self) -> None:
         self.delete_requested = True
@@ -676,6 +1297,7 @@ class EventDialog(QDialog):
             "end_dt": end_dt,
             "color_key": self.color_combo.currentData(),
             "description": self.description_edit.toPlainText(),
+            "calendar_id": self.calendar_combo.currentData() or DEFAULT_CALENDAR_ID,
         }
 
     def _setup_datetime_edit(self, edit: QDateTimeEdit) -> None:
@@ -691,22 +1313,6 @@ class EventDialog(QDialog):
         calendar.setVerticalHeaderFormat(QCalendarWidget.VerticalHeaderFormat.NoVerticalHeader)
         calendar.setFirstDayOfWeek(Qt.DayOfWeek.Monday)
         calendar.setLocale(QLocale(QLocale.Language.Polish, QLocale.Country.Poland))
-        calendar.setStyleSheet(
-            """
-            QWidget#qt_calendar_calendarview {
-                background-color: #ffffff;
-                border-radius: 12px;
-                selection-background-color: transparent;
-            }
-            QWidget#qt_calendar_navigationbar {
-                background-color: #ffffff;
-                border: none;
-            }
-            QWidget {
-                background-color: transparent;
-            }
-            """
-        )
 
         try:
             prev_button = calendar.findChild(QToolButton, "qt_calendar_prevmonth")
@@ -745,6 +1351,9 @@ class EventDialog(QDialog):
                         month_name = local_locale.standaloneMonthName(m, QLocale.FormatType.LongFormat)
                         title.setText(f"{month_name.capitalize()} {y}")
 
+                    # PyQt nie trzyma silnej referencji do zagnieżdżonej funkcji podłączonej
+                    # jako slot – bez niej domknięcie znika i sygnał wywołuje zwolniony obiekt.
+                    self._page_title_updaters.append(update_label)
                     calendar.currentPageChanged.connect(update_label)
                     update_label()
         except Exception:
@@ -752,19 +1361,126 @@ class EventDialog(QDialog):
             pass
 
 
+class FreeTimeDialog(QDialog):
+    def __init__(self, parent: QWidget | None = None, query: Optional[FreeTimeQuery] = None) -> None:
+        super().__init__(parent)
+        self.setWindowTitle("Wolny czas")
+        self.setObjectName("eventDialog")
+        query = query or FreeTimeQuery()
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(24, 24, 24, 24)
+        layout.setSpacing(16)
+
+        form = QFormLayout()
+        form.setSpacing(12)
+
+        self.length_spin = QSpinBox()
+        self.length_spin.setRange(5, 12 * 60)
+        self.length_spin.setSingleStep(15)
+        self.length_spin.setSuffix(" min")
+        self.length_spin.setValue(int(query.min_length.total_seconds() // 60))
+        form.addRow("Minimalna długość", self.length_spin)
+
+        self.day_start_edit = QTimeEdit(QTime(query.day_start.hour, query.day_start.minute))
+        self.day_start_edit.setDisplayFormat("HH:mm")
+        form.addRow("Od godziny", self.day_start_edit)
+
+        self.day_end_edit = QTimeEdit(QTime(query.day_end.hour, query.day_end.minute))
+        self.day_end_edit.setDisplayFormat("HH:mm")
+        form.addRow("Do godziny", self.day_end_edit)
+
+        layout.addLayout(form)
+
+        buttons = QDialogButtonBox(
+            QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel
+        )
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+
+    def get_query(self) -> FreeTimeQuery:
+        start = self.day_start_edit.time()
+        end = self.day_end_edit.time()
+        return FreeTimeQuery(
+            min_length=timedelta(minutes=self.length_spin.value()),
+            day_start=time(start.hour(), start.minute()),
+            day_end=time(end.hour(), end.minute()),
+        )
+
+
 class _DaySection:
     def __init__(self, header_label: QLabel, events_list: QListWidget) -> None:
         self.header_label = header_label
         self.events_list = events_list
 
 
+class _EventListWidget(QListWidget):
+    """Lista wydarzeń, z której można przeciągać wydarzenia, a opcjonalnie też je upuszczać."""
+
+    # ID wydarzenia, element pod kursorem (albo ``None``).
+    event_dropped = pyqtSignal(str, object)
+
+    def __init__(self, accept_drops: bool = False, parent: QWidget | None = None) -> None:
+        super().__init__(parent)
+        self.setDragEnabled(True)
+        self.setAcceptDrops(accept_drops)
+        self.setDragDropMode(
+            QListWidget.DragDropMode.DragDrop if accept_drops else QListWidget.DragDropMode.DragOnly
+        )
+
+    def startDrag(self, supported_actions) -> None:  # type: ignore[override]
+        # Własny QDrag zamiast domyślnego: po ruchu QListWidget usuwałby element źródłowy,
+        # a listy i tak są odświeżane z magazynu.
+        item = self.currentItem()
+        event_id = item.data(Qt.ItemDataRole.UserRole) if item is not None else None
+        if not isinstance(event_id, str):
+            return
+        mime = QMimeData()
+        mime.setData(EVENT_MIME_TYPE, event_id.encode())
+        drag = QDrag(self)
+        drag.setMimeData(mime)
+        drag.setPixmap(self.viewport().grab(self.visualItemRect(item)))
+        drag.exec(Qt.DropAction.MoveAction)
+
+    def dragEnterEvent(self, event) -> None:  # type: ignore[override]
+        if event.mimeData().hasFormat(EVENT_MIME_TYPE):
+            event.acceptProposedAction()
+        else:
+            event.ignore()
+
+    def dragMoveEvent(self, event) -> None:  # type: ignore[override]
+        self.dragEnterEvent(event)
+
+    def dropEvent(self, event) -> None:  # type: ignore[override]
+        if not event.mimeData().hasFormat(EVENT_MIME_TYPE):
+            event.ignore()
+            return
+        event.acceptProposedAction()
+        event_id = bytes(event.mimeData().data(EVENT_MIME_TYPE)).decode()
+        self.event_dropped.emit(event_id, self.itemAt(event.position().toPoint()))
+
+
 def _format_event_label(event: Event) -> str:
-    start = event.start.astimezone(event.start.tzinfo)
-    end = event.end.astimezone(event.end.tzinfo)
-    time_str = f"{start.strftime('%H:%M')} – {end.strftime('%H:%M')}"
+    time_str = f"{event.local_start.strftime('%H:%M')} – {event.local_end.strftime('%H:%M')}"
     return f"{time_str}  {event.title}"
 
 
+def _mark_conflict(item: QListWidgetItem, others: List[Event]) -> None:
+    item.setText(f"⚠ {item.text()}")
+    item.setForeground(theme.color("conflict"))
+    item.setToolTip("Koliduje z: " + ", ".join(other.title for other in others))
+
+
+def _free_slot_item(slot: FreeSlot) -> QListWidgetItem:
+    item = QListWidgetItem(f"{slot.start.strftime('%H:%M')} – {slot.end.strftime('%H:%M')}  Wolny czas")
+    item.setFlags(Qt.ItemFlag.ItemIsEnabled)
+    item.setData(_SLOT_START_ROLE, slot.start)
+    item.setBackground(theme.color("free_slot_bg"))
+    item.setForeground(theme.color("free_slot_text"))
+    return item
+
+
 def create_color_icon(color_hex: str, size: int = 14) -> QIcon:
     pixmap = QPixmap(size, size)
     pixmap.fill(Qt.GlobalColor.transparent)
@@ -787,5 +1503,24 @@ def _color_combo():
     return combo
 
 
+def _calendar_combo(calendars: List[CalendarInfo]):
+    from PyQt6.QtWidgets import QComboBox
+
+    combo = QComboBox()
+    _fill_calendar_combo(combo, calendars)
+    return combo
+
+
+def _fill_calendar_combo(combo, calendars: List[CalendarInfo]) -> None:
+    combo.clear()
+    for info in calendars:
+        combo.addItem(create_color_icon(COLOR_KEYS.get(info.color_key, "#3A7AFE")), info.name, userData=info.id)
+
+
+def _timezone_name(tz) -> str:
+    # ZoneInfo ma nazwę w ``key``; zapasowe strefy (dateutil, stałe przesunięcie) tylko w ``tzname``.
+    return getattr(tz, "key", None) or str(tz.tzname(None) or tz)
+
+
 def _to_qdatetime(value: datetime) -> QDateTime:
     return QDateTime(value.year, value.month, value.day, value.hour, value.minute)
@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from PyQt6.QtCore import QObject, QSize, Qt, QUrl
+from PyQt6.QtGui import QImage, QImageReader, QPixmap, QTextDocument
+
+from core.flashcards import Card, FlashcardStore
+from core.markdown import image_sources, render_html
+from ui.workers import BackgroundTask
+
+# Domyślny budżet pamięci na zdekodowane obrazy fiszek.
+PIXMAP_BUDGET_BYTES = 64 << 20
+# Obrazy większe niż ten rozmiar skalujemy już przy dekodowaniu.
+MAX_IMAGE_SIZE = QSize(1600, 1200)
+PREFETCH_COUNT = 5
+
+
+class PixmapCache:
+    """Pamięć podręczna LRU pixmap z limitem bajtów (nie liczby elementów)."""
+
+    def __init__(self, budget_bytes: int = PIXMAP_BUDGET_BYTES) -> None:
+        self._budget = budget_bytes
+        self._used = 0
+        self._items: "OrderedDict[str, Tuple[QPixmap, int]]" = OrderedDict()
+
+    @property
+    def used_bytes(self) -> int:
+        return self._used
+
+    @property
+    def budget_bytes(self) -> int:
+        return self._budget
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._items
+
+    def keys(self) -> List[str]:
+        return list(self._items)
+
+    def get(self, key: str) -> Optional[QPixmap]:
+        entry = self._items.get(key)
+        if entry is None:
+            return None
+        self._items.move_to_end(key)
+        return entry[0]
+
+    def put(self, key: str, pixmap: QPixmap) -> None:
+        cost = pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+        if cost > self._budget:
+            return
+        previous = self._items.pop(key, None)
+        if previous is not None:
+            self._used -= previous[1]
+        self._items[key] = (pixmap, cost)
+        self._used += cost
+        while self._used > self._budget:
+            _, (_, evicted_cost) = self._items.popitem(last=False)
+            self._used -= evicted_cost
+
+
+@dataclass
+class RenderedCard:
+    front_html: str
+    back_html: str
+    images: List[str]
+
+
+class CardPrefetcher(QObject):
+    """Przygotowuje z wyprzedzeniem kolejne karty sesji powtórek.
+
+    W wątku roboczym renderujemy HTML karty i dekodujemy obrazy do ``QImage``;
+    w wątku GUI zamieniamy je na ``QPixmap`` w ograniczonej pamięci podręcznej.
+    Przy wyświetlaniu karta nie czyta już nic z dysku.
+    """
+
+    def __init__(
+        self,
+        store: FlashcardStore,
+        *,
+        budget_bytes: int = PIXMAP_BUDGET_BYTES,
+        parent: QObject | None = None,
+    ) -> None:
+        super().__init__(parent)
+        self._store = store
+        self._pixmaps = PixmapCache(budget_bytes)
+        self._rendered: "OrderedDict[str, RenderedCard]" = OrderedDict()
+        self._task: Optional[BackgroundTask] = None
+        self._queued: List[Card] = []
+
+    @property
+    def pixmaps(self) -> PixmapCache:
+        return self._pixmaps
+
+    def prefetch(self, cards: List[Card]) -> None:
+        missing = [card for card in cards if card.id not in self._rendered or not self._images_ready(card.id)]
+        if not missing:
+            return
+        if self._task is not None:
+            self._queued = missing
+            return
+        self._start(missing)
+
+    def rendered(self, card: Card) -> RenderedCard:
+        """Zwraca gotową kartę; gdy nie zdążyliśmy jej przygotować, renderuje ją od razu."""
+        rendered = self._rendered.get(card.id)
+        if rendered is None:
+            rendered = _render_card(card.front, card.back)
+            self._remember(card.id, rendered)
+        else:
+            self._rendered.move_to_end(card.id)
+        for source in rendered.images:
+            if source not in self._pixmaps:
+                image = _decode_image(self._store.media_path(source))
+                if image is not None:
+                    self._pixmaps.put(source, QPixmap.fromImage(image))
+        return rendered
+
+    def apply_resources(self, document: QTextDocument, rendered: RenderedCard) -> None:
+        """Podpina obrazy karty do dokumentu widoku.
+
+        ``setHtml`` nie usuwa zasobów, więc najpierw czyścimy dokument – inaczej
+        trzymałby obrazy wszystkich pokazanych kart, poza budżetem ``PixmapCache``.
+        """
+        document.clear()
+        for source in rendered.images:
+            pixmap = self._pixmaps.get(source)
+            if pixmap is not None:
+                document.addResource(QTextDocument.ResourceType.ImageResource.value, QUrl(source), pixmap)
+
+    def invalidate(self, card_id: str) -> None:
+        self._rendered.pop(card_id, None)
+
+    # --- pomocnicze -----------------------------------------------------
+    def _start(self, cards: List[Card]) -> None:
+        snapshot = [(card.id, card.front, card.back) for card in cards]
+        known_images = set(self._pixmaps.keys())
+        media_path = self._store.media_path
+
+        def run(task: BackgroundTask) -> None:
+            for card_id, front, back in snapshot:
+                if task.cancelled:
+                    return
+                rendered = _render_card(front, back)
+                images: Dict[str, QImage] = {}
+                for source in rendered.images:
+                    if source in known_images or source in images:
+                        continue
+                    image = _decode_image(media_path(source))
+                    if image is not None:
+                        images[source] = image
+                task.emit_chunk((card_id, rendered, images))
+
+        task = BackgroundTask(run)
+        task.chunk.connect(self._on_prepared)
+        task.done.connect(self._on_done)
+        self._task = task
+        task.start(self)
+
+    def _on_prepared(self, payload: Tuple[str, RenderedCard, Dict[str, QImage]]) -> None:
+        card_id, rendered, images = payload
+        self._remember(card_id, rendered)
+        for source, image in images.items():
+            self._pixmaps.put(source, QPixmap.fromImage(image))
+
+    def _on_done(self) -> None:
+        self._task = None
+        if self._queued:
+            queued, self._queued = self._queued, []
+            self.prefetch(queued)
+
+    def _images_ready(self, card_id: str) -> bool:
+        return all(source in self._pixmaps for source in self._rendered[card_id].images)
+
+    def _remember(self, card_id: str, rendered: RenderedCard) -> None:
+        self._rendered[card_id] = rendered
+        self._rendered.move_to_end(card_id)
+        while len(self._rendered) > PREFETCH_COUNT * 8:
+            self._rendered.popitem(last=False)
+
+
+def _render_card(front: str, back: str) -> RenderedCard:
+    return RenderedCard(
+        front_html=render_html(front),
+        back_html=render_html(back),
+        images=image_sources(front) + image_sources(back),
+    )
+
+
+def _decode_image(path: Path) -> Optional[QImage]:
+    reader = QImageReader(str(path))
+    reader.setAutoTransform(True)
+    size = reader.size()
+    if size.isValid() and (size.width() > MAX_IMAGE_SIZE.width() or size.height() > MAX_IMAGE_SIZE.height()):
+        reader.setScaledSize(size.scaled(MAX_IMAGE_SIZE, Qt.AspectRatioMode.KeepAspectRatio))
+    image = reader.read()
+    return None if image.isNull() else image
+
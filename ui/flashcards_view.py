@@ -1,23 +1,449 @@
-from PyQt6.QtCore import Qt
-from PyQt6.QtWidgets import QLabel, QVBoxLayout, QWidget
+from __future__ import annotations
+
+from dataclasses import replace
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from PyQt6.QtCore import Qt, QTimer, pyqtSignal
+from PyQt6.QtWidgets import (
+    QComboBox,
+    QDialog,
+    QDialogButtonBox,
+    QFileDialog,
+    QFormLayout,
+    QFrame,
+    QHBoxLayout,
+    QInputDialog,
+    QLabel,
+    QListWidget,
+    QListWidgetItem,
+    QMessageBox,
+    QProgressDialog,
+    QPushButton,
+    QStackedWidget,
+    QTextBrowser,
+    QTextEdit,
+    QVBoxLayout,
+    QWidget,
+)
+
+from core.flashcards import (
+    GRADE_AGAIN,
+    GRADE_EASY,
+    GRADE_GOOD,
+    GRADE_HARD,
+    Card,
+    FlashcardStore,
+    ReviewSession,
+)
+from core.flashcards_import import CardPair, ImportProgress, iter_card_batches
+from ui.flashcard_prefetch import PREFETCH_COUNT, CardPrefetcher
+from ui.workers import BackgroundTask
 
 
 class FlashcardsView(QWidget):
-    def __init__(self, parent: QWidget | None = None) -> None:
+    flashcards_updated = pyqtSignal()
+
+    def __init__(self, store: FlashcardStore, parent: QWidget | None = None) -> None:
         super().__init__(parent)
+        self._store = store
+        self._loaded = False
+        self._session: Optional[ReviewSession] = None
+        self._import_task: Optional[BackgroundTask] = None
+        # Karty z bieżącego importu, które już trafiły do magazynu.
+        self._import_added = 0
+        self._import_dialog: Optional[QProgressDialog] = None
+        self._prefetcher = CardPrefetcher(store, parent=self)
         self.setObjectName("flashcardsRoot")
+
         layout = QVBoxLayout(self)
-        layout.setContentsMargins(32, 32, 32, 32)
+        layout.setContentsMargins(0, 0, 0, 0)
         layout.setSpacing(16)
 
         title = QLabel("Fiszki")
         title.setObjectName("h1")
         layout.addWidget(title)
 
-        placeholder = QLabel("Funkcja dostępna wkrótce")
-        placeholder.setObjectName("comingSoon")
-        placeholder.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        placeholder.setEnabled(False)
-        layout.addWidget(placeholder, alignment=Qt.AlignmentFlag.AlignCenter)
+        self._pages = QStackedWidget()
+        self._pages.addWidget(self._build_decks_page())
+        self._pages.addWidget(self._build_review_page())
+        layout.addWidget(self._pages, stretch=1)
+
+        # Stan talii zapisujemy z opóźnieniem, żeby seria ocen dała jeden zapis.
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(3000)
+        self._save_timer.timeout.connect(self._save)
+
+    # --- budowa widoku -----------------------------------------------------
+    def _build_decks_page(self) -> QWidget:
+        page = QWidget()
+        layout = QVBoxLayout(page)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(16)
+
+        toolbar = QFrame()
+        toolbar.setObjectName("flashcardsToolbar")
+        toolbar_layout = QHBoxLayout(toolbar)
+        toolbar_layout.setContentsMargins(20, 16, 20, 16)
+        toolbar_layout.setSpacing(12)
+
+        self._summary_label = QLabel()
+        self._summary_label.setObjectName("subtitle")
+        toolbar_layout.addWidget(self._summary_label)
+        toolbar_layout.addStretch(1)
+
+        self._new_deck_button = QPushButton("Nowa talia")
+        self._new_deck_button.setObjectName("calendarActionSecondary")
+        self._new_deck_button.setCursor(Qt.CursorShape.PointingHandCursor)
+        self._new_deck_button.clicked.connect(self._create_deck)
+
+        self._import_button = QPushButton("Importuj talię")
+        self._import_button.setObjectName("calendarActionSecondary")
+        self._import_button.setCursor(Qt.CursorShape.PointingHandCursor)
+        self._import_button.clicked.connect(self._import_deck)
+
+        self._add_card_button = QPushButton("Dodaj fiszkę")
+        self._add_card_button.setObjectName("calendarActionSecondary")
+        self._add_card_button.setCursor(Qt.CursorShape.PointingHandCursor)
+        self._add_card_button.clicked.connect(self._add_card)
+
+        self._study_button = QPushButton("Rozpocznij powtórkę")
+        self._study_button.setObjectName("calendarActionPrimary")
+        self._study_button.setCursor(Qt.CursorShape.PointingHandCursor)
+        self._study_button.clicked.connect(self._start_session)
+
+        toolbar_layout.addWidget(self._import_button)
+        toolbar_layout.addWidget(self._new_deck_button)
+        toolbar_layout.addWidget(self._add_card_button)
+        toolbar_layout.addWidget(self._study_button)
+        layout.addWidget(toolbar)
+
+        panel = QFrame()
+        panel.setObjectName("dayPanel")
+        panel_layout = QVBoxLayout(panel)
+        panel_layout.setContentsMargins(16, 16, 16, 16)
+        panel_layout.setSpacing(12)
+
+        panel_title = QLabel("Talie")
+        panel_title.setObjectName("panelTitle")
+        panel_layout.addWidget(panel_title)
+
+        self._deck_list = QListWidget()
+        self._deck_list.itemDoubleClicked.connect(lambda _: self._start_session())
+        panel_layout.addWidget(self._deck_list)
+
+        layout.addWidget(panel, stretch=1)
+        return page
+
+    def _build_review_page(self) -> QWidget:
+        page = QFrame()
+        page.setObjectName("reviewCard")
+        layout = QVBoxLayout(page)
+        layout.setContentsMargins(32, 32, 32, 32)
+        layout.setSpacing(20)
+
+        self._progress_label = QLabel()
+        self._progress_label.setObjectName("cardTitle")
+        layout.addWidget(self._progress_label)
+
+        self._front_view = QTextBrowser()
+        self._front_view.setObjectName("reviewFront")
+        self._front_view.setOpenExternalLinks(True)
+        layout.addWidget(self._front_view, stretch=1)
+
+        self._back_view = QTextBrowser()
+        self._back_view.setObjectName("reviewBack")
+        self._back_view.setOpenExternalLinks(True)
+        layout.addWidget(self._back_view, stretch=1)
+
+        self._show_answer_button = QPushButton("Pokaż odpowiedź")
+        self._show_answer_button.setObjectName("calendarActionPrimary")
+        self._show_answer_button.setCursor(Qt.CursorShape.PointingHandCursor)
+        self._show_answer_button.clicked.connect(self._reveal_answer)
+        layout.addWidget(self._show_answer_button, alignment=Qt.AlignmentFlag.AlignHCenter)
+
+        grades = QHBoxLayout()
+        grades.setSpacing(12)
+        self._grade_buttons: Dict[int, QPushButton] = {}
+        for grade, label in (
+            (GRADE_AGAIN, "Nie pamiętam"),
+            (GRADE_HARD, "Trudne"),
+            (GRADE_GOOD, "Dobrze"),
+            (GRADE_EASY, "Łatwe"),
+        ):
+            button = QPushButton(label)
+            button.setObjectName("calendarActionSecondary")
+            button.setCursor(Qt.CursorShape.PointingHandCursor)
+            button.clicked.connect(lambda _, value=grade: self._answer(value))
+            grades.addWidget(button)
+            self._grade_buttons[grade] = button
+        layout.addLayout(grades)
+
+        finish_button = QPushButton("Zakończ powtórkę")
+        finish_button.setObjectName("sidebarButton")
+        finish_button.setCursor(Qt.CursorShape.PointingHandCursor)
+        finish_button.clicked.connect(self._finish_session)
+        layout.addWidget(finish_button, alignment=Qt.AlignmentFlag.AlignRight)
+        return page
+
+    # --- talie ---------------------------------------------------------------
+    def showEvent(self, event) -> None:  # type: ignore[override]
+        super().showEvent(event)
+        if not self._loaded:
+            # Talie wczytujemy dopiero przy pierwszym wejściu do modułu.
+            self._store.load()
+            self._loaded = True
+            self.refresh()
+
+    def hideEvent(self, event) -> None:  # type: ignore[override]
+        super().hideEvent(event)
+        self._save()
+
+    def refresh(self) -> None:
+        current = self._selected_deck()
+        self._deck_list.clear()
+        for deck in self._store.decks():
+            due = self._store.count_due(deck)
+            item = QListWidgetItem(f"{deck}  ·  do powtórki: {due}  ·  kart: {self._store.deck_size(deck)}")
+            item.setData(Qt.ItemDataRole.UserRole, deck)
+            self._deck_list.addItem(item)
+            if deck == current:
+                self._deck_list.setCurrentItem(item)
+        if self._deck_list.currentItem() is None and self._deck_list.count():
+            self._deck_list.setCurrentRow(0)
+        self._summary_label.setText(
+            f"Do powtórki dziś: {self._store.count_due()} z {len(self._store)} kart"
+        )
+
+    def _selected_deck(self) -> Optional[str]:
+        item = self._deck_list.currentItem()
+        if item is None:
+            return None
+        deck = item.data(Qt.ItemDataRole.UserRole)
+        return deck if isinstance(deck, str) else None
+
+    def _create_deck(self) -> None:
+        name, accepted = QInputDialog.getText(self, "Nowa talia", "Nazwa talii")
+        if not accepted or not name.strip():
+            return
+        self._store.create_deck(name)
+        self._schedule_save()
+        self.refresh()
+
+    def _add_card(self) -> None:
+        if not self._store.decks():
+            self._store.create_deck("Moja talia")
+        dialog = CardDialog(self._store.decks(), self._selected_deck(), parent=self)
+        if dialog.exec() != QDialog.DialogCode.Accepted:
+            return
+        deck, front, back = dialog.get_data()
+        try:
+            self._store.add_card(deck, front, back)
+        except ValueError as exc:
+            QMessageBox.warning(self, "Błąd danych", str(exc))
+            return
+        self._schedule_save()
+        self.refresh()
+        self.flashcards_updated.emit()
+
+    # --- import --------------------------------------------------------------
+    def _import_deck(self) -> None:
+        if self._import_task is not None:
+            return
+        path, _ = QFileDialog.getOpenFileName(
+            self,
+            "Importuj talię",
+            "",
+            "Talie CSV/TSV (*.csv *.tsv *.txt)",
+        )
+        if not path:
+            return
+        deck, accepted = QInputDialog.getText(self, "Importuj talię", "Nazwa talii", text=Path(path).stem)
+        if not accepted or not deck.strip():
+            return
+        self.start_import(path, deck)
+
+    def start_import(self, path: str | Path, deck: str) -> BackgroundTask:
+        deck = self._store.create_deck(deck)
+        known = self._store.card_digests(deck)
+        file_path = Path(path)
+
+        def run(task: BackgroundTask) -> ImportProgress:
+            progress = ImportProgress(total_bytes=file_path.stat().st_size)
+            for batch in iter_card_batches(file_path, known=known, progress=progress, should_stop=lambda: task.cancelled):
+                task.emit_chunk(batch)
+                task.report(replace(progress))
+            return progress
+
+        dialog = QProgressDialog("Importowanie fiszek…", "Anuluj", 0, 1000, self)
+        dialog.setWindowTitle("Import talii")
+        dialog.setMinimumDuration(300)
+        dialog.setAutoClose(False)
+        dialog.setAutoReset(False)
+
+        def add_batch(batch: List[CardPair]) -> None:
+            try:
+                self._import_added += self._store.add_cards(deck, batch)
+            finally:
+                task.chunk_consumed()
+
+        # Wątek czytający wyprzedza GUI najwyżej o dwie paczki.
+        task = BackgroundTask(run, max_pending_chunks=2)
+        task.chunk.connect(add_batch)
+        task.progress.connect(self._on_import_progress)
+        task.succeeded.connect(self._on_import_finished)
+        task.failed.connect(lambda message: QMessageBox.warning(self, "Import nieudany", message))
+        task.done.connect(self._cleanup_import)
+        dialog.canceled.connect(task.cancel)
+
+        self._import_task = task
+        self._import_dialog = dialog
+        self._import_added = 0
+        self._import_button.setEnabled(False)
+        task.start(self)
+        return task
+
+    def _on_import_progress(self, progress: ImportProgress) -> None:
+        if self._import_dialog is not None:
+            self._import_dialog.setValue(int(progress.fraction * 1000))
+            self._import_dialog.setLabelText(f"Zaimportowano {progress.imported} fiszek…")
+
+    def _on_import_finished(self, progress: ImportProgress) -> None:
+        self._schedule_save()
+        self.refresh()
+        self.flashcards_updated.emit()
+        if self._import_task is not None and self._import_task.cancelled:
+            QMessageBox.information(
+                self,
+                "Import przerwany",
+                f"Import przerwano. Dodano już {self._import_added} fiszek, pominięto duplikatów: {progress.duplicates}.",
+            )
+            return
+        QMessageBox.information(
+            self,
+            "Import zakończony",
+            f"Zaimportowano {self._import_added} fiszek, pominięto duplikatów: {progress.duplicates}.",
+        )
+
+    def _cleanup_import(self) -> None:
+        if self._import_dialog is not None:
+            self._import_dialog.close()
+            self._import_dialog.deleteLater()
+        self._import_dialog = None
+        self._import_task = None
+        self._import_button.setEnabled(True)
+
+    # --- powtórka -------------------------------------------------------------
+    def _start_session(self) -> None:
+        self._session = ReviewSession(self._store, self._selected_deck())
+        card = self._session.next_card()
+        if card is None:
+            QMessageBox.information(self, "Brak kart", "Nie ma kart do powtórki w tej chwili.")
+            self._session = None
+            return
+        self._pages.setCurrentIndex(1)
+        self._show_card(card)
+
+    def _show_card(self, card: Card) -> None:
+        assert self._session is not None
+        self._progress_label.setText(
+            f"Powtórzone: {self._session.reviewed}  ·  pozostało: {self._session.remaining()}"
+        )
+        rendered = self._prefetcher.rendered(card)
+        for view, html in ((self._front_view, rendered.front_html), (self._back_view, rendered.back_html)):
+            self._prefetcher.apply_resources(view.document(), rendered)
+            view.setHtml(html)
+        self._back_view.hide()
+        self._show_answer_button.show()
+        for button in self._grade_buttons.values():
+            button.setEnabled(False)
+        # Kolejne karty przygotowujemy w tle, zanim użytkownik oceni bieżącą.
+        self._prefetcher.prefetch(self._session.upcoming(PREFETCH_COUNT + 1))
+
+    def _reveal_answer(self) -> None:
+        self._back_view.show()
+        self._show_answer_button.hide()
+        for button in self._grade_buttons.values():
+            button.setEnabled(True)
+
+    def _answer(self, grade: int) -> None:
+        if self._session is None:
+            return
+        card = self._session.answer(grade)
+        self._schedule_save()
+        if card is None:
+            reviewed = self._session.reviewed
+            self._finish_session()
+            QMessageBox.information(self, "Koniec powtórki", f"Powtórzono {reviewed} kart.")
+            return
+        self._show_card(card)
+
+    def _finish_session(self) -> None:
+        self._session = None
+        self._pages.setCurrentIndex(0)
+        self.refresh()
+        self.flashcards_updated.emit()
+
+    def _schedule_save(self) -> None:
+        self._save_timer.start()
+
+    def _save(self) -> None:
+        self._save_timer.stop()
+        if not self._store.has_unsaved_changes:
+            return
+        try:
+            self._store.save()
+        except OSError as exc:
+            QMessageBox.warning(self, "Zapis nieudany", str(exc))
+
+
+class CardDialog(QDialog):
+    def __init__(
+        self,
+        decks: List[str],
+        current_deck: Optional[str] = None,
+        parent: QWidget | None = None,
+    ) -> None:
+        super().__init__(parent)
+        self.setWindowTitle("Nowa fiszka")
+        self.setObjectName("eventDialog")
+        self.setMinimumWidth(440)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(24, 24, 24, 24)
+        layout.setSpacing(16)
+
+        form = QFormLayout()
+        form.setSpacing(12)
+
+        self.deck_combo = QComboBox()
+        self.deck_combo.setEditable(True)
+        self.deck_combo.addItems(decks)
+        if current_deck is not None:
+            self.deck_combo.setCurrentText(current_deck)
+        form.addRow("Talia", self.deck_combo)
+
+        self.front_edit = QTextEdit()
+        self.front_edit.setPlaceholderText("Pytanie")
+        form.addRow("Przód", self.front_edit)
+
+        self.back_edit = QTextEdit()
+        self.back_edit.setPlaceholderText("Odpowiedź")
+        form.addRow("Tył", self.back_edit)
+
+        layout.addLayout(form)
+
+        buttons = QDialogButtonBox(
+            QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel
+        )
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
 
-        layout.addStretch(1)
+    def get_data(self) -> Tuple[str, str, str]:
+        return (
+            self.deck_combo.currentText(),
+            self.front_edit.toPlainText(),
+            self.back_edit.toPlainText(),
+        )
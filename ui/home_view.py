@@ -16,13 +16,14 @@ from PyQt6.QtWidgets import (
     QWidget,
 )
 
-from core.calendar import CalendarStore, COLOR_KEYS, Event, WARSAW_TZ
+from core.calendar import CalendarStore, COLOR_KEYS, Event
 
 
 class HomeView(QWidget):
     def __init__(self, store: CalendarStore, parent: QWidget | None = None) -> None:
         super().__init__(parent)
         self._store = store
+        self._stale = False
         self.setObjectName("homeRoot")
 
         layout = QVBoxLayout(self)
@@ -90,15 +91,15 @@ class HomeView(QWidget):
         modules_layout.setContentsMargins(24, 24, 24, 24)
         modules_layout.setSpacing(12)
 
-        modules_title = QLabel("Moduły w przygotowaniu")
+        modules_title = QLabel("Moduły nauki")
         modules_title.setObjectName("cardTitle")
         modules_layout.addWidget(modules_title)
 
         modules_tiles = QHBoxLayout()
         modules_tiles.setContentsMargins(0, 0, 0, 0)
         modules_tiles.setSpacing(12)
-        modules_tiles.addWidget(self._create_module_tile("Notatki", "Funkcja dostępna wkrótce", variant="notes"))
-        modules_tiles.addWidget(self._create_module_tile("Fiszki", "Funkcja dostępna wkrótce", variant="flashcards"))
+        modules_tiles.addWidget(self._create_module_tile("Notatki", "Biblioteka notatek Markdown", variant="notes"))
+        modules_tiles.addWidget(self._create_module_tile("Fiszki", "Powtórki w rytmie SM-2", variant="flashcards"))
         modules_tiles.addStretch(1)
 
         modules_layout.addLayout(modules_tiles)
@@ -148,9 +149,9 @@ class HomeView(QWidget):
         return frame
 
     def _decorate_card(self, card: QFrame, variant: str) -> None:
+        # Właściwość ustawiamy przed pierwszym polish (arkusz okna jest nakładany
+        # po zbudowaniu widoków), więc nie trzeba przeliczać stylu karty.
         card.setProperty("variant", variant)
-        card.style().unpolish(card)
-        card.style().polish(card)
 
     def _create_module_tile(self, title: str, subtitle: str, *, variant: str | None = None) -> QFrame:
         tile = QFrame()
@@ -173,35 +174,34 @@ class HomeView(QWidget):
 
         if variant:
             tile.setProperty("variant", variant)
-            tile.style().unpolish(tile)
-            tile.style().polish(tile)
         return tile
 
     def refresh(self) -> None:
-        now = datetime.now(WARSAW_TZ)
+        if not self.isVisible():
+            # Zmiany w kalendarzu (np. przeciąganie) nie przebudowują ukrytego podglądu.
+            self._stale = True
+            return
+        self._stale = False
+        now = self._store.now()
         today = now.date()
         today_events = self._store.events_for_day(today)
         week_events = self._store.events_for_week(today)
-        all_events = self._store.all_events()
 
         self.today_card.value_label.setText(str(len(today_events)))
         self.week_card.value_label.setText(str(len(week_events)))
-        self.total_card.value_label.setText(str(len(all_events)))
+        self.total_card.value_label.setText(str(len(self._store)))
 
-        upcoming_events = self._collect_upcoming_events(all_events, now)
+        upcoming_events = self._collect_upcoming_events(now)
         self._update_next_card(upcoming_events)
         self._populate_upcoming_list(upcoming_events)
 
-    def _collect_upcoming_events(self, events: List[Event], now: datetime) -> List[Event]:
-        horizon = now + timedelta(days=7)
-        upcoming: List[Event] = []
-        for event in events:
-            start_local = event.start.astimezone(WARSAW_TZ)
-            end_local = event.end.astimezone(WARSAW_TZ)
-            if end_local < now or start_local > horizon:
-                continue
-            upcoming.append(event)
-        return sorted(upcoming, key=lambda ev: ev.start)
+    def showEvent(self, event) -> None:  # type: ignore[override]
+        super().showEvent(event)
+        if self._stale:
+            self.refresh()
+
+    def _collect_upcoming_events(self, now: datetime) -> List[Event]:
+        return self._store.events_between(now, now + timedelta(days=7))
 
     def _update_next_card(self, events: List[Event]) -> None:
         description_label = getattr(self.next_card, "description_label", None)
@@ -212,8 +212,8 @@ class HomeView(QWidget):
             return
 
         next_event = events[0]
-        start_local = next_event.start.astimezone(WARSAW_TZ)
-        end_local = next_event.end.astimezone(WARSAW_TZ)
+        start_local = next_event.local_start
+        end_local = next_event.local_end
         self.next_card.value_label.setText(
             f"{start_local.strftime('%d.%m %H:%M')} – {end_local.strftime('%H:%M')}"
         )
@@ -229,8 +229,8 @@ class HomeView(QWidget):
             return
 
         for event in events[:6]:
-            start_local = event.start.astimezone(WARSAW_TZ)
-            end_local = event.end.astimezone(WARSAW_TZ)
+            start_local = event.local_start
+            end_local = event.local_end
             time_window = f"{start_local.strftime('%d.%m %H:%M')} – {end_local.strftime('%H:%M')}"
             item = QListWidgetItem(f"{time_window}  {event.title}")
             item.setData(Qt.ItemDataRole.UserRole, event.id)
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import List, Optional
+
+from PyQt6.QtCore import QFileSystemWatcher, QObject, QTimer, pyqtSignal
+
+from core.calendar import CalendarStore
+from core.ics_cache import IcsCache
+from core.ics_folder import FolderChange, IcsFolderState
+from ui.workers import BackgroundTask
+
+# Narzędzia synchronizujące zapisują pliki seriami; czekamy na koniec serii.
+DEBOUNCE_MS = 500
+
+
+class IcsFolderWatcher(QObject):
+    """Obserwuje folder z plikami .ics i na bieżąco podmienia ich wydarzenia.
+
+    Zmiany z ``QFileSystemWatcher`` są zbierane przez krótki czas, potem skan
+    metadanych wybiera pliki o innym mtime lub rozmiarze. Czytanie i parsowanie
+    odbywa się w wątku roboczym, a w wątku GUI podmieniane są tylko wydarzenia
+    kalendarzy przypisanych zmienionym plikom.
+    """
+
+    calendar_changed = pyqtSignal()
+    sync_failed = pyqtSignal(str)
+
+    def __init__(
+        self, store: CalendarStore, parent: QObject | None = None, cache: Optional[IcsCache] = None
+    ) -> None:
+        super().__init__(parent)
+        self._store = store
+        self._cache = cache
+        self._state: Optional[IcsFolderState] = None
+        self._task: Optional[BackgroundTask] = None
+        self._rescan_pending = False
+
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(self._schedule_scan)
+        self._watcher.fileChanged.connect(self._schedule_scan)
+
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(DEBOUNCE_MS)
+        self._debounce.timeout.connect(self._scan)
+
+    @property
+    def directory(self) -> Optional[Path]:
+        return self._state.directory if self._state is not None else None
+
+    def set_directory(self, directory: str | Path | None) -> None:
+        self._clear_watches()
+        if self._task is not None:
+            self._task.cancel()
+        self._state = IcsFolderState(directory, self._cache) if directory else None
+        if self._state is None:
+            return
+        self._watcher.addPath(str(self._state.directory))
+        self._scan()
+
+    def _clear_watches(self) -> None:
+        watched = self._watcher.directories() + self._watcher.files()
+        if watched:
+            self._watcher.removePaths(watched)
+
+    def _schedule_scan(self, _path: str = "") -> None:
+        self._debounce.start()
+
+    def _scan(self) -> None:
+        state = self._state
+        if state is None:
+            return
+        if self._task is not None:
+            # Poprzednia partia jeszcze się parsuje – skanujemy ponownie po jej końcu.
+            self._rescan_pending = True
+            return
+
+        changed, removed = state.scan()
+        if removed:
+            self._drop_files(removed)
+        if not changed:
+            return
+
+        task = BackgroundTask(lambda worker: state.prepare(changed, lambda: worker.cancelled))
+        task.succeeded.connect(lambda changes: self._apply(state, changes))
+        task.failed.connect(self.sync_failed)
+        task.done.connect(self._task_finished)
+        self._task = task
+        task.start(self)
+
+    def _task_finished(self) -> None:
+        self._task = None
+        if self._rescan_pending:
+            self._rescan_pending = False
+            self._scan()
+
+    def _apply(self, state: IcsFolderState, changes: List[FolderChange]) -> None:
+        if state is not self._state:
+            return
+
+        errors: List[str] = []
+        updated = False
+        for change in changes:
+            if change.signature.size < 0:
+                # Plik zniknął albo jest właśnie zapisywany – spróbujemy przy kolejnym skanie.
+                continue
+            state.mark(change.path, change.signature)
+            if change.error:
+                errors.append(f"{Path(change.path).name}: {change.error}")
+                continue
+            if change.records is None:
+                continue
+            target = self._store.calendar_for_file(change.path)
+            added, modified, dropped = self._store.replace_calendar_records(
+                target.id, change.records, f"Synchronizacja {Path(change.path).name}"
+            )
+            updated = updated or bool(added or modified or dropped)
+
+        self._watch_files(state)
+        if updated:
+            self.calendar_changed.emit()
+        if errors:
+            self.sync_failed.emit("\n".join(errors))
+
+    def _drop_files(self, paths: List[str]) -> None:
+        updated = False
+        for path in paths:
+            self._state.forget(path)
+            target = self._store.calendar_for_source(str(Path(path).resolve()))
+            if target is None:
+                continue
+            _, _, dropped = self._store.replace_calendar_records(target.id, [], f"Usunięcie {Path(path).name}")
+            updated = updated or bool(dropped)
+        if updated:
+            self.calendar_changed.emit()
+
+    def _watch_files(self, state: IcsFolderState) -> None:
+        # Zapis przez podmianę pliku (rename) zdejmuje go z obserwacji – dodajemy ponownie.
+        watched = set(self._watcher.files())
+        missing = [path for path in state.files() if path not in watched]
+        if missing:
+            self._watcher.addPaths(missing)
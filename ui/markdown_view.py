@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import math
+from bisect import bisect_right
+from collections import OrderedDict
+from functools import lru_cache
+from itertools import accumulate
+from string import Template
+from typing import List
+
+from PyQt6.QtCore import QPointF, QRectF, Qt
+from PyQt6.QtGui import QFontMetrics, QPainter, QTextDocument
+from PyQt6.QtWidgets import QAbstractScrollArea, QFrame, QWidget
+
+from core.markdown import BlockDocument, MarkdownBlock, render_block_html
+from ui import theme
+
+# Arkusz bloków; ``$nazwa`` to kolor z ``theme.THEMES``.
+BLOCK_STYLESHEET = Template(
+    """
+h1 { font-size: 22px; font-weight: 600; color: $heading; }
+h2 { font-size: 19px; font-weight: 600; color: $heading; }
+h3, h4, h5, h6 { font-size: 16px; font-weight: 600; color: $heading; }
+pre, code { font-family: 'JetBrains Mono', 'Consolas', monospace; background-color: $code_bg; }
+blockquote { color: $subtitle; }
+a { color: $link; }
+"""
+)
+
+
+@lru_cache(maxsize=None)
+def block_stylesheet(name: str) -> str:
+    return BLOCK_STYLESHEET.substitute(theme.THEMES[name])
+
+
+class MarkdownPreview(QAbstractScrollArea):
+    """Podgląd Markdown renderowany blok po bloku.
+
+    Renderujemy tylko bloki widoczne w oknie oraz margines wokół niego. Każdy blok
+    trafia do pamięci podręcznej ``QTextDocument`` kluczowanej hashem treści, więc
+    edycja przebudowuje wyłącznie bloki, których dotknęła. Wysokość bloków jeszcze
+    nierenderowanych szacujemy z liczby linii i poprawiamy po pierwszym rysowaniu.
+    """
+
+    BLOCK_SPACING = 10
+    CACHE_SIZE = 400
+    # Ile wysokości okna ponad i pod widocznym obszarem renderujemy z wyprzedzeniem.
+    RENDER_MARGIN = 1.0
+
+    def __init__(self, parent: QWidget | None = None) -> None:
+        super().__init__(parent)
+        self.setObjectName("markdownPreview")
+        self.setFrameShape(QFrame.Shape.NoFrame)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.viewport().setAutoFillBackground(False)
+
+        self._document = BlockDocument()
+        self._heights: List[int] = []
+        self._offsets: List[int] = [0]
+        self._offsets_dirty = False
+        self._cache: "OrderedDict[str, QTextDocument]" = OrderedDict()
+        self._cache_theme = theme.current_theme()
+        self._line_height = QFontMetrics(self.font()).lineSpacing()
+
+    # --- zmiany treści ----------------------------------------------------
+    def set_text(self, text: str) -> None:
+        self._document.set_text(text)
+        self._heights = [self._estimate_height(block) for block in self._document.blocks]
+        self._offsets_dirty = True
+        self.verticalScrollBar().setValue(0)
+        self._update_scrollbar()
+        self.viewport().update()
+
+    def note_change(self, position: int, removed: int, added: int) -> None:
+        self._document.note_change(position, removed, added)
+
+    @property
+    def has_pending_changes(self) -> bool:
+        return self._document.has_pending_changes
+
+    def flush(self, text: str) -> None:
+        first, removed, inserted = self._document.flush(text)
+        if not removed and not inserted:
+            return
+        blocks = self._document.blocks[first:first + inserted]
+        self._heights[first:first + removed] = [self._estimate_height(block) for block in blocks]
+        self._offsets_dirty = True
+        self._update_scrollbar()
+        self.viewport().update()
+
+    # --- rysowanie ----------------------------------------------------------
+    def paintEvent(self, event) -> None:  # type: ignore[override]
+        blocks = self._document.blocks
+        if not blocks:
+            return
+
+        self._ensure_offsets()
+        top = self.verticalScrollBar().value()
+        view_height = self.viewport().height()
+        margin = int(view_height * self.RENDER_MARGIN)
+
+        # Najpierw dogrzewamy bloki w obszarze z marginesem i korygujemy ich wysokości.
+        first = max(bisect_right(self._offsets, top - margin) - 1, 0)
+        shift_above = 0
+        index = first
+        while index < len(blocks) and self._offsets[index] <= top + view_height + margin:
+            height = math.ceil(self._rendered(blocks[index]).size().height()) + self.BLOCK_SPACING
+            if height != self._heights[index]:
+                if self._offsets[index] < top:
+                    shift_above += height - self._heights[index]
+                self._heights[index] = height
+                self._offsets_dirty = True
+            index += 1
+        if self._offsets_dirty:
+            self._ensure_offsets()
+            self._update_scrollbar()
+            if shift_above:
+                # Zachowujemy pozycję treści, gdy zmieniła się wysokość bloków nad oknem.
+                self.verticalScrollBar().setValue(top + shift_above)
+                top = self.verticalScrollBar().value()
+
+        painter = QPainter(self.viewport())
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
+        index = max(bisect_right(self._offsets, top) - 1, 0)
+        while index < len(blocks) and self._offsets[index] < top + view_height:
+            document = self._rendered(blocks[index])
+            painter.save()
+            painter.translate(QPointF(0, self._offsets[index] - top))
+            document.drawContents(painter, QRectF(0, 0, self.viewport().width(), self._heights[index]))
+            painter.restore()
+            index += 1
+        painter.end()
+
+    def resizeEvent(self, event) -> None:  # type: ignore[override]
+        super().resizeEvent(event)
+        self._update_scrollbar()
+
+    def scrollContentsBy(self, dx: int, dy: int) -> None:  # type: ignore[override]
+        self.viewport().update()
+
+    # --- pomocnicze ---------------------------------------------------------
+    def _rendered(self, block: MarkdownBlock) -> QTextDocument:
+        if self._cache_theme != theme.current_theme():
+            # Wyrenderowane bloki mają kolory poprzedniego motywu.
+            self._cache.clear()
+            self._cache_theme = theme.current_theme()
+        document = self._cache.get(block.digest)
+        if document is None:
+            document = QTextDocument()
+            document.setDocumentMargin(0)
+            document.setDefaultFont(self.font())
+            document.setDefaultStyleSheet(block_stylesheet(self._cache_theme))
+            document.setHtml(render_block_html(block.text))
+            self._cache[block.digest] = document
+            while len(self._cache) > self.CACHE_SIZE:
+                self._cache.popitem(last=False)
+        else:
+            self._cache.move_to_end(block.digest)
+
+        width = self.viewport().width()
+        if document.textWidth() != width:
+            document.setTextWidth(width)
+        return document
+
+    def _estimate_height(self, block: MarkdownBlock) -> int:
+        return (block.text.count("\n") + 1) * self._line_height + self.BLOCK_SPACING
+
+    def _ensure_offsets(self) -> None:
+        if not self._offsets_dirty:
+            return
+        self._offsets = list(accumulate(self._heights, initial=0))
+        self._offsets_dirty = False
+
+    def _update_scrollbar(self) -> None:
+        self._ensure_offsets()
+        bar = self.verticalScrollBar()
+        view_height = self.viewport().height()
+        bar.setRange(0, max(0, self._offsets[-1] - view_height))
+        bar.setPageStep(view_height)
+        bar.setSingleStep(self._line_height * 3)
+
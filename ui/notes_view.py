@@ -1,23 +1,328 @@
-from PyQt6.QtCore import Qt
-from PyQt6.QtWidgets import QLabel, QVBoxLayout, QWidget
+from __future__ import annotations
+
+from typing import List, Optional
+
+from PyQt6.QtCore import QAbstractListModel, QModelIndex, Qt, QTimer, pyqtSignal
+from PyQt6.QtWidgets import (
+    QFrame,
+    QHBoxLayout,
+    QInputDialog,
+    QLabel,
+    QLineEdit,
+    QListView,
+    QMessageBox,
+    QPlainTextEdit,
+    QPushButton,
+    QSplitter,
+    QStackedWidget,
+    QVBoxLayout,
+    QWidget,
+)
+
+from core.notes import NoteMeta, NotesStore
+from core.notes_index import NotesIndex
+from ui.markdown_view import MarkdownPreview
 
 
 class NotesView(QWidget):
-    def __init__(self, parent: QWidget | None = None) -> None:
+    note_saved = pyqtSignal(str)
+
+    def __init__(self, store: NotesStore, index: NotesIndex, parent: QWidget | None = None) -> None:
         super().__init__(parent)
+        self._store = store
+        self._index = index
+        self._index_ready = False
+        self._current_id: Optional[str] = None
         self.setObjectName("notesRoot")
+
         layout = QVBoxLayout(self)
-        layout.setContentsMargins(32, 32, 32, 32)
+        layout.setContentsMargins(0, 0, 0, 0)
         layout.setSpacing(16)
 
         title = QLabel("Notatki")
         title.setObjectName("h1")
         layout.addWidget(title)
 
-        placeholder = QLabel("Funkcja dostępna wkrótce")
-        placeholder.setObjectName("comingSoon")
-        placeholder.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        placeholder.setEnabled(False)
-        layout.addWidget(placeholder, alignment=Qt.AlignmentFlag.AlignCenter)
+        layout.addWidget(self._build_toolbar())
+
+        splitter = QSplitter(Qt.Orientation.Horizontal)
+        splitter.setChildrenCollapsible(False)
+
+        self._model = NotesListModel(store, self)
+        self._list = QListView()
+        self._list.setObjectName("notesList")
+        # Jednakowa wysokość wierszy pozwala widokowi liczyć tylko widoczne elementy.
+        self._list.setUniformItemSizes(True)
+        self._list.setModel(self._model)
+        self._list.selectionModel().currentChanged.connect(self._on_current_changed)
+        splitter.addWidget(self._list)
+
+        editor_frame = QFrame()
+        editor_frame.setObjectName("notesEditor")
+        editor_layout = QVBoxLayout(editor_frame)
+        editor_layout.setContentsMargins(16, 16, 16, 16)
+        editor_layout.setSpacing(12)
+
+        self._note_title = QLabel("Wybierz notatkę z listy")
+        self._note_title.setObjectName("panelTitle")
+        editor_layout.addWidget(self._note_title)
+
+        self._editor = QPlainTextEdit()
+        self._editor.setObjectName("notesText")
+        self._editor.setEnabled(False)
+        self._editor.document().contentsChange.connect(self._on_contents_change)
+
+        self._preview = MarkdownPreview()
+        self._preview_stale = True
+
+        # Podgląd odświeżamy po krótkiej przerwie w pisaniu, tylko w zmienionych blokach.
+        self._preview_timer = QTimer(self)
+        self._preview_timer.setSingleShot(True)
+        self._preview_timer.setInterval(200)
+        self._preview_timer.timeout.connect(self._refresh_preview)
 
+        self._editor_stack = QStackedWidget()
+        self._editor_stack.addWidget(self._editor)
+        self._editor_stack.addWidget(self._preview)
+        editor_layout.addWidget(self._editor_stack)
+
+        splitter.addWidget(editor_frame)
+        splitter.setStretchFactor(0, 1)
+        splitter.setStretchFactor(1, 3)
+        layout.addWidget(splitter, stretch=1)
+
+        self.reload()
+
+    def _build_toolbar(self) -> QFrame:
+        frame = QFrame()
+        frame.setObjectName("notesToolbar")
+        layout = QHBoxLayout(frame)
+        layout.setContentsMargins(20, 16, 20, 16)
+        layout.setSpacing(12)
+
+        self._search_edit = QLineEdit()
+        self._search_edit.setObjectName("notesSearch")
+        self._search_edit.setPlaceholderText("Szukaj w notatkach (frazy w cudzysłowie)")
+        self._search_edit.setClearButtonEnabled(True)
+        self._search_edit.setMinimumWidth(320)
+        layout.addWidget(self._search_edit)
+
+        # Wyszukujemy dopiero po krótkiej przerwie w pisaniu.
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(150)
+        self._search_timer.timeout.connect(self._run_search)
+        self._search_edit.textChanged.connect(lambda _: self._search_timer.start())
+
+        self._count_label = QLabel()
+        self._count_label.setObjectName("subtitle")
+        layout.addWidget(self._count_label)
         layout.addStretch(1)
+
+        self._preview_button = QPushButton("Podgląd")
+        self._preview_button.setObjectName("calendarActionSecondary")
+        self._preview_button.setCursor(Qt.CursorShape.PointingHandCursor)
+        self._preview_button.setCheckable(True)
+        self._preview_button.toggled.connect(self._toggle_preview)
+
+        self._save_button = QPushButton("Zapisz")
+        self._save_button.setObjectName("calendarActionSecondary")
+        self._save_button.setCursor(Qt.CursorShape.PointingHandCursor)
+        self._save_button.setEnabled(False)
+        self._save_button.clicked.connect(self._save_current)
+
+        self._new_button = QPushButton("Nowa notatka")
+        self._new_button.setObjectName("calendarActionPrimary")
+        self._new_button.setCursor(Qt.CursorShape.PointingHandCursor)
+        self._new_button.clicked.connect(self._create_note)
+
+        layout.addWidget(self._preview_button)
+        layout.addWidget(self._save_button)
+        layout.addWidget(self._new_button)
+        return frame
+
+    def reload(self) -> None:
+        self._model.beginResetModel()
+        self._store.scan()
+        self._model.endResetModel()
+        self._index_ready = False
+        self._run_search()
+
+    def _ensure_index(self) -> None:
+        # Indeks wczytujemy dopiero przy pierwszym wyszukiwaniu lub zapisie,
+        # żeby nie wydłużać otwierania biblioteki.
+        if self._index_ready:
+            return
+        self._index.load()
+        self._index.sync(self._store)
+        self._index_ready = True
+
+    def _run_search(self) -> None:
+        query = self._search_edit.text().strip()
+        if not query:
+            self._model.set_filter(None)
+        else:
+            self._ensure_index()
+            folded = query.casefold()
+            hits = self._index.search(query)
+            hit_set = set(hits)
+            title_hits = [
+                meta.id for meta in self._store.all_notes()
+                if folded in meta.title.casefold() and meta.id not in hit_set
+            ]
+            self._model.set_filter(title_hits + hits)
+        self._update_count()
+
+    def open_note(self, note_id: str) -> None:
+        row = self._model.row_of(note_id)
+        if row < 0 and self._search_edit.text():
+            self._search_edit.clear()
+            self._run_search()
+            row = self._model.row_of(note_id)
+        if row >= 0:
+            self._list.setCurrentIndex(self._model.index(row))
+
+    def _update_count(self) -> None:
+        shown = self._model.rowCount()
+        if shown == len(self._store):
+            self._count_label.setText(f"Notatek w bibliotece: {len(self._store)}")
+        else:
+            self._count_label.setText(f"Wyniki: {shown} z {len(self._store)}")
+
+    def _on_current_changed(self, current: QModelIndex, _previous: QModelIndex) -> None:
+        if not current.isValid():
+            return
+        meta = self._model.note_at(current.row())
+        if meta is None or meta.id == self._current_id:
+            return
+        if not self.save_changes():
+            # Zapis się nie udał – zostajemy przy bieżącej notatce, żeby nie stracić tekstu.
+            row = self._model.row_of(self._current_id) if self._current_id is not None else -1
+            if row >= 0:
+                self._list.setCurrentIndex(self._model.index(row))
+            return
+        try:
+            body = self._store.read_body(meta.id)
+        except OSError as exc:
+            QMessageBox.warning(self, "Nie można otworzyć notatki", str(exc))
+            return
+
+        self._current_id = meta.id
+        self._note_title.setText(meta.title)
+        self._editor.setPlainText(body)
+        self._editor.document().setModified(False)
+        self._editor.setEnabled(True)
+        self._save_button.setEnabled(True)
+        self._preview_stale = True
+        if self._preview_button.isChecked():
+            self._refresh_preview()
+
+    def _toggle_preview(self, checked: bool) -> None:
+        if checked:
+            self._refresh_preview()
+            self._editor_stack.setCurrentWidget(self._preview)
+        else:
+            self._editor_stack.setCurrentWidget(self._editor)
+
+    def _on_contents_change(self, position: int, removed: int, added: int) -> None:
+        if self._preview_stale:
+            return
+        self._preview.note_change(position, removed, added)
+        if self._preview_button.isChecked():
+            self._preview_timer.start()
+
+    def _refresh_preview(self) -> None:
+        self._preview_timer.stop()
+        if self._preview_stale:
+            self._preview.set_text(self._editor.toPlainText())
+            self._preview_stale = False
+        elif self._preview.has_pending_changes:
+            self._preview.flush(self._editor.toPlainText())
+
+    def save_changes(self) -> bool:
+        """Zapisuje otwartą notatkę, jeśli ma niezapisane zmiany; ``False`` przy nieudanym zapisie."""
+        if not self._editor.document().isModified():
+            return True
+        return self._save_current()
+
+    def _save_current(self) -> bool:
+        if self._current_id is None:
+            return True
+        text = self._editor.toPlainText()
+        try:
+            meta = self._store.save_body(self._current_id, text)
+            self._ensure_index()
+            self._index.update_note(meta.id, text, mtime=meta.mtime, size=meta.size)
+        except OSError as exc:
+            QMessageBox.warning(self, "Zapis nieudany", str(exc))
+            return False
+        self._editor.document().setModified(False)
+        self.note_saved.emit(self._current_id)
+        return True
+
+    def _create_note(self) -> None:
+        title, accepted = QInputDialog.getText(self, "Nowa notatka", "Tytuł notatki")
+        if not accepted:
+            return
+        try:
+            meta = self._store.create_note(title)
+            self._ensure_index()
+            self._index.update_note(meta.id, self._store.read_body(meta.id), mtime=meta.mtime, size=meta.size)
+        except OSError as exc:
+            QMessageBox.warning(self, "Nie można utworzyć notatki", str(exc))
+            return
+
+        self._run_search()
+        self.note_saved.emit(meta.id)
+        self.open_note(meta.id)
+
+
+class NotesListModel(QAbstractListModel):
+    """Model listy notatek – dane czyta bezpośrednio z indeksu NotesStore.
+
+    Opcjonalny filtr (lista ID, np. wyniki wyszukiwania) zastępuje pełną listę.
+    """
+
+    def __init__(self, store: NotesStore, parent: QWidget | None = None) -> None:
+        super().__init__(parent)
+        self._store = store
+        self._filtered: Optional[List[str]] = None
+
+    def set_filter(self, note_ids: Optional[List[str]]) -> None:
+        self.beginResetModel()
+        self._filtered = note_ids
+        self.endResetModel()
+
+    def note_at(self, row: int) -> Optional[NoteMeta]:
+        if self._filtered is None:
+            return self._store.note_at(row)
+        return self._store.get(self._filtered[row])
+
+    def row_of(self, note_id: str) -> int:
+        if self._filtered is None:
+            return self._store.row_of(note_id)
+        try:
+            return self._filtered.index(note_id)
+        except ValueError:
+            return -1
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:  # type: ignore[override]
+        if parent.isValid():
+            return 0
+        if self._filtered is None:
+            return len(self._store)
+        return len(self._filtered)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):  # type: ignore[override]
+        if not index.isValid():
+            return None
+        meta = self.note_at(index.row())
+        if meta is None:
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            return meta.title
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return meta.id
+        if role == Qt.ItemDataRole.UserRole:
+            return meta.id
+        return None
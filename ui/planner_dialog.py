@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import Dict
+
+from PyQt6.QtCore import QDateTime, Qt, pyqtSignal
+from PyQt6.QtWidgets import (
+    QDateTimeEdit,
+    QDialog,
+    QDialogButtonBox,
+    QDoubleSpinBox,
+    QFormLayout,
+    QHBoxLayout,
+    QLabel,
+    QLineEdit,
+    QListWidget,
+    QListWidgetItem,
+    QMessageBox,
+    QPushButton,
+    QSpinBox,
+    QVBoxLayout,
+    QWidget,
+)
+
+from core.planner import PlanResult, StudyPlanner, StudyTask
+
+
+class PlannerDialog(QDialog):
+    """Lista zadań planera nauki z formularzem dodawania i przyciskiem planowania."""
+
+    plan_changed = pyqtSignal()
+
+    def __init__(self, planner: StudyPlanner, parent: QWidget | None = None) -> None:
+        super().__init__(parent)
+        self._planner = planner
+        self._shortfall: Dict[str, timedelta] = {}
+        self.setWindowTitle("Planer nauki")
+        self.setObjectName("eventDialog")
+        self.setMinimumWidth(520)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(24, 24, 24, 24)
+        layout.setSpacing(16)
+
+        title = QLabel("Zadania")
+        title.setObjectName("panelTitle")
+        layout.addWidget(title)
+
+        self._task_list = QListWidget()
+        layout.addWidget(self._task_list)
+
+        form = QFormLayout()
+        form.setSpacing(12)
+
+        self.subject_edit = QLineEdit()
+        self.subject_edit.setPlaceholderText("np. Analiza matematyczna")
+        form.addRow("Przedmiot", self.subject_edit)
+
+        self.hours_spin = QDoubleSpinBox()
+        self.hours_spin.setRange(0.5, 200.0)
+        self.hours_spin.setSingleStep(0.5)
+        self.hours_spin.setValue(4.0)
+        self.hours_spin.setSuffix(" h")
+        form.addRow("Łączny czas", self.hours_spin)
+
+        self.deadline_edit = QDateTimeEdit(QDateTime.currentDateTime().addDays(7))
+        self.deadline_edit.setDisplayFormat("dd.MM.yyyy HH:mm")
+        self.deadline_edit.setCalendarPopup(True)
+        self.deadline_edit.setObjectName("eventDateTime")
+        form.addRow("Termin", self.deadline_edit)
+
+        self.session_spin = QSpinBox()
+        self.session_spin.setRange(30, 6 * 60)
+        self.session_spin.setSingleStep(15)
+        self.session_spin.setValue(90)
+        self.session_spin.setSuffix(" min")
+        form.addRow("Maks. sesja", self.session_spin)
+
+        layout.addLayout(form)
+
+        actions = QHBoxLayout()
+        actions.setSpacing(8)
+        add_button = QPushButton("Dodaj zadanie")
+        add_button.setObjectName("calendarActionSecondary")
+        add_button.clicked.connect(self._add_task)
+        remove_button = QPushButton("Usuń zadanie")
+        remove_button.setObjectName("calendarActionSecondary")
+        remove_button.clicked.connect(self._remove_task)
+        plan_button = QPushButton("Zaplanuj od nowa")
+        plan_button.setObjectName("calendarActionPrimary")
+        plan_button.clicked.connect(self._plan)
+        actions.addWidget(add_button)
+        actions.addWidget(remove_button)
+        actions.addStretch(1)
+        actions.addWidget(plan_button)
+        layout.addLayout(actions)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Close)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+
+        self._populate()
+
+    def _populate(self) -> None:
+        self._task_list.clear()
+        for task in self._planner.tasks():
+            hours = self._planner.scheduled(task.id).total_seconds() / 3600
+            total = task.total.total_seconds() / 3600
+            text = f"{task.subject} · {hours:.1f}/{total:.1f} h · do {task.deadline.strftime('%d.%m.%Y %H:%M')}"
+            missing = self._shortfall.get(task.id)
+            if missing:
+                text += f" · brakuje {missing.total_seconds() / 3600:.1f} h"
+            item = QListWidgetItem(text)
+            item.setData(Qt.ItemDataRole.UserRole, task.id)
+            self._task_list.addItem(item)
+
+    def _add_task(self) -> None:
+        subject = self.subject_edit.text().strip()
+        if not subject:
+            QMessageBox.warning(self, "Błąd danych", "Podaj nazwę przedmiotu.")
+            return
+        try:
+            task = StudyTask(
+                subject=subject,
+                total=timedelta(hours=self.hours_spin.value()),
+                deadline=self.deadline_edit.dateTime().toPyDateTime(),
+                max_session=timedelta(minutes=self.session_spin.value()),
+            )
+        except ValueError as exc:
+            QMessageBox.warning(self, "Błąd danych", str(exc))
+            return
+        self._planner.add_task(task)
+        # Nowe zadanie dostaje wolny czas obok istniejącego planu, bez przestawiania innych sesji.
+        self._show_result(self._planner.replan())
+        self.subject_edit.clear()
+
+    def _remove_task(self) -> None:
+        item = self._task_list.currentItem()
+        if item is None:
+            return
+        self._planner.remove_task(item.data(Qt.ItemDataRole.UserRole))
+        self._show_result(PlanResult())
+
+    def _plan(self) -> None:
+        self._show_result(self._planner.plan())
+
+    def _show_result(self, result: PlanResult) -> None:
+        self._shortfall.update(result.shortfall)
+        for task_id in list(self._shortfall):
+            if task_id not in result.shortfall and self._planner.scheduled(task_id) >= self._task_total(task_id):
+                del self._shortfall[task_id]
+        self._populate()
+        self.plan_changed.emit()
+
+    def _task_total(self, task_id: str) -> timedelta:
+        return next((task.total for task in self._planner.tasks() if task.id == task_id), timedelta(0))
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import concurrent.futures
+import os
+import socket
+from typing import Callable, Optional
+
+from PyQt6.QtCore import QCoreApplication, QObject, Qt, pyqtSignal
+
+from core.calendar import CalendarStore
+from core.paths import query_socket_path
+from core.query_service import DEFAULT_PORT, QueryService, QueryServiceThread
+
+
+class QueryServiceController(QObject):
+    """Uruchamia lokalną usługę JSON obok GUI.
+
+    Pętla asyncio działa w osobnym wątku, a każda operacja na magazynie wraca
+    do wątku GUI przez kolejkowany sygnał; wynik trafia do ``Future``, na który
+    czeka obsługa żądania. Odpowiedzi z pamięci podręcznej nie angażują GUI wcale.
+    """
+
+    store_changed = pyqtSignal()
+    _invoke = pyqtSignal(object, object)
+
+    def __init__(self, store: CalendarStore, parent: QObject | None = None) -> None:
+        super().__init__(parent)
+        self._store = store
+        self._thread: Optional[QueryServiceThread] = None
+        self._invoke.connect(self._run, Qt.ConnectionType.QueuedConnection)
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.stop)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    @property
+    def address(self) -> str:
+        if self._thread is None:
+            return ""
+        address = self._thread.address
+        if isinstance(address, str):
+            return address
+        return f"{address[0]}:{address[1]}"
+
+    def start(self) -> str:
+        if self._thread is not None:
+            return self.address
+        thread = QueryServiceThread(QueryService(self._store, self._owner_call))
+        if hasattr(socket, "AF_UNIX"):
+            path = query_socket_path()
+            path.parent.mkdir(parents=True, exist_ok=True)
+            thread.start(socket_path=os.fspath(path))
+        else:
+            thread.start(port=DEFAULT_PORT)
+        self._thread = thread
+        return self.address
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._thread.stop()
+            self._thread = None
+
+    def _owner_call(self, fn: Callable[[], object]) -> "concurrent.futures.Future[object]":
+        # Wywoływane z wątku usługi; sygnał kolejkowany przenosi pracę do wątku GUI.
+        future: "concurrent.futures.Future[object]" = concurrent.futures.Future()
+        self._invoke.emit(fn, future)
+        return future
+
+    def _run(self, fn: Callable[[], object], future: "concurrent.futures.Future[object]") -> None:
+        if not future.set_running_or_notify_cancel():
+            return
+        revision = self._store.revision
+        try:
+            future.set_result(fn())
+        except Exception as exc:  # noqa: BLE001
+            future.set_exception(exc)
+        if self._store.revision != revision:
+            self.store_changed.emit()
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import time
+from typing import Iterable, Optional, Tuple
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+from PyQt6.QtWidgets import QApplication, QSystemTrayIcon
+
+from core.calendar import CalendarStore
+from core.reminders import DEFAULT_OFFSETS, Reminder, ReminderQueue, format_offset
+
+# QTimer odmierza czas monotonicznie, a przypomnienia są przypięte do zegara
+# ściennego – po uśpieniu komputera budzik sprawdzamy co najwyżej po tym czasie.
+MAX_TIMER_MS = 10 * 60 * 1000
+NOTIFICATION_MS = 10000
+
+
+class ReminderNotifier(QObject):
+    """Pokazuje przypomnienia o wydarzeniach jako powiadomienia ikony w zasobniku.
+
+    Jeden jednorazowy ``QTimer`` jest zawsze nastawiony na najbliższe przypomnienie
+    z ``ReminderQueue`` i przestawiany po każdej zmianie magazynu – bez odpytywania.
+    """
+
+    reminder_due = pyqtSignal(str, str)
+
+    def __init__(
+        self,
+        store: CalendarStore,
+        parent: QObject | None = None,
+        offsets: Iterable[int] = DEFAULT_OFFSETS,
+    ) -> None:
+        super().__init__(parent)
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._fire)
+
+        self._tray: Optional[QSystemTrayIcon] = None
+        if QSystemTrayIcon.isSystemTrayAvailable():
+            self._tray = QSystemTrayIcon(QApplication.windowIcon(), self)
+            self._tray.setToolTip("StudyHub")
+            self._tray.show()
+
+        self._queue = ReminderQueue(store, offsets, on_reschedule=self._arm)
+        self._arm()
+
+    @property
+    def uses_tray(self) -> bool:
+        """Czy przypomnienia trafiają do zasobnika; bez niego pokazuje je tylko ``reminder_due``."""
+        return self._tray is not None
+
+    @property
+    def offsets(self) -> Tuple[int, ...]:
+        return self._queue.offsets
+
+    def set_offsets(self, offsets: Iterable[int]) -> None:
+        self._queue.set_offsets(offsets)
+
+    def close(self) -> None:
+        self._timer.stop()
+        self._queue.close()
+        if self._tray is not None:
+            self._tray.hide()
+
+    def _arm(self) -> None:
+        due = self._queue.next_due()
+        if due is None:
+            self._timer.stop()
+            return
+        delay_ms = int((due - time.time()) * 1000)
+        self._timer.start(max(0, min(delay_ms, MAX_TIMER_MS)))
+
+    def _fire(self) -> None:
+        for reminder in self._queue.pop_due(time.time()):
+            title, message = _describe(reminder)
+            self.reminder_due.emit(title, message)
+            if self._tray is not None:
+                self._tray.showMessage(title, message, QSystemTrayIcon.MessageIcon.Information, NOTIFICATION_MS)
+        self._arm()
+
+
+def _describe(reminder: Reminder) -> Tuple[str, str]:
+    event = reminder.event
+    start = event.local_start
+    if reminder.minutes_before == 0:
+        lead = "Zaczyna się teraz"
+    else:
+        lead = f"Za {format_offset(reminder.minutes_before)}"
+    return event.title, f"{lead} · {start.strftime('%d.%m.%Y %H:%M')}"
@@ -7,12 +7,17 @@ from PyQt6.QtCore import Qt, QSize, pyqtSignal
 from PyQt6.QtGui import QIcon
 from PyQt6.QtWidgets import QLabel, QPushButton, QSpacerItem, QSizePolicy, QVBoxLayout, QWidget
 
+from ui.theme import DARK
+
 ASSETS_DIR = Path(__file__).resolve().parent.parent / "assets" / "icons"
 
 
 class Sidebar(QWidget):
     home_clicked = pyqtSignal()
     calendar_clicked = pyqtSignal()
+    notes_clicked = pyqtSignal()
+    flashcards_clicked = pyqtSignal()
+    theme_toggle_clicked = pyqtSignal()
 
     def __init__(self, parent: QWidget | None = None) -> None:
         super().__init__(parent)
@@ -37,14 +42,21 @@ class Sidebar(QWidget):
         layout.addLayout(self._create_section())
         layout.addSpacerItem(QSpacerItem(20, 40, QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Expanding))
 
+        self._theme_button = QPushButton("Tryb ciemny")
+        self._theme_button.setObjectName("sidebarThemeButton")
+        self._theme_button.setCursor(Qt.CursorShape.PointingHandCursor)
+        self._theme_button.setMinimumHeight(40)
+        self._theme_button.clicked.connect(self.theme_toggle_clicked)
+        layout.addWidget(self._theme_button)
+
     def _create_section(self) -> QVBoxLayout:
         section = QVBoxLayout()
         section.setSpacing(8)
 
         self._buttons["home"] = self._create_button("Strona Główna", "home.svg")
         self._buttons["calendar"] = self._create_button("Kalendarz", "calendar.svg")
-        self._buttons["notes"] = self._create_button("Notatki", "notes.svg", enabled=False)
-        self._buttons["flashcards"] = self._create_button("Fiszki", "flashcards.svg", enabled=False)
+        self._buttons["notes"] = self._create_button("Notatki", "notes.svg")
+        self._buttons["flashcards"] = self._create_button("Fiszki", "flashcards.svg")
 
         section.addWidget(self._buttons["home"])
         section.addWidget(self._buttons["calendar"])
@@ -53,6 +65,8 @@ class Sidebar(QWidget):
 
         self._buttons["home"].clicked.connect(lambda: self._handle_click("home"))
         self._buttons["calendar"].clicked.connect(lambda: self._handle_click("calendar"))
+        self._buttons["notes"].clicked.connect(lambda: self._handle_click("notes"))
+        self._buttons["flashcards"].clicked.connect(lambda: self._handle_click("flashcards"))
 
         return section
 
@@ -74,17 +88,22 @@ class Sidebar(QWidget):
             self.home_clicked.emit()
         elif key == "calendar":
             self.calendar_clicked.emit()
+        elif key == "notes":
+            self.notes_clicked.emit()
+        elif key == "flashcards":
+            self.flashcards_clicked.emit()
 
     def set_active(self, key: str) -> None:
         if key == self._active_key:
             return
         self._active_key = key
+        # Wygląd aktywnego przycisku opisuje pseudo-stan :checked w arkuszu,
+        # więc wystarczy przełączyć zaznaczenie – bez ponownego polish.
         for name, button in self._buttons.items():
-            is_active = name == key
-            button.setChecked(is_active)
-            button.setProperty("active", is_active)
-            button.style().unpolish(button)
-            button.style().polish(button)
+            button.setChecked(name == key)
+
+    def set_theme(self, name: str) -> None:
+        self._theme_button.setText("Tryb jasny" if name == DARK else "Tryb ciemny")
 
 
 def load_icon(name: str) -> QIcon:
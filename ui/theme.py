@@ -0,0 +1,611 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from string import Template
+from typing import Dict
+
+from PyQt6.QtGui import QColor
+from PyQt6.QtWidgets import QWidget
+
+LIGHT = "light"
+DARK = "dark"
+THEME_NAMES = {LIGHT: "Jasny", DARK: "Ciemny"}
+
+# Kolory motywów. Arkusz i rysujące samodzielnie widoki (``color``) korzystają
+# z tych samych nazw; akcent i kolory wariantów kart są wspólne dla obu motywów.
+# Kolory półprzezroczyste zapisujemy jako ``#AARRGGBB`` (tylko dla ``color``).
+THEMES: Dict[str, Dict[str, str]] = {
+    LIGHT: {
+        "window": "#f9faff",
+        "text": "#1f1f24",
+        "text_secondary": "#415165",
+        "surface": "#ffffff",
+        "heading": "#1f2a4a",
+        "subtitle": "#6b7287",
+        "border": "#e4e7f7",
+        "panel_border": "#e3e8ff",
+        "input_bg": "#f9faff",
+        "input_border": "#d8dcf0",
+        "accent_text": "#1f3c88",
+        "sidebar_from": "#f4f6ff",
+        "nav_text": "#586176",
+        "nav_hover": "#f1f4ff",
+        "nav_active": "#e6edff",
+        "nav_disabled": "#a7acba",
+        "card_title": "#5d647a",
+        "card_description": "#6f778e",
+        "muted_value": "#a0a5b4",
+        "indigo_value": "#2b44ff",
+        "teal_value": "#109c70",
+        "magenta_value": "#8b32d7",
+        "amber_value": "#d98324",
+        "calendar_button": "#1f2742",
+        "day_highlight": "#dfe3eb",
+        "day_header": "#5b6275",
+        "tile_bg": "#f7f8fd",
+        "tile_border": "#d5d8e5",
+        "notes_tile_bg": "#fff6f1",
+        "notes_tile_border": "#ffd9c7",
+        "notes_tile_title": "#d05c1f",
+        "flashcards_tile_bg": "#f2f5ff",
+        "flashcards_tile_border": "#cfd9ff",
+        "flashcards_tile_title": "#3960f5",
+        "module_subtitle": "#7b8295",
+        "today": "#ff3b30",
+        "today_text": "#ffffff",
+        "conflict": "#ff3b30",
+        "free_slot_text": "#1e7a3a",
+        "free_slot_bg": "#2634c759",
+        "agenda_month": "#4c6ef5",
+        "heat_0": "#e9ecf5",
+        "heat_1": "#c5d2fb",
+        "heat_2": "#91a7f8",
+        "heat_3": "#6183f5",
+        "heat_4": "#3a5bd9",
+        "code_bg": "#f1f4ff",
+        "link": "#4c6ef5",
+    },
+    DARK: {
+        "window": "#14161c",
+        "text": "#e4e6ee",
+        "text_secondary": "#c2c8d6",
+        "surface": "#1c1f27",
+        "heading": "#eef0f6",
+        "subtitle": "#9aa1b4",
+        "border": "#2b3040",
+        "panel_border": "#2b3040",
+        "input_bg": "#181b22",
+        "input_border": "#363c4f",
+        "accent_text": "#a9bbff",
+        "sidebar_from": "#191c24",
+        "nav_text": "#a3aabb",
+        "nav_hover": "#232838",
+        "nav_active": "#26304d",
+        "nav_disabled": "#5c6272",
+        "card_title": "#a3a9bb",
+        "card_description": "#979eb1",
+        "muted_value": "#6d7384",
+        "indigo_value": "#7d8dff",
+        "teal_value": "#3fd6a4",
+        "magenta_value": "#c98bff",
+        "amber_value": "#ffb84d",
+        "calendar_button": "#e4e6ee",
+        "day_highlight": "#2f3546",
+        "day_header": "#a3a9bb",
+        "tile_bg": "#20232d",
+        "tile_border": "#333849",
+        "notes_tile_bg": "#2c221d",
+        "notes_tile_border": "#5a3a2a",
+        "notes_tile_title": "#ff9a62",
+        "flashcards_tile_bg": "#1f2540",
+        "flashcards_tile_border": "#34407a",
+        "flashcards_tile_title": "#8fa5ff",
+        "module_subtitle": "#959cb0",
+        "today": "#ff5f57",
+        "today_text": "#ffffff",
+        "conflict": "#ff6b61",
+        "free_slot_text": "#5fd68a",
+        "free_slot_bg": "#3340c874",
+        "agenda_month": "#8fa5ff",
+        "heat_0": "#232734",
+        "heat_1": "#27366b",
+        "heat_2": "#34509e",
+        "heat_3": "#4d6fe0",
+        "heat_4": "#8ea0ff",
+        "code_bg": "#232838",
+        "link": "#8fa5ff",
+    },
+}
+
+_current = LIGHT
+_colors: Dict[str, QColor] = {}
+
+
+def current_theme() -> str:
+    return _current
+
+
+def color(token: str) -> QColor:
+    """Kolor bieżącego motywu dla widoków rysujących samodzielnie (``paintCell``, modele)."""
+    value = _colors.get(token)
+    if value is None:
+        value = _colors[token] = QColor(THEMES[_current][token])
+    return value
+
+
+@lru_cache(maxsize=None)
+def stylesheet(name: str) -> str:
+    """Gotowy arkusz motywu; składany raz, kolejne przełączenia biorą go z pamięci."""
+    return _TEMPLATE.substitute(THEMES[name])
+
+
+def apply_theme(window: QWidget, name: str) -> None:
+    """Ustawia motyw oknu głównemu (okna dialogowe dziedziczą arkusz po rodzicu).
+
+    Stany zmieniające się w trakcie pracy (aktywny przycisk paska, zaznaczenia)
+    są opisane pseudo-stanami w arkuszu, więc nie wymagają ponownego ``polish``
+    widżetów – pełne przeliczenie stylu zachodzi tylko tutaj, przy zmianie motywu.
+    """
+    global _current
+    if name not in THEMES:
+        raise KeyError(f"Nieznany motyw: {name}")
+    _current = name
+    _colors.clear()
+    window.setStyleSheet(stylesheet(name))
+
+
+# Wspólny szablon arkusza; ``$nazwa`` to kolor z ``THEMES``.
+_TEMPLATE = Template(
+    """
+QWidget {
+    background-color: $window;
+    color: $text;
+    font-family: 'Segoe UI', 'Helvetica Neue', Arial, sans-serif;
+}
+QLabel {
+    background-color: transparent;
+}
+#sidebar {
+    background: qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 $sidebar_from, stop:1 $surface);
+    border: 1px solid rgba(76, 110, 245, 0.18);
+    border-radius: 18px;
+    padding: 14px 0;
+}
+#sidebarLogo {
+    padding: 10px 0 6px 0;
+}
+#contentArea {
+    background-color: $surface;
+    border-radius: 22px;
+    border: 1px solid rgba(76, 110, 245, 0.08);
+}
+#contentArea > QStackedWidget {
+    background-color: transparent;
+    border: none;
+}
+#contentArea > QStackedWidget > QWidget {
+    background-color: transparent;
+}
+#homeRoot,
+#calendarRoot,
+#notesRoot,
+#flashcardsRoot {
+    background-color: transparent;
+}
+#cardsContainer,
+#cardsContainer QWidget {
+    background-color: transparent;
+    border: none;
+}
+QPushButton#sidebarButton,
+QPushButton#sidebarThemeButton {
+    text-align: left;
+    padding: 12px 16px;
+    border-radius: 12px;
+    border: none;
+    font-size: 15px;
+    color: $nav_text;
+    background-color: transparent;
+}
+QPushButton#sidebarButton:hover:enabled,
+QPushButton#sidebarThemeButton:hover {
+    background-color: $nav_hover;
+    color: $accent_text;
+}
+QPushButton#sidebarButton:checked {
+    background-color: $nav_active;
+    color: $accent_text;
+    font-weight: 600;
+    border-left: 4px solid #4c6ef5;
+    padding-left: 12px;
+}
+QPushButton#sidebarButton:disabled {
+    color: $nav_disabled;
+}
+QLabel#h1 {
+    font-size: 26px;
+    font-weight: 600;
+    color: $heading;
+}
+QLabel#subtitle {
+    font-size: 16px;
+    color: $subtitle;
+}
+QFrame#card {
+    background-color: $surface;
+    border-radius: 18px;
+    border: 1px solid $border;
+}
+QFrame#card[muted="true"] QLabel#cardValue {
+    color: $muted_value;
+}
+QFrame#card[variant="indigo"] {
+    border-top: 4px solid #4c6ef5;
+}
+QFrame#card[variant="indigo"] QLabel#cardValue {
+    color: $indigo_value;
+}
+QFrame#card[variant="teal"] {
+    border-top: 4px solid #1dbf8c;
+}
+QFrame#card[variant="teal"] QLabel#cardValue {
+    color: $teal_value;
+}
+QFrame#card[variant="magenta"] {
+    border-top: 4px solid #bd5cff;
+}
+QFrame#card[variant="magenta"] QLabel#cardValue {
+    color: $magenta_value;
+}
+QFrame#card[variant="amber"] {
+    border-top: 4px solid #ffb84d;
+}
+QFrame#card[variant="amber"] QLabel#cardValue {
+    color: $amber_value;
+}
+QLabel#cardTitle {
+    font-size: 15px;
+    color: $card_title;
+}
+QLabel#cardValue {
+    font-size: 32px;
+    font-weight: 600;
+}
+QLabel#cardDescription {
+    font-size: 13px;
+    color: $card_description;
+}
+QFrame#dayPanel,
+QFrame#daySection,
+QFrame#notesEditor {
+    background-color: $surface;
+    border-radius: 16px;
+    border: 1px solid $panel_border;
+}
+QFrame#calendarBoard {
+    background-color: $surface;
+    border-radius: 20px;
+    border: 1px solid $border;
+}
+#calendarToolbar,
+#notesToolbar,
+#flashcardsToolbar {
+    background-color: $surface;
+    border: 1px solid $border;
+    border-radius: 16px;
+}
+#calendarSegment {
+    background-color: rgba(76, 110, 245, 0.08);
+    border-radius: 12px;
+    padding: 4px;
+}
+QToolButton#calendarSegmentButton {
+    border: none;
+    border-radius: 10px;
+    padding: 6px 14px;
+    font-size: 14px;
+    font-weight: 600;
+    color: $text_secondary;
+    background-color: transparent;
+}
+QToolButton#calendarSegmentButton:checked {
+    background-color: #4c6ef5;
+    color: #ffffff;
+}
+QToolButton#calendarSegmentButton:hover:!checked {
+    background-color: rgba(76, 110, 245, 0.16);
+}
+QToolButton#calendarLayersButton {
+    border: 1px solid $input_border;
+    border-radius: 12px;
+    padding: 9px 16px;
+    font-weight: 600;
+    font-size: 14px;
+    color: $accent_text;
+    background-color: transparent;
+}
+QToolButton#calendarLayersButton::menu-indicator {
+    image: none;
+}
+QPushButton#calendarActionPrimary {
+    background-color: #4c6ef5;
+    color: #ffffff;
+    border-radius: 12px;
+    padding: 10px 20px;
+    font-weight: 600;
+    font-size: 14px;
+    border: none;
+}
+QPushButton#calendarActionPrimary:hover {
+    background-color: #3d59d4;
+}
+QPushButton#calendarActionPrimary:pressed {
+    background-color: #324abb;
+}
+QPushButton#calendarActionSecondary {
+    background-color: transparent;
+    color: $accent_text;
+    border: 1px solid #4c6ef5;
+    border-radius: 12px;
+    padding: 10px 18px;
+    font-weight: 600;
+    font-size: 14px;
+}
+QPushButton#calendarActionSecondary:hover {
+    background-color: rgba(76, 110, 245, 0.12);
+}
+QPushButton#calendarActionSecondary:pressed {
+    background-color: rgba(76, 110, 245, 0.2);
+}
+QListWidget#upcomingList {
+    border: none;
+    background-color: transparent;
+}
+QListWidget#upcomingList::item {
+    padding: 10px 12px;
+    border-radius: 10px;
+}
+QListWidget#upcomingList::item:selected {
+    background-color: rgba(76, 110, 245, 0.2);
+    color: $text;
+}
+QLabel#panelTitle,
+QLabel#daySectionTitle {
+    font-size: 16px;
+    font-weight: 600;
+    color: $heading;
+}
+QListView#notesList {
+    border: 1px solid $border;
+    border-radius: 16px;
+    background-color: $surface;
+    padding: 6px;
+    outline: none;
+}
+QListView#notesList::item {
+    padding: 8px;
+    border-radius: 10px;
+}
+QListView#notesList::item:selected {
+    background-color: rgba(76, 110, 245, 0.18);
+    color: $text;
+}
+QFrame#reviewCard {
+    background-color: $surface;
+    border-radius: 20px;
+    border: 1px solid $border;
+}
+QTextBrowser#reviewFront,
+QTextBrowser#reviewBack {
+    border: none;
+    background-color: transparent;
+}
+QTextBrowser#reviewFront {
+    font-size: 22px;
+    color: $heading;
+}
+QTextBrowser#reviewBack {
+    font-size: 18px;
+    color: $text_secondary;
+}
+QAbstractScrollArea#markdownPreview {
+    background-color: transparent;
+    border: none;
+}
+QPlainTextEdit#notesText {
+    border: none;
+    background-color: transparent;
+    font-size: 14px;
+}
+QListWidget {
+    border: none;
+    background-color: transparent;
+    outline: none;
+}
+QListWidget::item {
+    padding: 8px;
+    border-radius: 10px;
+}
+QListWidget::item:selected {
+    background-color: rgba(76, 110, 245, 0.18);
+    color: $text;
+}
+QScrollArea,
+QScrollArea QWidget,
+QScrollArea > QWidget > QWidget {
+    background-color: transparent;
+    border: none;
+}
+QScrollBar:vertical {
+    background: transparent;
+    width: 9px;
+    margin: 6px 2px 6px 0;
+}
+QScrollBar:horizontal {
+    background: transparent;
+    height: 9px;
+    margin: 0 6px 2px 6px;
+}
+QScrollBar::handle:vertical {
+    background-color: rgba(76, 110, 245, 0.45);
+    border-radius: 4px;
+    min-height: 24px;
+}
+QScrollBar::handle:horizontal {
+    background-color: rgba(76, 110, 245, 0.45);
+    border-radius: 4px;
+    min-width: 24px;
+}
+QScrollBar::handle:hover {
+    background-color: rgba(76, 110, 245, 0.65);
+}
+QScrollBar::add-line,
+QScrollBar::sub-line {
+    width: 0;
+    height: 0;
+}
+QScrollBar::add-page,
+QScrollBar::sub-page {
+    background: none;
+}
+QCalendarWidget {
+    background-color: $surface;
+    border: none;
+}
+QCalendarWidget QWidget {
+    background-color: transparent;
+}
+QCalendarWidget QToolButton {
+    color: $calendar_button;
+    font-weight: 600;
+    border: none;
+    background: transparent;
+}
+QCalendarWidget QToolButton:hover {
+    color: #4c6ef5;
+}
+QLabel#calendarHeaderLabel {
+    font-size: 16px;
+    font-weight: 600;
+    color: $heading;
+    letter-spacing: 0.2px;
+}
+QCalendarWidget QAbstractItemView {
+    outline: none;
+    selection-background-color: transparent;
+    selection-color: $text;
+}
+QCalendarWidget #qt_calendar_navigationbar {
+    background-color: $surface;
+    border: none;
+}
+QCalendarWidget #qt_calendar_calendarview {
+    background-color: $surface;
+    border-radius: 14px;
+    selection-background-color: transparent;
+    alternate-background-color: $surface;
+}
+QDateTimeEdit QCalendarWidget #qt_calendar_calendarview {
+    border-radius: 12px;
+}
+QCalendarWidget #qt_calendar_prevmonth,
+QCalendarWidget #qt_calendar_nextmonth {
+    border-radius: 12px;
+    padding: 4px;
+}
+QCalendarWidget #qt_calendar_prevmonth:hover,
+QCalendarWidget #qt_calendar_nextmonth:hover {
+    background-color: rgba(76, 110, 245, 0.12);
+}
+QFrame#moduleTile {
+    border-radius: 14px;
+    border: 1px solid $tile_border;
+    background-color: $tile_bg;
+}
+QFrame#moduleTile[variant="notes"] {
+    background-color: $notes_tile_bg;
+    border: 1px solid $notes_tile_border;
+}
+QFrame#moduleTile[variant="notes"] QLabel#moduleTitle {
+    color: $notes_tile_title;
+}
+QFrame#moduleTile[variant="flashcards"] {
+    background-color: $flashcards_tile_bg;
+    border: 1px solid $flashcards_tile_border;
+}
+QFrame#moduleTile[variant="flashcards"] QLabel#moduleTitle {
+    color: $flashcards_tile_title;
+}
+QLabel#moduleTitle {
+    font-size: 15px;
+    font-weight: 600;
+    color: $heading;
+}
+QLabel#moduleSubtitle {
+    font-size: 13px;
+    color: $module_subtitle;
+}
+QPushButton#dangerButton {
+    color: #ff3b30;
+}
+QPushButton#dangerButton:hover {
+    background-color: rgba(255, 59, 48, 0.12);
+}
+QDialog {
+    background-color: $surface;
+}
+#eventDialog {
+    background-color: $surface;
+    border-radius: 20px;
+}
+#eventDialog QLabel {
+    color: $heading;
+    font-size: 14px;
+}
+QLineEdit#notesSearch,
+QLineEdit#calendarQuickAdd {
+    border: 1px solid $input_border;
+    border-radius: 10px;
+    padding: 8px 10px;
+    background-color: $input_bg;
+    font-size: 14px;
+}
+#eventDialog QLineEdit,
+#eventDialog QDateTimeEdit,
+#eventDialog QTextEdit,
+#eventDialog QComboBox {
+    border: 1px solid $input_border;
+    border-radius: 10px;
+    padding: 8px 10px;
+    background-color: $input_bg;
+    font-size: 14px;
+}
+#eventDialog QDateTimeEdit#eventDateTime {
+    padding-right: 28px;
+}
+#eventDialog QDateTimeEdit::drop-down {
+    width: 20px;
+    border: none;
+}
+#eventDialog QDateTimeEdit::down-arrow {
+    image: url(assets/icons/chevron_down.svg);
+    width: 12px;
+    height: 12px;
+}
+#eventDialog QTextEdit {
+    min-height: 96px;
+}
+#eventDialog QDialogButtonBox QPushButton {
+    border-radius: 12px;
+    padding: 8px 18px;
+    font-weight: 600;
+}
+#eventDialog QDialogButtonBox QPushButton:hover {
+    background-color: rgba(76, 110, 245, 0.12);
+}
+#popupCalendarTitle {
+    font-weight: 600;
+    color: $heading;
+}
+"""
+)
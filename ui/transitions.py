@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import os
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from PyQt6.QtCore import QEasingCurve, QObject, Qt, QVariantAnimation, pyqtSignal
+from PyQt6.QtGui import QPainter, QPaintEvent, QPixmap
+from PyQt6.QtWidgets import QStackedWidget, QWidget
+
+DEFAULT_DURATION_MS = 220
+# Ustawiona na dowolną wartość wypisuje czasy klatek każdego przejścia na stderr.
+FRAME_STATS_ENV = "STUDYHUB_FRAME_STATS"
+
+
+@dataclass
+class TransitionStats:
+    """Czasy klatek jednego przejścia (w milisekundach)."""
+
+    duration_ms: float = 0.0
+    intervals_ms: List[float] = field(default_factory=list)
+    paint_ms: List[float] = field(default_factory=list)
+    setup_ms: float = 0.0
+
+    @property
+    def frames(self) -> int:
+        return len(self.paint_ms)
+
+    @property
+    def worst_interval_ms(self) -> float:
+        return max(self.intervals_ms, default=0.0)
+
+    @property
+    def mean_interval_ms(self) -> float:
+        return sum(self.intervals_ms) / len(self.intervals_ms) if self.intervals_ms else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"przejście {self.duration_ms:.0f} ms: klatek {self.frames}, "
+            f"odstęp śr. {self.mean_interval_ms:.1f} ms / maks. {self.worst_interval_ms:.1f} ms, "
+            f"rysowanie maks. {max(self.paint_ms, default=0.0):.2f} ms, zrzuty {self.setup_ms:.1f} ms"
+        )
+
+
+class _CrossFadeOverlay(QWidget):
+    """Nakładka rysująca dwa gotowe zrzuty; między klatkami zmienia się tylko krycie."""
+
+    def __init__(self, parent: QWidget, before: QPixmap, after: QPixmap, stats: TransitionStats) -> None:
+        super().__init__(parent)
+        self._before = before
+        self._after = after
+        self._progress = 0.0
+        self._stats = stats
+        self._last_paint: Optional[float] = None
+        self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents, True)
+        self.setAttribute(Qt.WidgetAttribute.WA_OpaquePaintEvent, True)
+
+    def set_progress(self, value: float) -> None:
+        self._progress = value
+        self.update()
+
+    def paintEvent(self, event: QPaintEvent) -> None:  # type: ignore[override]
+        started = time.perf_counter()
+        painter = QPainter(self)
+        painter.drawPixmap(0, 0, self._before)
+        painter.setOpacity(self._progress)
+        painter.drawPixmap(0, 0, self._after)
+        painter.end()
+        finished = time.perf_counter()
+        if self._last_paint is not None:
+            self._stats.intervals_ms.append((started - self._last_paint) * 1000)
+        self._last_paint = started
+        self._stats.paint_ms.append((finished - started) * 1000)
+
+
+class StackTransition(QObject):
+    """Przełącza strony ``QStackedWidget`` z przenikaniem opartym na zrzutach.
+
+    Przed zmianą strony i tuż po niej stos jest raz renderowany do pixmap;
+    animacja przenika je w lekkiej nakładce, więc strony nie są przerysowywane
+    w każdej klatce. Po zakończeniu nakładka i zrzuty są usuwane – w spoczynku
+    nie zostaje żaden efekt graficzny. W trybie ograniczonego ruchu strona
+    zmienia się od razu.
+    """
+
+    finished = pyqtSignal(object)
+
+    def __init__(self, stack: QStackedWidget, duration_ms: int = DEFAULT_DURATION_MS) -> None:
+        super().__init__(stack)
+        self._stack = stack
+        self._reduced_motion = False
+        self._overlay: Optional[_CrossFadeOverlay] = None
+        self._stats: Optional[TransitionStats] = None
+        self._started = 0.0
+        self.last_stats: Optional[TransitionStats] = None
+
+        self._animation = QVariantAnimation(self)
+        self._animation.setDuration(duration_ms)
+        self._animation.setStartValue(0.0)
+        self._animation.setEndValue(1.0)
+        self._animation.setEasingCurve(QEasingCurve.Type.InOutQuad)
+        self._animation.valueChanged.connect(self._on_value)
+        self._animation.finished.connect(self._finish)
+
+    @property
+    def reduced_motion(self) -> bool:
+        return self._reduced_motion
+
+    def set_reduced_motion(self, enabled: bool) -> None:
+        self._reduced_motion = enabled
+        if enabled:
+            self._finish()
+
+    @property
+    def running(self) -> bool:
+        return self._overlay is not None
+
+    def set_current_index(self, index: int) -> None:
+        stack = self._stack
+        # Przerwane przejście kończymy od razu; nowe zaczyna się od bieżącej strony.
+        self._finish()
+        if index == stack.currentIndex():
+            return
+        parent = stack.parentWidget()
+        if self._reduced_motion or parent is None or not stack.isVisible() or stack.size().isEmpty():
+            stack.setCurrentIndex(index)
+            return
+
+        started = time.perf_counter()
+        before = stack.grab()
+        stack.setCurrentIndex(index)
+        after = stack.grab()
+        stats = TransitionStats(setup_ms=(time.perf_counter() - started) * 1000)
+
+        overlay = _CrossFadeOverlay(parent, before, after, stats)
+        overlay.setGeometry(stack.geometry())
+        overlay.show()
+        overlay.raise_()
+        self._overlay = overlay
+        self._stats = stats
+        self._started = time.perf_counter()
+        self._animation.start()
+
+    def _on_value(self, value: object) -> None:
+        if self._overlay is not None:
+            self._overlay.set_progress(float(value))
+
+    def _finish(self) -> None:
+        overlay = self._overlay
+        if overlay is None:
+            return
+        self._overlay = None
+        self._animation.stop()
+        overlay.hide()
+        overlay.deleteLater()
+
+        stats = self._stats
+        self._stats = None
+        if stats is None:
+            return
+        stats.duration_ms = (time.perf_counter() - self._started) * 1000
+        self.last_stats = stats
+        if os.environ.get(FRAME_STATS_ENV):
+            print(stats.summary(), file=sys.stderr)
+        self.finished.emit(stats)
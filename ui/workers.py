@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import threading
+from typing import Callable, Optional
+
+from PyQt6.QtCore import QCoreApplication, QObject, Qt, QThread, pyqtSignal
+
+
+class BackgroundTask(QObject):
+    """Zadanie uruchamiane w osobnym wątku; wyniki wracają sygnałami do wątku GUI.
+
+    Funkcja zadania dostaje obiekt zadania i może przez niego raportować postęp
+    (``report``), przekazywać częściowe wyniki (``emit_chunk``) oraz sprawdzać,
+    czy użytkownik nie anulował pracy (``cancelled``).
+
+    Przy ``max_pending_chunks`` wątek roboczy czeka w ``emit_chunk``, gdy tyle
+    paczek czeka już w kolejce GUI – odbiorca potwierdza każdą ``chunk_consumed``.
+    """
+
+    progress = pyqtSignal(object)
+    chunk = pyqtSignal(object)
+    succeeded = pyqtSignal(object)
+    failed = pyqtSignal(str)
+    done = pyqtSignal()
+
+    def __init__(self, fn: Callable[["BackgroundTask"], object], max_pending_chunks: int = 0) -> None:
+        super().__init__()
+        self._fn = fn
+        self._chunk_slots = threading.Semaphore(max_pending_chunks) if max_pending_chunks > 0 else None
+        self._cancelled = False
+        self._running = False
+        self._thread: Optional[QThread] = None
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled
+
+    def cancel(self) -> None:
+        self._cancelled = True
+
+    def report(self, value: object) -> None:
+        self.progress.emit(value)
+
+    def emit_chunk(self, value: object) -> None:
+        slots = self._chunk_slots
+        if slots is not None:
+            # Krótkie oczekiwania, żeby anulowanie nie utknęło na pełnej kolejce.
+            while not slots.acquire(timeout=0.05):
+                if self._cancelled:
+                    return
+        self.chunk.emit(value)
+
+    def chunk_consumed(self) -> None:
+        if self._chunk_slots is not None:
+            self._chunk_slots.release()
+
+    def run(self) -> None:
+        try:
+            result = self._fn(self)
+        except Exception as exc:  # noqa: BLE001
+            self.failed.emit(str(exc))
+        else:
+            self.succeeded.emit(result)
+        finally:
+            self._running = False
+            self.done.emit()
+
+    def start(self, parent: QObject | None = None) -> None:
+        thread = QThread(parent)
+        self.moveToThread(thread)
+        thread.started.connect(self.run)
+        # quit() jest bezpieczne wątkowo – wywołujemy je od razu, bez pętli zdarzeń GUI.
+        self.done.connect(thread.quit, Qt.ConnectionType.DirectConnection)
+        thread.finished.connect(thread.deleteLater)
+        self._thread = thread
+        self._running = True
+        app = QCoreApplication.instance()
+        if app is not None:
+            # Przy zamykaniu aplikacji przerywamy pracę i czekamy na wątek. Metoda
+            # związana jest trzymana słabo, a po zakończeniu zadania połączenie jest
+            # zrywane – aplikacja nie przetrzymuje zakończonych zadań ani ich funkcji.
+            app.aboutToQuit.connect(self.shutdown, Qt.ConnectionType.DirectConnection)
+            self.done.connect(self._release_quit_hook, Qt.ConnectionType.DirectConnection)
+        thread.start()
+
+    def _release_quit_hook(self) -> None:
+        app = QCoreApplication.instance()
+        if app is None:
+            return
+        try:
+            app.aboutToQuit.disconnect(self.shutdown)
+        except TypeError:
+            pass
+
+    def shutdown(self, msecs: int = 3000) -> None:
+        if not self._running or self._thread is None:
+            return
+        self.cancel()
+        self._thread.wait(msecs)
+
+    def wait(self, msecs: int = -1) -> bool:
+        if self._thread is None:
+            return True
+        return self._thread.wait() if msecs < 0 else self._thread.wait(msecs)
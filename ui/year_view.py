@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import math
+from datetime import date, timedelta
+from typing import List, Optional
+
+from PyQt6.QtCore import QLocale, QPoint, QRect, QSize, Qt, pyqtSignal
+from PyQt6.QtGui import QMouseEvent, QPainter, QPaintEvent
+from PyQt6.QtWidgets import QComboBox, QFrame, QHBoxLayout, QLabel, QPushButton, QToolTip, QVBoxLayout, QWidget
+
+from core.calendar import CalendarStore
+from core.day_stats import DayTotals, day_index
+from ui import theme
+
+CELL_SIZE = 14
+CELL_GAP = 3
+# Miejsce na skróty dni tygodnia i nazwy miesięcy.
+LEFT_MARGIN = 28
+TOP_MARGIN = 20
+
+# Kolory motywu od pustego dnia do najbardziej zajętego.
+LEVEL_TOKENS = ["heat_0", "heat_1", "heat_2", "heat_3", "heat_4"]
+
+METRIC_COUNT = "count"
+METRIC_HOURS = "hours"
+
+
+class YearHeatmap(QWidget):
+    """Siatka dni roku (tygodnie w kolumnach) cieniowana według zajętości.
+
+    Wartości dni pochodzą z ``DayTotals`` i są pobierane raz na odświeżenie;
+    ``paintEvent`` tylko rysuje gotowe poziomy, bez zapytań do magazynu.
+    """
+
+    day_selected = pyqtSignal(date)
+
+    def __init__(self, totals: DayTotals, parent: QWidget | None = None) -> None:
+        super().__init__(parent)
+        self._totals = totals
+        self._year = date.today().year
+        self._metric = METRIC_COUNT
+        self._values: List[float] = []
+        self._levels: List[int] = []
+        self._locale = QLocale(QLocale.Language.Polish, QLocale.Country.Poland)
+        self.setMouseTracking(True)
+        self.reload()
+
+    @property
+    def year(self) -> int:
+        return self._year
+
+    def set_year(self, year: int) -> None:
+        self._year = year
+        self.reload()
+
+    def set_metric(self, metric: str) -> None:
+        self._metric = metric
+        self.reload()
+
+    def reload(self) -> None:
+        if self._metric == METRIC_HOURS:
+            values: List[float] = self._totals.hours(self._year)
+        else:
+            values = self._totals.counts(self._year)
+        peak = max(values, default=0)
+        last = len(LEVEL_TOKENS) - 1
+        self._values = values
+        self._levels = [
+            0 if value <= 1e-9 else min(last, max(1, math.ceil(value / peak * last)))
+            for value in values
+        ]
+        self.update()
+
+    def sizeHint(self) -> QSize:  # type: ignore[override]
+        step = CELL_SIZE + CELL_GAP
+        return QSize(LEFT_MARGIN + 54 * step, TOP_MARGIN + 7 * step)
+
+    def minimumSizeHint(self) -> QSize:  # type: ignore[override]
+        return self.sizeHint()
+
+    # --- rysowanie --------------------------------------------------------
+    def paintEvent(self, event: QPaintEvent) -> None:  # type: ignore[override]
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing, False)
+        step = CELL_SIZE + CELL_GAP
+        first = date(self._year, 1, 1)
+        offset = first.weekday()
+        colors = [theme.color(token) for token in LEVEL_TOKENS]
+        clip = event.rect()
+
+        for index, level in enumerate(self._levels):
+            cell = offset + index
+            x = LEFT_MARGIN + (cell // 7) * step
+            y = TOP_MARGIN + (cell % 7) * step
+            if x + CELL_SIZE < clip.left() or x > clip.right():
+                continue
+            painter.fillRect(x, y, CELL_SIZE, CELL_SIZE, colors[level])
+
+        painter.setPen(self.palette().color(self.foregroundRole()))
+        font = painter.font()
+        font.setPointSizeF(max(font.pointSizeF() - 2, 7))
+        painter.setFont(font)
+        for month in range(1, 13):
+            cell = offset + day_index(date(self._year, month, 1))
+            x = LEFT_MARGIN + (cell // 7) * step
+            name = self._locale.standaloneMonthName(month, QLocale.FormatType.ShortFormat)
+            painter.drawText(x, TOP_MARGIN - 6, name)
+        for row, label in ((0, "pn"), (2, "śr"), (4, "pt")):
+            painter.drawText(0, TOP_MARGIN + row * step + CELL_SIZE - 3, label)
+        painter.end()
+
+    # --- mysz -----------------------------------------------------------
+    def day_at(self, pos: QPoint) -> Optional[date]:
+        step = CELL_SIZE + CELL_GAP
+        x = pos.x() - LEFT_MARGIN
+        y = pos.y() - TOP_MARGIN
+        if x < 0 or y < 0 or x % step >= CELL_SIZE or y % step >= CELL_SIZE or y // step >= 7:
+            return None
+        first = date(self._year, 1, 1)
+        index = (x // step) * 7 + y // step - first.weekday()
+        if not 0 <= index < len(self._values):
+            return None
+        return first + timedelta(days=index)
+
+    def mouseMoveEvent(self, event: QMouseEvent) -> None:  # type: ignore[override]
+        day = self.day_at(event.position().toPoint())
+        if day is None:
+            QToolTip.hideText()
+            return
+        value = self._values[day_index(day)]
+        if self._metric == METRIC_HOURS:
+            text = f"{day.strftime('%d.%m.%Y')}: {value:.1f} h"
+        else:
+            text = f"{day.strftime('%d.%m.%Y')}: wydarzeń {int(value)}"
+        QToolTip.showText(event.globalPosition().toPoint(), text, self, QRect())
+
+    def mouseReleaseEvent(self, event: QMouseEvent) -> None:  # type: ignore[override]
+        if event.button() == Qt.MouseButton.LeftButton:
+            day = self.day_at(event.position().toPoint())
+            if day is not None:
+                self.day_selected.emit(day)
+        super().mouseReleaseEvent(event)
+
+
+class YearCalendarPage(QWidget):
+    """Przegląd roku: mapa zajętości z wyborem roku i miary."""
+
+    day_selected = pyqtSignal(date)
+
+    def __init__(self, store: CalendarStore, parent: QWidget | None = None) -> None:
+        super().__init__(parent)
+        self._store = store
+        self._totals = DayTotals(store)
+        self._stale = False
+
+        root_layout = QVBoxLayout(self)
+        root_layout.setContentsMargins(0, 0, 0, 0)
+        root_layout.setSpacing(0)
+
+        container = QFrame()
+        container.setObjectName("calendarBoard")
+        main_layout = QVBoxLayout(container)
+        main_layout.setContentsMargins(24, 24, 24, 24)
+        main_layout.setSpacing(16)
+
+        controls = QHBoxLayout()
+        controls.setSpacing(8)
+        self._prev_button = QPushButton("← Poprzedni rok")
+        self._prev_button.clicked.connect(lambda: self._shift_year(-1))
+        self._next_button = QPushButton("Następny rok →")
+        self._next_button.clicked.connect(lambda: self._shift_year(1))
+        self._metric_combo = QComboBox()
+        self._metric_combo.addItem("Liczba wydarzeń", METRIC_COUNT)
+        self._metric_combo.addItem("Zajęte godziny", METRIC_HOURS)
+        self._metric_combo.currentIndexChanged.connect(self._change_metric)
+        self._year_label = QLabel()
+        self._year_label.setObjectName("panelTitle")
+        controls.addWidget(self._prev_button)
+        controls.addWidget(self._next_button)
+        controls.addWidget(self._metric_combo)
+        controls.addStretch(1)
+        controls.addWidget(self._year_label)
+        main_layout.addLayout(controls)
+
+        self._heatmap = YearHeatmap(self._totals)
+        self._heatmap.day_selected.connect(self.day_selected)
+        main_layout.addWidget(self._heatmap, 0, Qt.AlignmentFlag.AlignHCenter)
+        main_layout.addStretch(1)
+
+        root_layout.addWidget(container)
+        self._year_label.setText(str(self._heatmap.year))
+
+    def refresh(self) -> None:
+        # Sumy dni aktualizują się same; tu tylko pobieramy je ponownie, gdy strona jest widoczna.
+        if not self.isVisible():
+            self._stale = True
+            return
+        self._stale = False
+        self._heatmap.reload()
+
+    def showEvent(self, event) -> None:  # type: ignore[override]
+        super().showEvent(event)
+        if self._stale:
+            self.refresh()
+
+    def _shift_year(self, delta: int) -> None:
+        self._heatmap.set_year(self._heatmap.year + delta)
+        self._year_label.setText(str(self._heatmap.year))
+
+    def _change_metric(self, _index: int) -> None:
+        self._heatmap.set_metric(self._metric_combo.currentData())